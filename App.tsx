@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { HashRouter, Routes, Route, Navigate } from 'react-router-dom';
 import { Layout } from './components/Layout';
 import { DealBoard } from './components/DealBoard';
@@ -10,8 +10,13 @@ import { BrandDeal, TimelineEvent, DealStatus } from './types';
 import { AnimatePresence, motion } from 'framer-motion';
 import { Bell, X } from 'lucide-react';
 import { supabase } from './lib/supabase';
-import { getDeals, createDeal, updateDeal, addTimelineEvent, submitFeedback } from './lib/api';
+import { getDealsPage, DealCursor, createDealWithEvent, updateDeal, submitFeedback, getFollowUpDigest, markNotificationRead } from './lib/api';
+import { appendTimelineEvent, clearTimelines, mergeRemoteTimelineEvent, setTimeline } from './lib/timelines';
+import { startDealSync } from './lib/sync';
+import { clearDeals, countOverdueDeals, getDeal, onFollowUpsDue, patchDeal, removeDeal, replaceDeals, upsertDeals } from './lib/dealStore';
+import { drainWriteQueue, enqueueDealUpdate, enqueueTimelineEvent, startWriteQueue, withPendingUpdates } from './lib/writeQueue';
 import { FeedbackModal, FeedbackType } from './components/FeedbackModal';
+import { ImportExportModal } from './components/ImportExportModal';
 
 const App: React.FC = () => {
   // --- Auth State ---
@@ -38,9 +43,15 @@ const App: React.FC = () => {
   };
 
   // --- App Data State ---
-  const [deals, setDeals] = useState<BrandDeal[]>([]);
+  // Deals themselves live in lib/dealStore; this is paging and sync bookkeeping
   const [dealsLoading, setDealsLoading] = useState(false);
+  const [dealsCursor, setDealsCursor] = useState<DealCursor | null>(null);
+  const [hasMoreDeals, setHasMoreDeals] = useState(false);
+  // undefined until the first page is in; then the realtime sync's starting mark
+  const [dealsSyncedAt, setDealsSyncedAt] = useState<string | null | undefined>(undefined);
+  const loadingMoreRef = useRef(false);
   const [isModalOpen, setIsModalOpen] = useState(false);
+  const [isTransferOpen, setIsTransferOpen] = useState(false);
   const [notifications, setNotifications] = useState<{ id: string, message: string, type: 'alert' | 'info' }[]>([]);
 
   // --- Feedback State ---
@@ -98,7 +109,11 @@ const App: React.FC = () => {
     if (isAuthenticated && userId) {
       loadDeals();
     } else {
-      setDeals([]);
+      clearDeals();
+      setDealsCursor(null);
+      setHasMoreDeals(false);
+      setDealsSyncedAt(undefined);
+      clearTimelines();
     }
   }, [isAuthenticated, userId]);
 
@@ -107,8 +122,11 @@ const App: React.FC = () => {
 
     setDealsLoading(true);
     try {
-      const dealsData = await getDeals(userId);
-      setDeals(dealsData);
+      const page = await getDealsPage(userId);
+      replaceDeals(page.deals);
+      setDealsCursor(page.nextCursor);
+      setHasMoreDeals(!!page.nextCursor);
+      setDealsSyncedAt(page.syncedAt);
     } catch (error: any) {
       console.error('Error loading deals:', error);
       addNotification({
@@ -121,35 +139,136 @@ const App: React.FC = () => {
     }
   };
 
-  // Check for overdue follow-ups
+  // Imported deals sort ahead of everything loaded so far; reload the first page
+  const handleDealsImported = (count: number) => {
+    loadDeals();
+    addNotification({
+      id: Math.random().toString(),
+      message: `Imported ${count} deal${count === 1 ? '' : 's'}`,
+      type: 'info'
+    });
+  };
+
+  // A change already shown in the UI that will not reach the server
+  const reportUnsavedChange = (error: Error) => {
+    console.error('Dropping a change that could not be saved:', error);
+    addNotification({
+      id: Math.random().toString(),
+      message: 'A change could not be saved: ' + error.message,
+      type: 'alert'
+    });
+  };
+
+  // Background persistence for optimistic follow-up and timeline writes
+  useEffect(() => {
+    if (!isAuthenticated || !userId) return;
+
+    return startWriteQueue(userId, reportUnsavedChange);
+  }, [isAuthenticated, userId]);
+
+  // Keep the board in step with other tabs and devices once the first page is loaded
+  const syncReady = dealsSyncedAt !== undefined;
   useEffect(() => {
-    if (!isAuthenticated || deals.length === 0) return;
+    if (!isAuthenticated || !userId || !syncReady) return;
+
+    return startDealSync(userId, dealsSyncedAt ?? null, {
+      // Unsent local edits win over whatever row the server echoes meanwhile
+      onDealChange: deal => upsertDeals([withPendingUpdates(deal)]),
+      // No-op for ids not in the store, i.e. other users' deletes
+      onDealDelete: removeDeal,
+      onTimelineEvent: mergeRemoteTimelineEvent,
+      onError: error => console.error('Deal sync failed:', error)
+    });
+    // dealsSyncedAt only seeds the sync; later marks are tracked inside it
+  }, [isAuthenticated, userId, syncReady]);
 
-    const now = new Date();
-    const overdueCount = deals.filter(d =>
-      d.status !== DealStatus.SECURED &&
-      d.status !== DealStatus.GHOSTED &&
-      new Date(d.nextFollowUpAt) < now
-    ).length;
+  // Next keyset page, requested by the board as a column scrolls to its end
+  const loadMoreDeals = useCallback(async () => {
+    if (!userId || !dealsCursor || loadingMoreRef.current) return;
 
-    if (overdueCount > 0) {
+    loadingMoreRef.current = true;
+    try {
+      const page = await getDealsPage(userId, { cursor: dealsCursor });
+      // Deals already in the store may be newer than the page (realtime, local edits)
+      upsertDeals(page.deals.filter(d => !getDeal(d.id)));
+      setDealsCursor(page.nextCursor);
+      setHasMoreDeals(!!page.nextCursor);
+    } catch (error: any) {
+      console.error('Error loading more deals:', error);
+      addNotification({
+        id: Math.random().toString(),
+        message: 'Failed to load more deals: ' + error.message,
+        type: 'alert'
+      });
+    } finally {
+      loadingMoreRef.current = false;
+    }
+  }, [userId, dealsCursor]);
+
+  // Check for overdue follow-ups once the board has loaded. The server-built
+  // digest covers every deal, not just the loaded pages; without one (the
+  // job has not run, or nothing was due then) count what is loaded.
+  useEffect(() => {
+    if (!isAuthenticated || !userId || !syncReady) return;
+
+    let cancelled = false;
+    const alertOverdue = (overdueCount: number) => {
+      if (cancelled || overdueCount === 0) return;
       addNotification({
         id: 'follow-up-alert',
         message: `You have ${overdueCount} deal${overdueCount > 1 ? 's' : ''} that need follow-up!`,
         type: 'alert'
       });
-    }
-  }, [isAuthenticated, deals]);
+    };
+
+    getFollowUpDigest(userId)
+      .then(digest => {
+        if (!digest) return alertOverdue(countOverdueDeals());
+        if (digest.read) return;
+        alertOverdue(digest.count);
+        markNotificationRead(digest.id).catch(error => console.error('Failed to mark digest read:', error));
+      })
+      .catch(error => {
+        console.error('Error loading follow-up digest:', error);
+        alertOverdue(countOverdueDeals());
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [isAuthenticated, userId, syncReady]);
+
+  // ...and as each deal comes due while the app is open
+  useEffect(() => {
+    if (!isAuthenticated) return;
+
+    return onFollowUpsDue(dueDeals => {
+      addNotification({
+        id: `follow-up-due-${dueDeals[0].id}`,
+        message: dueDeals.length === 1
+          ? `Time to follow up with ${dueDeals[0].brandName}!`
+          : `${dueDeals.length} deals just came due for follow-up!`,
+        type: 'alert'
+      });
+    });
+  }, [isAuthenticated]);
 
   const handleLogin = () => {
     setIsAuthenticated(true);
   };
 
   const handleLogout = async () => {
+    // Queued writes need this session; push them out before it ends
+    const dropped = await drainWriteQueue();
+    if (dropped > 0) console.warn(`Discarding ${dropped} unsaved change(s) at sign-out`);
     await supabase.auth.signOut();
     setIsAuthenticated(false);
     setUserId(null);
-    setDeals([]);
+    clearDeals();
+    setDealsCursor(null);
+    setHasMoreDeals(false);
+    setDealsSyncedAt(undefined);
+    clearTimelines();
   };
 
   const handleCreateDeal = async (newDealData: any) => {
@@ -169,7 +288,7 @@ const App: React.FC = () => {
 
     try {
       const intervalDays = newDealData.followUpIntervalDays || 7;
-      const newDeal: Omit<BrandDeal, 'id' | 'timeline'> = {
+      const newDeal: Omit<BrandDeal, 'id'> = {
         brandName: newDealData.brandName,
         platform: newDealData.platform,
         contact: newDealData.contact || '',
@@ -182,15 +301,11 @@ const App: React.FC = () => {
         followUpCount: 0,
       };
 
-      const createdDeal = await createDeal(userId, newDeal);
-
-      // Add initial timeline event
-      const initialEvent = await addTimelineEvent(createdDeal.id, {
-        type: 'status_change',
-        description: 'Deal Created'
-      });
+      // Deal and its "Deal Created" event land together or not at all
+      const { deal: createdDeal, event: initialEvent } = await createDealWithEvent(userId, newDeal);
 
-      setDeals([{ ...createdDeal, timeline: [initialEvent] }, ...deals]);
+      setTimeline(createdDeal.id, [initialEvent]);
+      upsertDeals([createdDeal]);
       setIsModalOpen(false);
 
       addNotification({
@@ -214,25 +329,21 @@ const App: React.FC = () => {
     try {
       await updateDeal(id, updates);
 
-      setDeals(deals.map(d => {
-        if (d.id === id) {
-          const updated = { ...d, ...updates };
-
-          // Auto-timestamp status changes in timeline if not already done by components
-          if (updates.status && updates.status !== d.status) {
-            const event: TimelineEvent = {
-              id: Math.random().toString(36).substr(2, 9),
-              date: new Date().toISOString(),
-              type: 'status_change',
-              description: `Status changed to ${updates.status}`
-            };
-            updated.timeline = [...updated.timeline, event];
-          }
-
-          return updated;
-        }
-        return d;
-      }));
+      const previous = getDeal(id);
+
+      // Auto-timestamp status changes in timeline if not already done by components
+      if (previous && updates.status && updates.status !== previous.status) {
+        const event: TimelineEvent = {
+          id: crypto.randomUUID(),
+          date: new Date().toISOString(),
+          type: 'status_change',
+          description: `Status changed to ${updates.status}`
+        };
+        appendTimelineEvent(id, event);
+        enqueueTimelineEvent(id, event).catch(reportUnsavedChange);
+      }
+
+      patchDeal(id, updates);
     } catch (error: any) {
       console.error('Error updating deal:', error);
       addNotification({
@@ -243,37 +354,37 @@ const App: React.FC = () => {
     }
   };
 
+  // Optimistic: the UI updates at once and lib/writeQueue persists in the background
   const handleAddTimelineEvent = (dealId: string, event: Omit<TimelineEvent, 'id' | 'date'>) => {
-    setDeals(deals.map(d => {
-      if (d.id === dealId) {
-        const newEvent: TimelineEvent = {
-          id: Math.random().toString(36).substr(2, 9),
-          date: new Date().toISOString(),
-          ...event
-        };
-
-        const updatedDeal = { ...d, timeline: [...d.timeline, newEvent] };
-
-        // If it's a follow-up, update the next follow-up date and count
-        if (event.type === 'follow_up') {
-          updatedDeal.followUpCount = (d.followUpCount || 0) + 1;
-          updatedDeal.lastContactedAt = new Date().toISOString();
-          updatedDeal.nextFollowUpAt = new Date(Date.now() + 1000 * 60 * 60 * 24 * d.followUpIntervalDays).toISOString();
-
-          // Ghosting logic: if followUpCount >= 3, maybe suggest ghosting
-          if (updatedDeal.followUpCount >= 3) {
-            addNotification({
-              id: `ghosting-${d.id}`,
-              message: `It's been 3 follow-ups for ${d.brandName}. Consider marking as Ghosted?`,
-              type: 'info'
-            });
-          }
-        }
-
-        return updatedDeal;
+    const newEvent: TimelineEvent = {
+      id: crypto.randomUUID(),
+      date: new Date().toISOString(),
+      ...event
+    };
+    appendTimelineEvent(dealId, newEvent);
+    enqueueTimelineEvent(dealId, newEvent).catch(reportUnsavedChange);
+
+    const deal = getDeal(dealId);
+
+    // If it's a follow-up, update the next follow-up date and count
+    if (deal && event.type === 'follow_up') {
+      const updates = {
+        followUpCount: (deal.followUpCount || 0) + 1,
+        lastContactedAt: new Date().toISOString(),
+        nextFollowUpAt: new Date(Date.now() + 1000 * 60 * 60 * 24 * deal.followUpIntervalDays).toISOString()
+      };
+      patchDeal(dealId, updates);
+      enqueueDealUpdate(dealId, updates).catch(reportUnsavedChange);
+
+      // Ghosting logic: if followUpCount >= 3, maybe suggest ghosting
+      if (updates.followUpCount >= 3) {
+        addNotification({
+          id: `ghosting-${deal.id}`,
+          message: `It's been 3 follow-ups for ${deal.brandName}. Consider marking as Ghosted?`,
+          type: 'info'
+        });
       }
-      return d;
-    }));
+    }
   };
 
   if (authLoading) {
@@ -322,14 +433,13 @@ const App: React.FC = () => {
           {/* Protected Routes */}
           <Route path="/*" element={
             isAuthenticated ? (
-              <Layout isPro={isPro} togglePro={togglePro} onNewDeal={() => setIsModalOpen(true)} onLogout={handleLogout} triggerFeedback={triggerFeedback}>
+              <Layout isPro={isPro} togglePro={togglePro} onNewDeal={() => setIsModalOpen(true)} onImportExport={() => setIsTransferOpen(true)} onLogout={handleLogout} triggerFeedback={triggerFeedback}>
                 <Routes>
-                  <Route path="/" element={<DealBoard deals={deals} onNewDeal={() => setIsModalOpen(true)} />} />
+                  <Route path="/" element={<DealBoard onNewDeal={() => setIsModalOpen(true)} hasMore={hasMoreDeals} onLoadMore={loadMoreDeals} />} />
                   <Route
                     path="/deal/:id"
                     element={
                       <DealDetail
-                        deals={deals}
                         isPro={isPro}
                         updateDeal={handleUpdateDeal}
                         addTimelineEvent={handleAddTimelineEvent}
@@ -345,6 +455,12 @@ const App: React.FC = () => {
                   onCreate={handleCreateDeal}
                   onCreated={() => triggerFeedback('post_creation')}
                 />
+                <ImportExportModal
+                  isOpen={isTransferOpen}
+                  onClose={() => setIsTransferOpen(false)}
+                  userId={userId}
+                  onImported={handleDealsImported}
+                />
               </Layout>
             ) : (
               <Navigate to="/landing" replace />
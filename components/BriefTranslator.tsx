@@ -13,14 +13,16 @@ export const BriefTranslator: React.FC<BriefTranslatorProps> = ({ deal, updateDe
   const [loading, setLoading] = useState(false);
   const [showForm, setShowForm] = useState(!deal.briefAnalysis);
   const [briefText, setBriefText] = useState('');
+  const [partial, setPartial] = useState<Partial<BriefAnalysisResult>>({});
 
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
     if (!briefText.trim()) return;
 
     setLoading(true);
+    setPartial({});
     try {
-      const result = await analyzeBriefWithGemini(briefText);
+      const result = await analyzeBriefWithGemini(briefText, setPartial);
       updateDeal({ briefAnalysis: result });
       setShowForm(false);
       if (onResult) onResult();
@@ -61,12 +63,37 @@ export const BriefTranslator: React.FC<BriefTranslatorProps> = ({ deal, updateDe
               {loading ? <Loader2 className="animate-spin" size={14} /> : <><ShieldAlert size={14} /> Scan Brief</>}
             </button>
           </div>
+
+          {/* Each field fills in as the stream completes it */}
+          {loading && !!(partial.summary || partial.redFlags?.length || partial.checklist?.length || partial.questionsToAsk?.length) && (
+            <div className="p-4 bg-slate-50/50 border border-slate-100 rounded-xl md:rounded-2xl space-y-2 animate-in fade-in">
+              {partial.summary && <p className="text-xs text-slate-600 leading-relaxed">{partial.summary}</p>}
+              {partial.redFlags?.map((flag, i) => (
+                <div key={`flag-${i}`} className="flex gap-2 text-[11px] font-bold text-red-600">
+                  <AlertTriangle size={12} className="shrink-0 mt-0.5" />
+                  <span>{flag}</span>
+                </div>
+              ))}
+              {partial.checklist?.map((item, i) => (
+                <div key={`check-${i}`} className="flex gap-2 text-[11px] font-medium text-slate-600">
+                  <CheckSquare size={12} className="shrink-0 mt-0.5 text-slate-400" />
+                  <span>{item}</span>
+                </div>
+              ))}
+              {partial.questionsToAsk?.map((q, i) => (
+                <div key={`question-${i}`} className="flex gap-2 text-[11px] font-bold text-blue-800 italic">
+                  <MessageCircle size={12} className="shrink-0 mt-0.5 text-blue-500" />
+                  <span>"{q}"</span>
+                </div>
+              ))}
+            </div>
+          )}
         </form>
       </div>
     );
   }
 
-  const { summary, redFlags, checklist, questionsToAsk } = deal.briefAnalysis!;
+  const { summary, redFlags, checklist, questionsToAsk, cached } = deal.briefAnalysis!;
 
   return (
     <div className="space-y-5 md:space-y-6 animate-in fade-in slide-in-from-bottom-2">
@@ -100,6 +127,9 @@ export const BriefTranslator: React.FC<BriefTranslatorProps> = ({ deal, updateDe
         <div className="flex items-center gap-2 px-1 text-slate-400">
           <FileCheck size={14} />
           <span className="text-[8px] md:text-[9px] font-black uppercase tracking-widest pt-0.5">Abstract</span>
+          {cached && (
+            <span className="px-1.5 py-0.5 rounded bg-slate-100 text-slate-500 text-[8px] font-black uppercase tracking-widest">Cached</span>
+          )}
         </div>
         <div className="bg-white rounded-xl md:rounded-2xl border border-slate-100 p-4 md:p-5 text-xs md:text-[13px] font-medium text-slate-700 leading-relaxed shadow-sm">
           {summary}
@@ -1,14 +1,25 @@
-import React, { useState, useMemo } from 'react';
+import React, { useState, useMemo, useEffect, useLayoutEffect, useRef, useCallback } from 'react';
 import { BrandDeal, DealStatus, Platform } from '../types';
 import { DealCard } from './DealCard';
 import { Search, Plus, Sparkles, BarChart2, Clock, Zap, Instagram, Youtube, Mail, Globe, RotateCcw } from 'lucide-react';
 import { motion, AnimatePresence } from 'framer-motion';
+import { createDealSearchIndex } from '../lib/dealSearch';
+import { getAllDeals, getDealIdsByPlatform, getDealsByStatus, getOverdueDeals, useDealsVersion } from '../lib/dealStore';
 
 interface DealBoardProps {
-  deals: BrandDeal[];
   onNewDeal?: () => void;
+  hasMore?: boolean;
+  onLoadMore?: () => void;
 }
 
+const SEARCH_DEBOUNCE_MS = 150;
+
+// Columns longer than this mount only the cards near the viewport
+const VIRTUALIZE_AFTER = 30;
+const CARD_ESTIMATE_PX = 200;
+const CARD_GAP_PX = 16;
+const OVERSCAN_PX = 600;
+
 const COLUMNS = [
   { status: DealStatus.DRAFT, label: 'Discovery' },
   { status: DealStatus.OUTREACH, label: 'Outreach' },
@@ -38,39 +49,221 @@ const PLATFORM_ICONS: Record<string, any> = {
   [Platform.OTHER]: Globe,
 };
 
-export const DealBoard: React.FC<DealBoardProps> = ({ deals, onNewDeal }) => {
+// Asks for the next page once the end of the board scrolls into view. The
+// observer is built once and reads the latest callback through a ref, so a new
+// onVisible after each page does not re-fire it while the sentinel stays put.
+const LoadMoreSentinel = ({ onVisible }: { onVisible: () => void }) => {
+  const ref = useRef<HTMLDivElement>(null);
+  const onVisibleRef = useRef(onVisible);
+  onVisibleRef.current = onVisible;
+
+  useEffect(() => {
+    const node = ref.current;
+    if (!node) return;
+    const observer = new IntersectionObserver(entries => {
+      if (entries.some(e => e.isIntersecting)) onVisibleRef.current();
+    }, { rootMargin: '400px 0px' });
+    observer.observe(node);
+    return () => observer.disconnect();
+  }, []);
+
+  return <div ref={ref} className="h-px" aria-hidden="true" />;
+};
+
+function scrollParentOf(node: HTMLElement): HTMLElement | null {
+  for (let el = node.parentElement; el; el = el.parentElement) {
+    const { overflowY } = getComputedStyle(el);
+    if (overflowY === 'auto' || overflowY === 'scroll') return el;
+  }
+  return null;
+}
+
+// Smallest index whose offset is greater than value
+function firstOffsetAbove(offsets: number[], value: number): number {
+  let lo = 0;
+  let hi = offsets.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (offsets[mid] <= value) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+// Windowed column: cards outside the viewport (plus overscan) are replaced by
+// padding sized from measured heights, so layout animations and measurement
+// only ever run for the handful of cards on screen.
+const VirtualCardList = ({ deals }: { deals: BrandDeal[] }) => {
+  const listRef = useRef<HTMLDivElement>(null);
+  const heights = useRef(new Map<string, number>());
+  const [measured, setMeasured] = useState(0);
+  const [range, setRange] = useState<[number, number]>([0, 0]);
+
+  const offsets = useMemo(() => {
+    const result = [0];
+    for (const deal of deals) {
+      result.push(result[result.length - 1] + (heights.current.get(deal.id) ?? CARD_ESTIMATE_PX) + CARD_GAP_PX);
+    }
+    return result;
+  }, [deals, measured]);
+
+  const offsetsRef = useRef(offsets);
+  offsetsRef.current = offsets;
+
+  const updateRange = useCallback(() => {
+    const list = listRef.current;
+    if (!list) return;
+    const parent = scrollParentOf(list);
+    const viewTop = parent ? parent.getBoundingClientRect().top : 0;
+    const viewBottom = parent ? parent.getBoundingClientRect().bottom : window.innerHeight;
+    const listTop = list.getBoundingClientRect().top;
+    const current = offsetsRef.current;
+    const count = current.length - 1;
+    const start = Math.max(0, firstOffsetAbove(current, viewTop - listTop - OVERSCAN_PX) - 1);
+    const end = Math.min(count, firstOffsetAbove(current, viewBottom - listTop + OVERSCAN_PX));
+    setRange(prev => prev[0] === start && prev[1] === end ? prev : [start, end]);
+  }, []);
+
+  useLayoutEffect(updateRange, [offsets, updateRange]);
+
+  useEffect(() => {
+    const list = listRef.current;
+    if (!list) return;
+    const target: HTMLElement | Window = scrollParentOf(list) || window;
+    let frame = 0;
+    const onScroll = () => {
+      if (frame) return;
+      frame = requestAnimationFrame(() => {
+        frame = 0;
+        updateRange();
+      });
+    };
+    target.addEventListener('scroll', onScroll, { passive: true });
+    window.addEventListener('resize', onScroll);
+    return () => {
+      cancelAnimationFrame(frame);
+      target.removeEventListener('scroll', onScroll);
+      window.removeEventListener('resize', onScroll);
+    };
+  }, [updateRange]);
+
+  // Real card heights replace the estimate as cards mount or reflow. A node
+  // that has left the DOM, or has not been laid out yet, reports 0: keep the
+  // last good height rather than collapse the offsets.
+  const observer = useMemo(() => new ResizeObserver(entries => {
+    let changed = false;
+    for (const entry of entries) {
+      const target = entry.target as HTMLElement;
+      const id = target.dataset.dealId!;
+      const height = entry.contentRect.height;
+      if (!target.isConnected || height === 0) continue;
+      if (Math.abs((heights.current.get(id) ?? -1) - height) > 1) {
+        heights.current.set(id, height);
+        changed = true;
+      }
+    }
+    if (changed) setMeasured(n => n + 1);
+  }), []);
+
+  useEffect(() => () => observer.disconnect(), [observer]);
+
+  // One stable ref callback per card, so a re-render does not unobserve and
+  // re-observe every mounted card; unmounting (the null call) unobserves it
+  const nodes = useRef(new Map<string, HTMLElement>());
+  const refCallbacks = useRef(new Map<string, (node: HTMLDivElement | null) => void>());
+  const measureRef = useCallback((id: string) => {
+    let callback = refCallbacks.current.get(id);
+    if (!callback) {
+      callback = (node: HTMLDivElement | null) => {
+        const previous = nodes.current.get(id);
+        if (previous && previous !== node) {
+          observer.unobserve(previous);
+          nodes.current.delete(id);
+        }
+        if (node) {
+          nodes.current.set(id, node);
+          observer.observe(node);
+        } else {
+          refCallbacks.current.delete(id);
+        }
+      };
+      refCallbacks.current.set(id, callback);
+    }
+    return callback;
+  }, [observer]);
+
+  const [start, end] = range;
+  return (
+    <div
+      ref={listRef}
+      style={{ paddingTop: offsets[start], paddingBottom: offsets[deals.length] - offsets[end] }}
+    >
+      {deals.slice(start, end).map(deal => (
+        <motion.div
+          key={deal.id}
+          layout="position"
+          transition={{ type: 'spring', damping: 25, stiffness: 400 }}
+          data-deal-id={deal.id}
+          ref={measureRef(deal.id)}
+          style={{ paddingBottom: CARD_GAP_PX }}
+        >
+          <DealCard deal={deal} />
+        </motion.div>
+      ))}
+    </div>
+  );
+};
+
+export const DealBoard: React.FC<DealBoardProps> = ({ onNewDeal, hasMore = false, onLoadMore }) => {
+  const [searchInput, setSearchInput] = useState('');
   const [searchTerm, setSearchTerm] = useState('');
   const [platformFilter, setPlatformFilter] = useState<Platform | 'ALL'>('ALL');
   const [statusFilter, setStatusFilter] = useState<DealStatus | 'ALL'>('ALL');
   const [quickFilter, setQuickFilter] = useState<'NONE' | 'FOLLOWUP' | 'NEGOTIATING'>('NONE');
   const [sortBy, setSortBy] = useState<'recent' | 'value'>('recent');
 
-  const filteredDeals = useMemo(() => {
-    return deals
-      .filter(d => {
-        const matchesSearch = d.brandName.toLowerCase().includes(searchTerm.toLowerCase()) ||
-          (d.contact && d.contact.toLowerCase().includes(searchTerm.toLowerCase()));
-        const matchesPlatform = platformFilter === 'ALL' || d.platform === platformFilter;
-        const matchesStatus = statusFilter === 'ALL' || d.status === statusFilter;
-
-        let matchesQuick = true;
-        if (quickFilter === 'FOLLOWUP') {
-          matchesQuick = new Date(d.nextFollowUpAt) < new Date() && d.status !== DealStatus.SECURED && d.status !== DealStatus.GHOSTED;
-        } else if (quickFilter === 'NEGOTIATING') {
-          matchesQuick = d.status === DealStatus.NEGOTIATING;
-        }
+  const dealsVersion = useDealsVersion();
+  const deals = getAllDeals();
+  const [searchIndex] = useState(createDealSearchIndex);
 
-        return matchesSearch && matchesPlatform && matchesStatus && matchesQuick;
-      })
-      .sort((a, b) => {
-        if (sortBy === 'value') return (b.dealValue || 0) - (a.dealValue || 0);
-        return new Date(b.lastContactedAt).getTime() - new Date(a.lastContactedAt).getTime();
-      });
-  }, [deals, searchTerm, platformFilter, statusFilter, quickFilter, sortBy]);
+  // Search once typing pauses rather than on every keystroke
+  useEffect(() => {
+    const timer = setTimeout(() => setSearchTerm(searchInput), SEARCH_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [searchInput]);
+
+  const visibleColumns = COLUMNS.filter(col => statusFilter === 'ALL' || col.status === statusFilter);
 
-  const hasActiveFilters = searchTerm !== '' || platformFilter !== 'ALL' || statusFilter !== 'ALL' || quickFilter !== 'NONE';
+  // One pass per visible column over the store's status index
+  const dealsByColumn = useMemo(() => {
+    searchIndex.sync(deals);
+    const matchIds = searchIndex.search(searchTerm);
+    const platformIds = platformFilter === 'ALL' ? null : getDealIdsByPlatform(platformFilter);
+    const overdueIds = quickFilter === 'FOLLOWUP' ? new Set(getOverdueDeals().map(d => d.id)) : null;
+
+    const result = new Map<DealStatus, BrandDeal[]>();
+    for (const col of visibleColumns) {
+      if (quickFilter === 'NEGOTIATING' && col.status !== DealStatus.NEGOTIATING) {
+        result.set(col.status, []);
+        continue;
+      }
+      const columnDeals = getDealsByStatus(col.status)
+        .filter(d => {
+          const matchesSearch = !matchIds || matchIds.has(d.id);
+          const matchesPlatform = !platformIds || platformIds.has(d.id);
+          const matchesQuick = !overdueIds || overdueIds.has(d.id);
+          return matchesSearch && matchesPlatform && matchesQuick;
+        })
+        .sort((a, b) => searchIndex.sortKey(b.id, sortBy) - searchIndex.sortKey(a.id, sortBy));
+      result.set(col.status, columnDeals);
+    }
+    return result;
+  }, [dealsVersion, searchTerm, platformFilter, statusFilter, quickFilter, sortBy]);
+
+  const hasActiveFilters = searchInput !== '' || platformFilter !== 'ALL' || statusFilter !== 'ALL' || quickFilter !== 'NONE';
 
   const resetFilters = () => {
+    setSearchInput('');
     setSearchTerm('');
     setPlatformFilter('ALL');
     setStatusFilter('ALL');
@@ -128,10 +321,10 @@ export const DealBoard: React.FC<DealBoardProps> = ({ deals, onNewDeal }) => {
             <Search className="absolute left-4 top-1/2 -translate-y-1/2 text-slate-400 group-focus-within:text-blue-500 transition-colors" size={18} />
             <input
               type="text"
-              placeholder="Search by brand or contact..."
+              placeholder="Search brand, contact or notes..."
               className="w-full bg-white/50 backdrop-blur-md border border-slate-200 rounded-[1.2rem] md:rounded-[1.5rem] pl-11 pr-4 py-3.5 md:py-4 text-sm focus:ring-4 focus:ring-blue-500/10 focus:border-blue-400 outline-none transition-all font-medium"
-              value={searchTerm}
-              onChange={e => setSearchTerm(e.target.value)}
+              value={searchInput}
+              onChange={e => setSearchInput(e.target.value)}
             />
           </div>
 
@@ -197,8 +390,8 @@ export const DealBoard: React.FC<DealBoardProps> = ({ deals, onNewDeal }) => {
       </header>
 
       <div className={`grid grid-cols-1 ${statusFilter === 'ALL' ? 'sm:grid-cols-2 lg:grid-cols-6' : 'max-w-xl mx-auto'} gap-6 md:gap-8 items-start relative z-10`}>
-        {COLUMNS.filter(col => statusFilter === 'ALL' || col.status === statusFilter).map((col) => {
-          const statusDeals = filteredDeals.filter(d => d.status === col.status);
+        {visibleColumns.map((col) => {
+          const statusDeals = dealsByColumn.get(col.status) || [];
           return (
             <div key={col.status} className="flex flex-col gap-4 md:gap-5 min-h-0 md:min-h-[500px]">
               <div className="flex items-center justify-between px-2 mb-1 md:mb-2">
@@ -214,20 +407,24 @@ export const DealBoard: React.FC<DealBoardProps> = ({ deals, onNewDeal }) => {
               </div>
 
               <div className="space-y-4">
-                <AnimatePresence mode="popLayout" initial={false}>
-                  {statusDeals.map(deal => (
-                    <motion.div
-                      key={deal.id}
-                      layout
-                      initial={{ opacity: 0, scale: 0.9, y: 10 }}
-                      animate={{ opacity: 1, scale: 1, y: 0 }}
-                      exit={{ opacity: 0, scale: 0.9, transition: { duration: 0.15 } }}
-                      transition={{ type: 'spring', damping: 25, stiffness: 400 }}
-                    >
-                      <DealCard deal={deal} />
-                    </motion.div>
-                  ))}
-                </AnimatePresence>
+                {statusDeals.length > VIRTUALIZE_AFTER ? (
+                  <VirtualCardList deals={statusDeals} />
+                ) : (
+                  <AnimatePresence mode="popLayout" initial={false}>
+                    {statusDeals.map(deal => (
+                      <motion.div
+                        key={deal.id}
+                        layout
+                        initial={{ opacity: 0, scale: 0.9, y: 10 }}
+                        animate={{ opacity: 1, scale: 1, y: 0 }}
+                        exit={{ opacity: 0, scale: 0.9, transition: { duration: 0.15 } }}
+                        transition={{ type: 'spring', damping: 25, stiffness: 400 }}
+                      >
+                        <DealCard deal={deal} />
+                      </motion.div>
+                    ))}
+                  </AnimatePresence>
+                )}
 
                 {statusDeals.length === 0 && (
                   <div className="border-2 border-dashed border-slate-100 rounded-[2rem] md:rounded-3xl p-6 md:p-8 flex flex-col items-center justify-center text-center group hover:border-blue-100 transition-colors">
@@ -242,6 +439,8 @@ export const DealBoard: React.FC<DealBoardProps> = ({ deals, onNewDeal }) => {
           );
         })}
       </div>
+
+      {hasMore && onLoadMore && <LoadMoreSentinel onVisible={onLoadMore} />}
     </div>
   );
 };
@@ -5,7 +5,8 @@ import {
   Mail, Youtube, Instagram, Globe,
   ArrowRight, Target, AlertCircle, Clock, Zap
 } from 'lucide-react';
-import { getDealAction } from '../types';
+import { useDealState } from '../lib/dealState';
+import { prefetchTimeline } from '../lib/timelines';
 import { motion } from 'framer-motion';
 
 interface DealCardProps {
@@ -24,15 +25,11 @@ const TikTokIcon = ({ size = 20 }: { size?: number }) => (
   </svg>
 );
 
-export const DealCard: React.FC<DealCardProps> = ({ deal }) => {
+// Memoized: the deal store keeps untouched deals' identity, so an edit re-renders only its own card
+export const DealCard = React.memo<DealCardProps>(({ deal }) => {
   const navigate = useNavigate();
-  const isOverdue = new Date(deal.nextFollowUpAt) < new Date() &&
-    deal.status !== DealStatus.SECURED &&
-    deal.status !== DealStatus.GHOSTED;
-
-  const action = getDealAction(deal);
-
-  const daysSinceLastContact = Math.floor((new Date().getTime() - new Date(deal.lastContactedAt).getTime()) / (1000 * 60 * 60 * 24));
+  // Cached per deal; re-evaluated only when a follow-up or day boundary passes
+  const { action, isOverdue, daysSinceLastContact } = useDealState(deal)!;
 
   const getSilenceColor = (days: number) => {
     if (days >= 8) return 'text-slate-400 opacity-60';
@@ -45,6 +42,7 @@ export const DealCard: React.FC<DealCardProps> = ({ deal }) => {
       whileHover={{ y: -6, scale: 1.02 }}
       whileTap={{ scale: 0.98 }}
       onClick={() => navigate(`/deal/${deal.id}`)}
+      onMouseEnter={() => prefetchTimeline(deal.id)}
       className="glass-card rounded-[2rem] p-5 cursor-pointer flex flex-col gap-4 interactive-glow group"
     >
       <div className="flex justify-between items-start">
@@ -111,4 +109,4 @@ export const DealCard: React.FC<DealCardProps> = ({ deal }) => {
       </div>
     </motion.div>
   );
-};
+});
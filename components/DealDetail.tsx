@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { BrandDeal, DealStatus, TimelineEvent } from '../types';
 import {
@@ -6,15 +6,17 @@ import {
   MessageSquare, ExternalLink, Globe, User, ShieldCheck,
   Zap, Share2, MoreHorizontal, FileText, ChevronRight,
   Brain, ShieldAlert, Download, Target,
-  Sparkles, History, Kanban, Instagram, Youtube, Mail, DollarSign
+  Sparkles, History, Kanban, Instagram, Youtube, Mail, DollarSign, Loader2
 } from 'lucide-react';
 import { RateChecker } from './RateChecker';
 import { BriefTranslator } from './BriefTranslator';
-import { getDealAction } from '../types';
+import { useDealState } from '../lib/dealState';
+import { useTimeline } from '../lib/timelines';
+import { getDeal, upsertDeals, useDeal } from '../lib/dealStore';
+import { getDealById } from '../lib/api';
 import { motion } from 'framer-motion';
 
 interface DealDetailProps {
-  deals: BrandDeal[];
   isPro: boolean;
   updateDeal: (id: string, updates: Partial<BrandDeal>) => void;
   addTimelineEvent: (dealId: string, event: Omit<TimelineEvent, 'id' | 'date'>) => void;
@@ -33,11 +35,43 @@ const TikTokIcon = ({ size = 20 }: { size?: number }) => (
   </svg>
 );
 
-export const DealDetail: React.FC<DealDetailProps> = ({ deals, isPro, updateDeal, addTimelineEvent, triggerFeedback }) => {
+export const DealDetail: React.FC<DealDetailProps> = ({ isPro, updateDeal, addTimelineEvent, triggerFeedback }) => {
   const { id } = useParams<{ id: string }>();
   const navigate = useNavigate();
+  const timeline = useTimeline(id);
 
-  const deal = deals.find(d => d.id === id);
+  const deal = useDeal(id);
+  const dealState = useDealState(deal);
+  // The board only loads recent pages; a deep link may need the row itself
+  const [lookup, setLookup] = useState<'idle' | 'loading' | 'missing'>('idle');
+
+  const inStore = !!deal;
+
+  useEffect(() => {
+    if (!id || inStore) return;
+    let cancelled = false;
+    setLookup('loading');
+    getDealById(id)
+      .then(found => {
+        if (cancelled) return;
+        // A page or realtime update may have brought it in meanwhile
+        if (found && !getDeal(found.id)) upsertDeals([found]);
+        setLookup(found ? 'idle' : 'missing');
+      })
+      .catch(err => {
+        console.error('Failed to load deal:', err);
+        if (!cancelled) setLookup('missing');
+      });
+    return () => { cancelled = true; };
+  }, [id, inStore]);
+
+  if (!deal && lookup !== 'missing') {
+    return (
+      <div className="p-12 flex justify-center text-slate-300">
+        <Loader2 className="animate-spin" size={24} />
+      </div>
+    );
+  }
 
   if (!deal) {
     return (
@@ -57,9 +91,7 @@ export const DealDetail: React.FC<DealDetailProps> = ({ deals, isPro, updateDeal
     deal.status !== DealStatus.GHOSTED &&
     deal.status !== DealStatus.REPLIED;
 
-  const action = getDealAction(deal);
-
-  const daysSinceLastContact = Math.floor((new Date().getTime() - new Date(deal.lastContactedAt).getTime()) / (1000 * 60 * 60 * 24));
+  const { action, daysSinceLastContact } = dealState!;
 
   const handlePrint = () => {
     window.print();
@@ -248,14 +280,18 @@ export const DealDetail: React.FC<DealDetailProps> = ({ deals, isPro, updateDeal
                 <History size={18} className="text-slate-300 md:size-5" />
                 <h2 className="text-[9px] md:text-[10px] font-black uppercase tracking-[0.2em] text-slate-400">Activity Log</h2>
               </div>
-              <div className="text-[8px] md:text-[9px] font-bold text-slate-300 uppercase tracking-widest">{deal.timeline.length} Events</div>
+              <div className="text-[8px] md:text-[9px] font-bold text-slate-300 uppercase tracking-widest">{timeline.loading && timeline.events.length === 0 ? 'Loading' : `${timeline.events.length} Events`}</div>
             </div>
 
             <div className="relative pl-6 md:pl-7 space-y-8 md:space-y-10">
               {/* Vertical Line */}
               <div className="absolute left-[7px] md:left-[8px] top-2 bottom-2 w-[1px] bg-slate-100" />
 
-              {deal.timeline.map((event, idx) => (
+              {timeline.error && timeline.events.length === 0 && (
+                <p className="text-[9px] md:text-[10px] font-bold text-red-400 uppercase tracking-widest">Could not load activity</p>
+              )}
+
+              {timeline.events.map((event, idx) => (
                 <div key={event.id} className="relative group/item">
                   <div className={`absolute - left - [26px] md: -left - [27px] top - 1.5 w - 3.5 h - 3.5 md: w - 4 md: h - 4 rounded - full border - 4 border - white shadow - sm transition - all duration - 500 ${idx === 0 ? 'bg-blue-600 scale-110' : 'bg-slate-200 group-hover/item:bg-slate-400'} `} />
                   <div className="flex flex-col">
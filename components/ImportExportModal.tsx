@@ -0,0 +1,162 @@
+import React, { useRef, useState } from 'react';
+import { motion, AnimatePresence } from 'framer-motion';
+import { X, Upload, Download, FileSpreadsheet, AlertTriangle } from 'lucide-react';
+import { downloadDeals, importDeals, ImportProgress, TransferFormat } from '../lib/dealTransfer';
+
+interface ImportExportModalProps {
+  isOpen: boolean;
+  onClose: () => void;
+  userId: string | null;
+  onImported: (count: number) => void;
+}
+
+const MAX_SHOWN_ERRORS = 5;
+
+export const ImportExportModal: React.FC<ImportExportModalProps> = ({ isOpen, onClose, userId, onImported }) => {
+  const fileInput = useRef<HTMLInputElement>(null);
+  const [progress, setProgress] = useState<ImportProgress | null>(null);
+  const [busy, setBusy] = useState<'import' | TransferFormat | null>(null);
+  const [failure, setFailure] = useState<string | null>(null);
+
+  const handleFile = async (file: File | undefined) => {
+    if (!file || !userId) return;
+    setBusy('import');
+    setFailure(null);
+    setProgress(null);
+    try {
+      const result = await importDeals(userId, file, setProgress);
+      if (result.imported > 0) onImported(result.imported);
+    } catch (error: any) {
+      setFailure(error.message || 'Import failed');
+    } finally {
+      setBusy(null);
+      if (fileInput.current) fileInput.current.value = '';
+    }
+  };
+
+  const handleExport = async (format: TransferFormat) => {
+    if (!userId) return;
+    setBusy(format);
+    setFailure(null);
+    try {
+      await downloadDeals(userId, format);
+    } catch (error: any) {
+      setFailure(error.message || 'Export failed');
+    } finally {
+      setBusy(null);
+    }
+  };
+
+  const handleClose = () => {
+    if (busy) return;
+    setProgress(null);
+    setFailure(null);
+    onClose();
+  };
+
+  const percent = progress && progress.totalBytes > 0
+    ? Math.round(100 * progress.bytesRead / progress.totalBytes)
+    : 0;
+
+  return (
+    <AnimatePresence>
+      {isOpen && (
+        <div className="fixed inset-0 z-[100] flex items-center justify-center p-4">
+          <motion.div
+            initial={{ opacity: 0 }}
+            animate={{ opacity: 1 }}
+            exit={{ opacity: 0 }}
+            onClick={handleClose}
+            className="absolute inset-0 bg-black/40 backdrop-blur-sm"
+          />
+
+          <motion.div
+            initial={{ opacity: 0, scale: 0.9, y: 20 }}
+            animate={{ opacity: 1, scale: 1, y: 0 }}
+            exit={{ opacity: 0, scale: 0.9, y: 20 }}
+            className="bg-white rounded-[2rem] w-full max-w-md overflow-hidden shadow-2xl relative z-10"
+          >
+            <div className="p-8">
+              <div className="flex items-center justify-between mb-8">
+                <div className="flex items-center gap-3">
+                  <div className="w-10 h-10 bg-blue-600 text-white rounded-xl flex items-center justify-center shadow-lg">
+                    <FileSpreadsheet size={20} />
+                  </div>
+                  <span className="text-[10px] font-black uppercase tracking-widest text-slate-400">Import / Export</span>
+                </div>
+                <button onClick={handleClose} className="p-2 text-slate-400 hover:text-slate-900 transition-colors">
+                  <X size={20} />
+                </button>
+              </div>
+
+              <h2 className="text-2xl font-black text-slate-950 mb-2 tracking-tight leading-tight">
+                Move your deals
+              </h2>
+              <p className="text-sm text-slate-500 font-medium mb-6">
+                Import a CSV or JSON file with one deal per row, or download everything on your board.
+              </p>
+
+              <input
+                ref={fileInput}
+                type="file"
+                accept=".csv,.json,.ndjson,.jsonl,text/csv,application/json"
+                className="hidden"
+                onChange={(e) => handleFile(e.target.files?.[0])}
+              />
+              <button
+                disabled={!!busy}
+                onClick={() => fileInput.current?.click()}
+                className="w-full flex items-center justify-center gap-2 py-4 rounded-2xl font-black uppercase tracking-widest text-sm transition-all bg-slate-950 text-white shadow-xl hover:scale-[1.02] active:scale-95 disabled:bg-slate-100 disabled:text-slate-400 disabled:shadow-none disabled:cursor-not-allowed"
+              >
+                <Upload size={16} />
+                {busy === 'import' ? 'Importing...' : 'Import File'}
+              </button>
+
+              {progress && (
+                <div className="mt-6 space-y-3">
+                  <div className="h-2 bg-slate-100 rounded-full overflow-hidden">
+                    <div className="h-full bg-blue-600 transition-all" style={{ width: `${percent}%` }} />
+                  </div>
+                  <p className="text-xs font-bold text-slate-500">
+                    {progress.imported} imported · {progress.errors.length} skipped · {progress.processed} rows read
+                  </p>
+                  {progress.errors.length > 0 && (
+                    <ul className="text-xs text-amber-700 bg-amber-50 rounded-xl p-3 space-y-1">
+                      {progress.errors.slice(0, MAX_SHOWN_ERRORS).map((error) => (
+                        <li key={error.row} className="flex items-start gap-2">
+                          <AlertTriangle size={12} className="mt-0.5 flex-shrink-0" />
+                          Row {error.row}: {error.message}
+                        </li>
+                      ))}
+                      {progress.errors.length > MAX_SHOWN_ERRORS && (
+                        <li className="font-bold">+{progress.errors.length - MAX_SHOWN_ERRORS} more</li>
+                      )}
+                    </ul>
+                  )}
+                </div>
+              )}
+
+              {failure && (
+                <p className="mt-4 text-xs font-bold text-red-600">{failure}</p>
+              )}
+
+              <div className="grid grid-cols-2 gap-3 mt-8">
+                {(['csv', 'json'] as TransferFormat[]).map((format) => (
+                  <button
+                    key={format}
+                    disabled={!!busy}
+                    onClick={() => handleExport(format)}
+                    className="flex items-center justify-center gap-2 p-4 rounded-2xl border-2 border-slate-100 hover:border-slate-200 text-slate-600 font-bold text-sm transition-all disabled:opacity-50 disabled:cursor-not-allowed"
+                  >
+                    <Download size={14} />
+                    {busy === format ? 'Exporting...' : `Export ${format.toUpperCase()}`}
+                  </button>
+                ))}
+              </div>
+            </div>
+          </motion.div>
+        </div>
+      )}
+    </AnimatePresence>
+  );
+};
@@ -1,5 +1,5 @@
 import React, { useState } from 'react';
-import { LayoutDashboard, Plus, LogOut, ShieldCheck, Zap, Menu, X, MessageSquare } from 'lucide-react';
+import { LayoutDashboard, Plus, LogOut, ShieldCheck, Zap, Menu, X, MessageSquare, FileSpreadsheet } from 'lucide-react';
 import { Link, useLocation } from 'react-router-dom';
 import { motion, AnimatePresence } from 'framer-motion';
 
@@ -8,11 +8,12 @@ interface LayoutProps {
   isPro: boolean;
   togglePro: () => void;
   onNewDeal: () => void;
+  onImportExport: () => void;
   onLogout: () => void;
   triggerFeedback: (type: any) => void;
 }
 
-export const Layout: React.FC<LayoutProps> = ({ children, isPro, togglePro, onNewDeal, onLogout, triggerFeedback }) => {
+export const Layout: React.FC<LayoutProps> = ({ children, isPro, togglePro, onNewDeal, onImportExport, onLogout, triggerFeedback }) => {
   const location = useLocation();
   const [isMobileMenuOpen, setIsMobileMenuOpen] = useState(false);
 
@@ -83,6 +84,17 @@ export const Layout: React.FC<LayoutProps> = ({ children, isPro, togglePro, onNe
           New Deal
         </button>
 
+        <button
+          onClick={() => {
+            onImportExport();
+            setIsMobileMenuOpen(false);
+          }}
+          className="w-full flex items-center justify-center gap-2 text-slate-500 hover:text-blue-600 hover:bg-blue-50 px-4 py-2 rounded-xl text-xs font-bold transition-all"
+        >
+          <FileSpreadsheet size={14} />
+          Import / Export
+        </button>
+
         <button
           onClick={() => {
             triggerFeedback('general');
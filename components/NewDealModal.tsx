@@ -6,7 +6,7 @@ import { motion, AnimatePresence } from 'framer-motion';
 interface NewDealModalProps {
   isOpen: boolean;
   onClose: () => void;
-  onCreate: (deal: Omit<BrandDeal, 'id' | 'timeline' | 'lastContactedAt' | 'nextFollowUpAt' | 'followUpCount'>) => Promise<void>;
+  onCreate: (deal: Omit<BrandDeal, 'id' | 'lastContactedAt' | 'nextFollowUpAt' | 'followUpCount'>) => Promise<void>;
   onCreated?: () => void;
 }
 
@@ -1,6 +1,7 @@
-import React, { useState } from 'react';
+import React, { useMemo, useState } from 'react';
 import { BrandDeal, RateCheckInput, RateCheckResult } from '../types';
 import { checkRateWithGemini } from '../services/geminiService';
+import { estimateRate } from '../supabase/functions/_shared/rateEngine.ts';
 import { Loader2, TrendingUp, CheckCircle2, Target, Zap, Sparkles, MessageSquare } from 'lucide-react';
 import { BarChart, Bar, XAxis, YAxis, Tooltip, ResponsiveContainer, Cell } from 'recharts';
 
@@ -12,6 +13,7 @@ interface RateCheckerProps {
 
 export const RateChecker: React.FC<RateCheckerProps> = ({ deal, updateDeal, onResult }) => {
   const [loading, setLoading] = useState(false);
+  const [partial, setPartial] = useState<Partial<RateCheckResult>>({});
   const [showForm, setShowForm] = useState(!deal.rateCheck);
 
   const [inputs, setInputs] = useState<RateCheckInput>({
@@ -24,11 +26,16 @@ export const RateChecker: React.FC<RateCheckerProps> = ({ deal, updateDeal, onRe
     exclusivity: 'None',
   });
 
+  // Recomputed on every edit; the model call on submit only adds the narrative
+  const estimate = useMemo(() => estimateRate(inputs), [inputs]);
+  const hasMetrics = inputs.followers > 0 || inputs.avgViews > 0;
+
   const handleSubmit = async (e: React.FormEvent) => {
     e.preventDefault();
     setLoading(true);
+    setPartial({});
     try {
-      const result = await checkRateWithGemini(inputs);
+      const result = await checkRateWithGemini(inputs, setPartial);
       updateDeal({ rateCheck: result });
       setShowForm(false);
       if (onResult) onResult();
@@ -91,6 +98,22 @@ export const RateChecker: React.FC<RateCheckerProps> = ({ deal, updateDeal, onRe
           <button type="submit" disabled={loading} className="w-full bg-blue-600 text-white py-3.5 md:py-4 rounded-xl md:rounded-2xl text-[9px] md:text-[10px] font-black uppercase tracking-widest shadow-xl shadow-blue-500/20 hover:bg-blue-700 active:scale-95 transition-all flex justify-center items-center gap-3">
             {loading ? <Loader2 className="animate-spin" size={14} /> : <><Zap size={14} /> Calculate Rate</>}
           </button>
+
+          {hasMetrics && (
+            <div className="p-4 bg-slate-50/50 border border-slate-100 rounded-xl md:rounded-2xl space-y-2 animate-in fade-in">
+              <div className="flex justify-between items-center">
+                <p className="text-sm font-black text-slate-900 tracking-tight">${estimate.suggestedLow.toLocaleString()} - ${estimate.suggestedHigh.toLocaleString()}</p>
+                <span className="text-[8px] md:text-[9px] font-black text-slate-400 uppercase tracking-widest">{estimate.confidenceScore}% confidence</span>
+              </div>
+              {loading && partial.explanation && <p className="text-xs text-slate-500 leading-relaxed">{partial.explanation}</p>}
+              {loading && partial.suggestedReply && (
+                <div className="flex gap-2 text-xs font-bold text-blue-700 leading-relaxed">
+                  <MessageSquare size={12} className="shrink-0 mt-0.5" />
+                  <span>"{partial.suggestedReply}"</span>
+                </div>
+              )}
+            </div>
+          )}
         </form>
       </div>
     );
@@ -106,7 +129,12 @@ export const RateChecker: React.FC<RateCheckerProps> = ({ deal, updateDeal, onRe
       <div className="flex justify-between items-start mb-6 md:mb-8">
         <div>
           <h3 className="font-black text-slate-900 text-base md:text-lg tracking-tight leading-none">${deal.rateCheck!.suggestedLow.toLocaleString()} — ${deal.rateCheck!.suggestedHigh.toLocaleString()}</h3>
-          <p className="text-[9px] md:text-[10px] font-bold text-slate-400 uppercase tracking-widest mt-2">Recommended fee range</p>
+          <p className="text-[9px] md:text-[10px] font-bold text-slate-400 uppercase tracking-widest mt-2 flex items-center gap-2">
+            Recommended fee range
+            {deal.rateCheck!.cached && (
+              <span className="px-1.5 py-0.5 rounded bg-slate-100 text-slate-500 text-[8px] font-black">Cached</span>
+            )}
+          </p>
         </div>
         <div className="flex flex-col items-end">
           <span className="text-[8px] md:text-[9px] font-black text-slate-300 uppercase tracking-widest mb-1">Confidence</span>
@@ -1,93 +1,209 @@
 import { supabase } from './supabase';
 import type { BrandDeal, TimelineEvent } from '../types';
+import type { Database } from './database.types';
+
+type DealRow = Database['public']['Tables']['deals']['Row'];
+type TimelineEventRow = Database['public']['Tables']['timeline_events']['Row'];
+
+// ==================== MAPPERS ====================
+
+export function toTimelineEvent(row: TimelineEventRow): TimelineEvent {
+    return {
+        id: row.id,
+        type: row.type as any,
+        date: row.created_at,
+        description: row.description,
+        metadata: row.metadata as any
+    };
+}
+
+export function toDealInsert(userId: string, deal: Omit<BrandDeal, 'id'>): Database['public']['Tables']['deals']['Insert'] {
+    return {
+        user_id: userId,
+        brand_name: deal.brandName,
+        platform: deal.platform,
+        contact: deal.contact || null,
+        status: deal.status,
+        deal_value: deal.dealValue || null,
+        last_contacted_at: deal.lastContactedAt,
+        next_follow_up_at: deal.nextFollowUpAt,
+        follow_up_interval_days: deal.followUpIntervalDays,
+        follow_up_count: deal.followUpCount,
+        notes: deal.notes || null,
+        rate_check: deal.rateCheck as any || null,
+        brief_analysis: deal.briefAnalysis as any || null
+    };
+}
+
+export function toBrandDeal(row: DealRow): BrandDeal {
+    return {
+        id: row.id,
+        brandName: row.brand_name,
+        platform: row.platform as any,
+        contact: row.contact || '',
+        status: row.status as any,
+        dealValue: row.deal_value || undefined,
+        lastContactedAt: row.last_contacted_at,
+        nextFollowUpAt: row.next_follow_up_at,
+        followUpIntervalDays: row.follow_up_interval_days,
+        followUpCount: row.follow_up_count,
+        notes: row.notes || '',
+        rateCheck: row.rate_check as any,
+        briefAnalysis: row.brief_analysis as any
+    };
+}
 
 // ==================== DEALS ====================
 
-export async function getDeals(userId: string): Promise<BrandDeal[]> {
-    const { data: dealsData, error: dealsError } = await supabase
+export const DEALS_PAGE_SIZE = 50;
+
+// Keyset position: the (created_at, id) of the last deal already loaded.
+export interface DealCursor {
+    createdAt: string;
+    id: string;
+}
+
+export interface DealPage {
+    deals: BrandDeal[];
+    nextCursor: DealCursor | null;
+    // Newest updated_at on the page: the realtime sync's starting high-water mark
+    syncedAt: string | null;
+}
+
+function latestUpdate(rows: DealRow[]): string | null {
+    let latest: string | null = null;
+    for (const row of rows) {
+        if (!latest || Date.parse(row.updated_at) > Date.parse(latest)) latest = row.updated_at;
+    }
+    return latest;
+}
+
+export async function getDealsPage(
+    userId: string,
+    { cursor = null, limit = DEALS_PAGE_SIZE }: { cursor?: DealCursor | null; limit?: number } = {}
+): Promise<DealPage> {
+    // Newest first on (created_at, id) off deals_user_id_created_at_id_idx.
+    // The lte bound is what lets Postgres start the index scan at the cursor;
+    // the or() only breaks ties within that timestamp. Without it every deep
+    // page would read and discard all newer rows.
+    // Timelines are not part of the board payload; see lib/timelines.ts.
+    let query = supabase
         .from('deals')
         .select('*')
-        .eq('user_id', userId)
-        .order('created_at', { ascending: false });
+        .eq('user_id', userId);
 
-    if (dealsError) throw dealsError;
-    if (!dealsData) return [];
+    if (cursor) {
+        query = query.lte('created_at', cursor.createdAt).or(
+            `created_at.lt."${cursor.createdAt}",and(created_at.eq."${cursor.createdAt}",id.lt.${cursor.id})`
+        );
+    }
 
-    // Fetch timeline events for all deals
-    const dealIds = dealsData.map(d => d.id);
-    const { data: eventsData, error: eventsError } = await supabase
-        .from('timeline_events')
+    // One extra row tells us whether another page exists.
+    const { data, error } = await query
+        .order('created_at', { ascending: false })
+        .order('id', { ascending: false })
+        .limit(limit + 1);
+
+    if (error) throw error;
+
+    const rows = (data || []).slice(0, limit);
+    const last = rows[rows.length - 1];
+
+    return {
+        deals: rows.map(toBrandDeal),
+        nextCursor: data && data.length > limit && last ? { createdAt: last.created_at, id: last.id } : null,
+        syncedAt: latestUpdate(rows)
+    };
+}
+
+// A single deal, for a deep link to one that is not in the loaded pages
+export async function getDealById(id: string): Promise<BrandDeal | null> {
+    const { data, error } = await supabase
+        .from('deals')
         .select('*')
-        .in('deal_id', dealIds)
-        .order('created_at', { ascending: true });
+        .eq('id', id)
+        .maybeSingle();
 
-    if (eventsError) throw eventsError;
-
-    // Map database records to BrandDeal type
-    return dealsData.map(deal => ({
-        id: deal.id,
-        brandName: deal.brand_name,
-        platform: deal.platform as any,
-        contact: deal.contact || '',
-        status: deal.status as any,
-        dealValue: deal.deal_value || undefined,
-        lastContactedAt: deal.last_contacted_at,
-        nextFollowUpAt: deal.next_follow_up_at,
-        followUpIntervalDays: deal.follow_up_interval_days,
-        followUpCount: deal.follow_up_count,
-        notes: deal.notes || '',
-        rateCheck: deal.rate_check as any,
-        briefAnalysis: deal.brief_analysis as any,
-        timeline: (eventsData || [])
-            .filter(e => e.deal_id === deal.id)
-            .map(e => ({
-                id: e.id,
-                type: e.type as any,
-                date: e.created_at,
-                description: e.description,
-                metadata: e.metadata as any
-            }))
-    }));
+    if (error) throw error;
+    return data ? toBrandDeal(data) : null;
 }
 
-export async function createDeal(userId: string, deal: Omit<BrandDeal, 'id' | 'timeline'>): Promise<BrandDeal> {
+export async function getDealsUpdatedSince(
+    userId: string,
+    since: string | null
+): Promise<{ deals: BrandDeal[]; syncedAt: string | null }> {
+    let query = supabase
+        .from('deals')
+        .select('*')
+        .eq('user_id', userId);
+
+    if (since) query = query.gt('updated_at', since);
+
+    const { data, error } = await query.order('updated_at', { ascending: true });
+
+    if (error) throw error;
+
+    return { deals: (data || []).map(toBrandDeal), syncedAt: latestUpdate(data || []) };
+}
+
+export async function createDeal(userId: string, deal: Omit<BrandDeal, 'id'>): Promise<BrandDeal> {
     const { data, error } = await supabase
         .from('deals')
-        .insert({
-            user_id: userId,
-            brand_name: deal.brandName,
-            platform: deal.platform,
-            contact: deal.contact || null,
-            status: deal.status,
-            deal_value: deal.dealValue || null,
-            last_contacted_at: deal.lastContactedAt,
-            next_follow_up_at: deal.nextFollowUpAt,
-            follow_up_interval_days: deal.followUpIntervalDays,
-            follow_up_count: deal.followUpCount,
-            notes: deal.notes || null,
-            rate_check: deal.rateCheck as any || null,
-            brief_analysis: deal.briefAnalysis as any || null
-        })
+        .insert(toDealInsert(userId, deal))
         .select()
         .single();
 
     if (error) throw error;
 
+    return toBrandDeal(data);
+}
+
+// A batch of imported deals with their timelines, inserted in one transaction
+// by the import_deals function: a failed batch leaves nothing behind for a
+// retry to duplicate. Deals come back in input order.
+export async function importDealBatch(
+    userId: string,
+    rows: { deal: Omit<BrandDeal, 'id'>; timeline: TimelineEvent[] }[],
+    description = 'Deal Imported'
+): Promise<BrandDeal[]> {
+    if (rows.length === 0) return [];
+
+    const { data, error } = await supabase.rpc('import_deals', {
+        batch: rows.map(({ deal, timeline }) => ({
+            ...toDealInsert(userId, deal),
+            timeline: timeline.map(event => ({
+                id: event.id,
+                type: event.type,
+                description: event.description,
+                metadata: event.metadata ?? null,
+                created_at: event.date
+            }))
+        })),
+        event_description: description
+    });
+
+    if (error) throw error;
+
+    return (data || []).map(toBrandDeal);
+}
+
+// Deal plus its opening timeline event, inserted atomically by the
+// create_deal_with_event function in one round trip.
+export async function createDealWithEvent(
+    userId: string,
+    deal: Omit<BrandDeal, 'id'>,
+    description = 'Deal Created'
+): Promise<{ deal: BrandDeal; event: TimelineEvent }> {
+    const { data, error } = await supabase.rpc('create_deal_with_event', {
+        deal: toDealInsert(userId, deal),
+        event_description: description
+    });
+
+    if (error) throw error;
+
     return {
-        id: data.id,
-        brandName: data.brand_name,
-        platform: data.platform as any,
-        contact: data.contact || '',
-        status: data.status as any,
-        dealValue: data.deal_value || undefined,
-        lastContactedAt: data.last_contacted_at,
-        nextFollowUpAt: data.next_follow_up_at,
-        followUpIntervalDays: data.follow_up_interval_days,
-        followUpCount: data.follow_up_count,
-        notes: data.notes || '',
-        rateCheck: data.rate_check as any,
-        briefAnalysis: data.brief_analysis as any,
-        timeline: []
+        deal: toBrandDeal(data.deal),
+        event: toTimelineEvent(data.event)
     };
 }
 
@@ -128,6 +244,57 @@ export async function deleteDeal(dealId: string): Promise<void> {
 
 // ==================== TIMELINE EVENTS ====================
 
+export async function getTimelineEvents(dealId: string): Promise<TimelineEvent[]> {
+    const { data, error } = await supabase
+        .from('timeline_events')
+        .select('*')
+        .eq('deal_id', dealId)
+        .order('created_at', { ascending: true });
+
+    if (error) throw error;
+
+    return (data || []).map(toTimelineEvent);
+}
+
+// Timelines for a bounded set of deals (one page), grouped by deal id
+export async function getTimelineEventsForDeals(dealIds: string[]): Promise<Map<string, TimelineEvent[]>> {
+    const grouped = new Map<string, TimelineEvent[]>();
+    if (dealIds.length === 0) return grouped;
+
+    const { data, error } = await supabase
+        .from('timeline_events')
+        .select('*')
+        .in('deal_id', dealIds)
+        .order('created_at', { ascending: true });
+
+    if (error) throw error;
+
+    for (const row of data || []) {
+        const events = grouped.get(row.deal_id);
+        if (events) events.push(toTimelineEvent(row));
+        else grouped.set(row.deal_id, [toTimelineEvent(row)]);
+    }
+    return grouped;
+}
+
+export async function getTimelineEventsSince(
+    userId: string,
+    since: string | null
+): Promise<{ dealId: string; event: TimelineEvent }[]> {
+    let query = supabase
+        .from('timeline_events')
+        .select('*')
+        .eq('user_id', userId);
+
+    if (since) query = query.gt('created_at', since);
+
+    const { data, error } = await query.order('created_at', { ascending: true });
+
+    if (error) throw error;
+
+    return (data || []).map(row => ({ dealId: row.deal_id, event: toTimelineEvent(row) }));
+}
+
 export async function addTimelineEvent(
     dealId: string,
     event: Omit<TimelineEvent, 'id' | 'date'>
@@ -145,15 +312,73 @@ export async function addTimelineEvent(
 
     if (error) throw error;
 
+    return toTimelineEvent(data);
+}
+
+// Batched insert for events created offline-first with client-generated ids.
+// Replaying a batch after a lost response is harmless: rows already stored
+// are skipped. `date` is only sent for historical events (imports); live
+// events take the server's clock.
+export async function addTimelineEvents(
+    events: (Omit<TimelineEvent, 'date'> & { dealId: string; date?: string })[]
+): Promise<void> {
+    if (events.length === 0) return;
+
+    const { error } = await supabase
+        .from('timeline_events')
+        .upsert(events.map(event => ({
+            id: event.id,
+            deal_id: event.dealId,
+            type: event.type,
+            description: event.description,
+            metadata: event.metadata as any || null,
+            ...(event.date ? { created_at: event.date } : {})
+        })), { onConflict: 'id', ignoreDuplicates: true });
+
+    if (error) throw error;
+}
+
+// ==================== NOTIFICATIONS ====================
+
+export interface FollowUpDigest {
+    id: string;
+    count: number;
+    deals: { id: string; brandName: string; status: string; nextFollowUpAt: string }[];
+    builtAt: string;
+    read: boolean;
+}
+
+// Written server-side by the follow-up-digest function; null when nothing is due
+export async function getFollowUpDigest(userId: string): Promise<FollowUpDigest | null> {
+    const { data, error } = await supabase
+        .from('notifications')
+        .select('id, payload, created_at, read_at')
+        .eq('user_id', userId)
+        .eq('kind', 'follow_up_digest')
+        .maybeSingle();
+
+    if (error) throw error;
+    if (!data) return null;
+
+    const payload = data.payload as any;
     return {
         id: data.id,
-        type: data.type as any,
-        date: data.created_at,
-        description: data.description,
-        metadata: data.metadata as any
+        count: payload.count || 0,
+        deals: payload.deals || [],
+        builtAt: data.created_at,
+        read: !!data.read_at
     };
 }
 
+export async function markNotificationRead(id: string): Promise<void> {
+    const { error } = await supabase
+        .from('notifications')
+        .update({ read_at: new Date().toISOString() })
+        .eq('id', id);
+
+    if (error) throw error;
+}
+
 // ==================== FEEDBACK ====================
 
 export async function submitFeedback(userId: string, type: string, value: string, comment?: string): Promise<void> {
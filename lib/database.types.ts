@@ -69,6 +69,7 @@ export interface Database {
                 Row: {
                     id: string
                     deal_id: string
+                    user_id: string
                     type: string
                     description: string
                     metadata: Json | null
@@ -77,6 +78,7 @@ export interface Database {
                 Insert: {
                     id?: string
                     deal_id: string
+                    user_id?: string
                     type: string
                     description: string
                     metadata?: Json | null
@@ -85,12 +87,39 @@ export interface Database {
                 Update: {
                     id?: string
                     deal_id?: string
+                    user_id?: string
                     type?: string
                     description?: string
                     metadata?: Json | null
                     created_at?: string
                 }
             }
+            notifications: {
+                Row: {
+                    id: string
+                    user_id: string
+                    kind: string
+                    payload: Json
+                    created_at: string
+                    read_at: string | null
+                }
+                Insert: {
+                    id?: string
+                    user_id: string
+                    kind: string
+                    payload: Json
+                    created_at?: string
+                    read_at?: string | null
+                }
+                Update: {
+                    id?: string
+                    user_id?: string
+                    kind?: string
+                    payload?: Json
+                    created_at?: string
+                    read_at?: string | null
+                }
+            }
         }
     }
 }
@@ -0,0 +1,157 @@
+import type { BrandDeal } from '../types';
+
+// Incremental search index over brand name, contact and notes.
+//
+// Each deal's text is normalized once (lower case, accents stripped) and
+// posted under its trigrams; queries intersect the posting sets and then
+// confirm the substring on the few candidates left. Words shorter than three
+// characters match token prefixes instead. Because the deal store replaces a
+// deal object whenever it changes, sync() only re-indexes deals whose object
+// identity differs from the last call.
+
+interface IndexedDeal {
+    deal: BrandDeal;
+    text: string;
+    trigrams: string[];
+    tokens: string[];
+    lastContactedAt: number;
+    dealValue: number;
+}
+
+export interface DealSearchIndex {
+    sync(deals: BrandDeal[]): void;
+    // Ids of deals matching every word of the query, or null for an empty query
+    search(query: string): Set<string> | null;
+    sortKey(id: string, by: 'recent' | 'value'): number;
+}
+
+export function normalizeSearchText(text: string): string {
+    return text.normalize('NFKD').replace(/[\u0300-\u036f]/g, '').toLowerCase();
+}
+
+function trigramsOf(text: string): string[] {
+    const grams = new Set<string>();
+    for (let i = 0; i + 3 <= text.length; i++) grams.add(text.slice(i, i + 3));
+    return [...grams];
+}
+
+function tokensOf(text: string): string[] {
+    return [...new Set(text.split(/[^\p{L}\p{N}]+/u).filter(Boolean))];
+}
+
+export function createDealSearchIndex(): DealSearchIndex {
+    const docs = new Map<string, IndexedDeal>();
+    const postings = new Map<string, Set<string>>();
+    const tokenIds = new Map<string, Set<string>>();
+    // Distinct tokens in sorted order, rebuilt lazily for prefix lookups
+    let sortedTokens: string[] | null = null;
+
+    const post = (index: Map<string, Set<string>>, key: string, id: string) => {
+        let ids = index.get(key);
+        if (!ids) index.set(key, ids = new Set());
+        ids.add(id);
+    };
+
+    const unpost = (index: Map<string, Set<string>>, key: string, id: string) => {
+        const ids = index.get(key);
+        if (!ids) return;
+        ids.delete(id);
+        if (ids.size === 0) {
+            index.delete(key);
+            if (index === tokenIds) sortedTokens = null;
+        }
+    };
+
+    const remove = (doc: IndexedDeal) => {
+        doc.trigrams.forEach(gram => unpost(postings, gram, doc.deal.id));
+        doc.tokens.forEach(token => unpost(tokenIds, token, doc.deal.id));
+        docs.delete(doc.deal.id);
+    };
+
+    const add = (deal: BrandDeal) => {
+        const text = normalizeSearchText([deal.brandName, deal.contact, deal.notes].filter(Boolean).join('\n'));
+        const doc: IndexedDeal = {
+            deal,
+            text,
+            trigrams: trigramsOf(text),
+            tokens: tokensOf(text),
+            lastContactedAt: Date.parse(deal.lastContactedAt) || 0,
+            dealValue: deal.dealValue || 0
+        };
+        doc.trigrams.forEach(gram => post(postings, gram, deal.id));
+        doc.tokens.forEach(token => {
+            if (!tokenIds.has(token)) sortedTokens = null;
+            post(tokenIds, token, deal.id);
+        });
+        docs.set(deal.id, doc);
+    };
+
+    const prefixMatches = (prefix: string): Set<string> => {
+        if (!sortedTokens) sortedTokens = [...tokenIds.keys()].sort();
+        let lo = 0;
+        let hi = sortedTokens.length;
+        while (lo < hi) {
+            const mid = (lo + hi) >> 1;
+            if (sortedTokens[mid] < prefix) lo = mid + 1;
+            else hi = mid;
+        }
+        const ids = new Set<string>();
+        for (let i = lo; i < sortedTokens.length && sortedTokens[i].startsWith(prefix); i++) {
+            tokenIds.get(sortedTokens[i])!.forEach(id => ids.add(id));
+        }
+        return ids;
+    };
+
+    const substringMatches = (word: string, within: Set<string> | null): Set<string> => {
+        // Start from the rarest trigram and narrow down
+        const sets = trigramsOf(word).map(gram => postings.get(gram));
+        if (sets.some(set => !set)) return new Set();
+        sets.sort((a, b) => a!.size - b!.size);
+        const ids = new Set<string>();
+        for (const id of sets[0]!) {
+            if (within && !within.has(id)) continue;
+            if (sets.every(set => set!.has(id)) && docs.get(id)!.text.includes(word)) ids.add(id);
+        }
+        return ids;
+    };
+
+    return {
+        sync(deals) {
+            const seen = new Set<string>();
+            for (const deal of deals) {
+                seen.add(deal.id);
+                const doc = docs.get(deal.id);
+                if (doc?.deal === deal) continue;
+                if (doc) remove(doc);
+                add(deal);
+            }
+            for (const doc of [...docs.values()]) {
+                if (!seen.has(doc.deal.id)) remove(doc);
+            }
+        },
+
+        search(query) {
+            const words = tokensOf(normalizeSearchText(query.trim()));
+            if (words.length === 0) return null;
+            // Longest word first: it is usually the most selective
+            words.sort((a, b) => b.length - a.length);
+            let ids: Set<string> | null = null;
+            for (const word of words) {
+                if (word.length >= 3) {
+                    ids = substringMatches(word, ids);
+                } else {
+                    const prefixed = prefixMatches(word);
+                    ids = ids ? new Set([...ids].filter(id => prefixed.has(id))) : prefixed;
+                }
+                if (ids.size === 0) break;
+            }
+            return ids;
+        },
+
+        sortKey(id, by) {
+            const doc = docs.get(id);
+            if (!doc) return 0;
+            return by === 'value' ? doc.dealValue : doc.lastContactedAt;
+        }
+    };
+}
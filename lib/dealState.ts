@@ -0,0 +1,113 @@
+import { useCallback, useEffect, useRef, useSyncExternalStore } from 'react';
+import { BrandDeal, DealAction, DealStatus, getDealAction } from '../types';
+
+// Time-dependent values shown on cards and the detail page.
+//
+// The action, overdue flag and days of silence only change when the deal
+// changes or when the clock passes one of two instants: the next follow-up
+// time, or the next whole day since last contact. Each result is cached per
+// deal object together with the earliest such instant (validUntil), and one
+// shared timer wakes only the subscribers whose value has actually expired.
+
+const DAY_MS = 1000 * 60 * 60 * 24;
+// setTimeout stores its delay as a 32-bit int
+const MAX_TIMER_MS = 2 ** 31 - 1;
+
+export interface DealState {
+    action: DealAction;
+    isOverdue: boolean;
+    daysSinceLastContact: number;
+    validUntil: number;
+}
+
+const cache = new WeakMap<BrandDeal, DealState>();
+
+function compute(deal: BrandDeal, now: number): DealState {
+    const nextFollowUp = Date.parse(deal.nextFollowUpAt);
+    const lastContact = Date.parse(deal.lastContactedAt);
+    const isOpen = deal.status !== DealStatus.SECURED && deal.status !== DealStatus.GHOSTED;
+
+    const silence = Number.isNaN(lastContact) ? NaN : now - lastContact;
+    const daysSinceLastContact = Math.floor(silence / DAY_MS);
+
+    let validUntil = Infinity;
+    // The action flips at the follow-up time (<=), the overdue dot just after it (<)
+    if (isOpen && nextFollowUp >= now) validUntil = nextFollowUp + 1;
+    if (!Number.isNaN(silence)) validUntil = Math.min(validUntil, lastContact + (daysSinceLastContact + 1) * DAY_MS);
+
+    return {
+        action: getDealAction(deal, now),
+        isOverdue: isOpen && nextFollowUp < now,
+        daysSinceLastContact,
+        validUntil
+    };
+}
+
+export function getDealState(deal: BrandDeal, now = Date.now()): DealState {
+    const cached = cache.get(deal);
+    if (cached && now < cached.validUntil) return cached;
+    const state = compute(deal, now);
+    cache.set(deal, state);
+    return state;
+}
+
+// ==================== CLOCK ====================
+
+// Mounted subscribers and the deal each one currently shows. The hook keeps
+// the ref up to date, so a subscription outlives edits to its deal.
+const watchers = new Map<() => void, { current: BrandDeal | undefined }>();
+let timer: ReturnType<typeof setTimeout> | null = null;
+let timerAt = Infinity;
+
+function schedule() {
+    const now = Date.now();
+    let next = Infinity;
+    watchers.forEach(({ current: deal }) => {
+        if (deal) next = Math.min(next, getDealState(deal, now).validUntil);
+    });
+    if (next === timerAt) return;
+    if (timer) clearTimeout(timer);
+    timer = null;
+    timerAt = next;
+    if (next === Infinity) return;
+    timer = setTimeout(tick, Math.min(MAX_TIMER_MS, Math.max(0, next - now)));
+}
+
+function tick() {
+    timer = null;
+    timerAt = Infinity;
+    const now = Date.now();
+    watchers.forEach(({ current: deal }, listener) => {
+        if (!deal) return;
+        const cached = cache.get(deal);
+        if (cached && now < cached.validUntil) return;
+        getDealState(deal, now);
+        listener();
+    });
+    schedule();
+}
+
+export function useDealState(deal: BrandDeal | undefined): DealState | undefined {
+    const latest = useRef(deal);
+    const id = deal?.id;
+
+    // Stable per deal id, so re-renders don't resubscribe and reschedule
+    const subscribe = useCallback((listener: () => void) => {
+        if (!id) return () => { };
+        watchers.set(listener, latest);
+        schedule();
+        return () => {
+            watchers.delete(listener);
+            schedule();
+        };
+    }, [id]);
+
+    // An edited deal can move its follow-up time; re-arm the timer for it
+    useEffect(() => {
+        if (latest.current === deal) return;
+        latest.current = deal;
+        schedule();
+    }, [deal]);
+
+    return useSyncExternalStore(subscribe, () => deal && getDealState(deal));
+}
@@ -0,0 +1,200 @@
+import { useSyncExternalStore } from 'react';
+import { BrandDeal, DealStatus, Platform } from '../types';
+import { createFollowUpScheduler } from './followUpScheduler';
+
+// Normalized client-side store for the loaded deals.
+//
+// Deals are kept by id with secondary indexes by status and platform; open
+// deals are also tracked by lib/followUpScheduler, which moves each one to a
+// due set the moment its follow-up time passes. Writes replace only the
+// touched deal objects; every other deal keeps its identity, which lets
+// memoized cards skip re-rendering. Components read through the hooks below:
+// useDeal re-renders for one deal only, useDealsVersion for any change.
+
+const byId = new Map<string, BrandDeal>();
+const byStatus = new Map<DealStatus, Set<string>>();
+const byPlatform = new Map<Platform, Set<string>>();
+
+let version = 0;
+const dealListeners = new Map<string, Set<() => void>>();
+const storeListeners = new Set<() => void>();
+const dueListeners = new Set<(deals: BrandDeal[]) => void>();
+const arrayCache = new Map<string, { version: number; deals: BrandDeal[] }>();
+
+const followUps = createFollowUpScheduler(ids => {
+    commit([]);
+    const deals = resolve(ids);
+    dueListeners.forEach(listener => listener(deals));
+});
+
+function isOpen(deal: BrandDeal): boolean {
+    return deal.status !== DealStatus.SECURED && deal.status !== DealStatus.GHOSTED;
+}
+
+// An unparseable date counts as due
+function followUpTime(deal: BrandDeal): number {
+    return Date.parse(deal.nextFollowUpAt) || 0;
+}
+
+// ==================== INDEXES ====================
+
+function addTo<K>(index: Map<K, Set<string>>, key: K, id: string) {
+    let ids = index.get(key);
+    if (!ids) index.set(key, ids = new Set());
+    ids.add(id);
+}
+
+function index(deal: BrandDeal) {
+    addTo(byStatus, deal.status, deal.id);
+    addTo(byPlatform, deal.platform, deal.id);
+    if (isOpen(deal)) followUps.schedule(deal.id, followUpTime(deal));
+    else followUps.cancel(deal.id);
+}
+
+function unindex(deal: BrandDeal) {
+    byStatus.get(deal.status)?.delete(deal.id);
+    byPlatform.get(deal.platform)?.delete(deal.id);
+}
+
+function put(deal: BrandDeal) {
+    const previous = byId.get(deal.id);
+    if (previous) unindex(previous);
+    byId.set(deal.id, deal);
+    index(deal);
+}
+
+function commit(changed: Iterable<string>) {
+    version++;
+    for (const id of changed) dealListeners.get(id)?.forEach(listener => listener());
+    storeListeners.forEach(listener => listener());
+}
+
+// ==================== WRITES ====================
+
+// Replace everything, e.g. after loading the first page
+export function replaceDeals(deals: BrandDeal[]) {
+    const changed = new Set(byId.keys());
+    byId.clear();
+    byStatus.clear();
+    byPlatform.clear();
+    followUps.clear();
+    for (const deal of deals) {
+        put(deal);
+        changed.add(deal.id);
+    }
+    commit(changed);
+}
+
+// Insert or replace whole deals (later pages, realtime changes, new deals)
+export function upsertDeals(deals: BrandDeal[]) {
+    if (deals.length === 0) return;
+    deals.forEach(put);
+    commit(deals.map(d => d.id));
+}
+
+export function patchDeal(id: string, updates: Partial<BrandDeal>): BrandDeal | undefined {
+    const current = byId.get(id);
+    if (!current) return undefined;
+    const next = { ...current, ...updates };
+    put(next);
+    commit([id]);
+    return next;
+}
+
+export function removeDeal(id: string) {
+    const current = byId.get(id);
+    if (!current) return;
+    unindex(current);
+    followUps.cancel(id);
+    byId.delete(id);
+    commit([id]);
+}
+
+export function clearDeals() {
+    replaceDeals([]);
+}
+
+// ==================== READS ====================
+
+export function getDeal(id: string): BrandDeal | undefined {
+    return byId.get(id);
+}
+
+function cachedArray(key: string, build: () => BrandDeal[]): BrandDeal[] {
+    const cached = arrayCache.get(key);
+    if (cached && cached.version === version) return cached.deals;
+    const deals = build();
+    arrayCache.set(key, { version, deals });
+    return deals;
+}
+
+function resolve(ids: Iterable<string> | undefined): BrandDeal[] {
+    const deals: BrandDeal[] = [];
+    if (ids) for (const id of ids) deals.push(byId.get(id)!);
+    return deals;
+}
+
+// The arrays below are rebuilt at most once per store version
+export function getAllDeals(): BrandDeal[] {
+    return cachedArray('all', () => [...byId.values()]);
+}
+
+export function getDealsByStatus(status: DealStatus): BrandDeal[] {
+    return cachedArray(`status:${status}`, () => resolve(byStatus.get(status)));
+}
+
+export function getDealIdsByPlatform(platform: Platform): ReadonlySet<string> {
+    return byPlatform.get(platform) || new Set();
+}
+
+// Open deals whose follow-up time has passed
+export function getOverdueDeals(): BrandDeal[] {
+    return cachedArray('overdue', () => resolve(followUps.due));
+}
+
+export function countOverdueDeals(): number {
+    return followUps.due.size;
+}
+
+// Called with the deals that just became due while the app is open
+export function onFollowUpsDue(listener: (deals: BrandDeal[]) => void): () => void {
+    dueListeners.add(listener);
+    return () => {
+        dueListeners.delete(listener);
+    };
+}
+
+// ==================== HOOKS ====================
+
+function subscribeDeal(id: string, listener: () => void) {
+    let set = dealListeners.get(id);
+    if (!set) dealListeners.set(id, set = new Set());
+    set.add(listener);
+    return () => {
+        set!.delete(listener);
+        if (set!.size === 0) dealListeners.delete(id);
+    };
+}
+
+function subscribeStore(listener: () => void) {
+    storeListeners.add(listener);
+    return () => {
+        storeListeners.delete(listener);
+    };
+}
+
+export function useDeal(id: string | undefined): BrandDeal | undefined {
+    return useSyncExternalStore(
+        listener => id ? subscribeDeal(id, listener) : () => { },
+        () => id ? byId.get(id) : undefined
+    );
+}
+
+// Bumps on every change; use it to key memos over the getters above
+export function useDealsVersion(): number {
+    return useSyncExternalStore(subscribeStore, () => version);
+}
+
+export function useDealCount(): number {
+    return useSyncExternalStore(subscribeStore, () => byId.size);
+}
@@ -0,0 +1,366 @@
+import { getDealsPage, getTimelineEventsForDeals, importDealBatch, DealCursor } from './api';
+import { BrandDeal, DealStatus, Platform, TimelineEvent } from '../types';
+
+// Bulk import/export of deals as CSV or JSON.
+//
+// Files are read as a stream and parsed incrementally, so a large spreadsheet
+// export never has to be held as one string. Valid rows are inserted in
+// batches, each deals-plus-timelines batch in one transaction (import_deals);
+// invalid rows are skipped and reported with their line or index.
+// Export walks the deal pages and writes deals with their timelines as it
+// goes.
+
+export type TransferFormat = 'csv' | 'json';
+
+export const IMPORT_BATCH_SIZE = 250;
+
+export interface ImportRowError {
+    row: number;
+    message: string;
+}
+
+export interface ImportProgress {
+    bytesRead: number;
+    totalBytes: number;
+    processed: number;
+    imported: number;
+    errors: ImportRowError[];
+}
+
+type RawRecord = Record<string, unknown>;
+
+// ==================== PARSING ====================
+
+async function* readText(file: Blob, onBytes: (n: number) => void): AsyncGenerator<string> {
+    const reader = file.stream().getReader();
+    const decoder = new TextDecoder();
+    for (; ;) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        onBytes(value.byteLength);
+        yield decoder.decode(value, { stream: true });
+    }
+    const tail = decoder.decode();
+    if (tail) yield tail;
+}
+
+// RFC 4180 CSV: quoted fields may contain commas, quotes ("") and newlines,
+// and may be split across chunks.
+async function* parseCsv(chunks: AsyncIterable<string>): AsyncGenerator<RawRecord> {
+    let header: string[] | null = null;
+    let row: string[] = [];
+    let field = '';
+    let quoted = false;
+    let pendingQuote = false;
+
+    const endRow = (): RawRecord | null => {
+        row.push(field);
+        field = '';
+        const cells = row;
+        row = [];
+        if (cells.length === 1 && cells[0].trim() === '') return null;
+        if (!header) {
+            header = cells.map(h => h.trim().replace(/^﻿/, ''));
+            return null;
+        }
+        const record: RawRecord = {};
+        header.forEach((key, i) => { record[key] = cells[i] ?? ''; });
+        return record;
+    };
+
+    for await (const chunk of chunks) {
+        for (let i = 0; i < chunk.length; i++) {
+            const char = chunk[i];
+            if (pendingQuote) {
+                pendingQuote = false;
+                if (char === '"') { field += '"'; continue; }
+                quoted = false;
+            }
+            if (quoted) {
+                if (char === '"') pendingQuote = true;
+                else field += char;
+            } else if (char === '"' && field === '') {
+                quoted = true;
+            } else if (char === ',') {
+                row.push(field);
+                field = '';
+            } else if (char === '\n') {
+                const record = endRow();
+                if (record) yield record;
+            } else if (char !== '\r') {
+                field += char;
+            }
+        }
+    }
+    if (field !== '' || row.length > 0) {
+        const record = endRow();
+        if (record) yield record;
+    }
+}
+
+// A JSON array of objects (or newline-delimited objects). Top-level objects
+// are cut out by tracking brace depth, then parsed one at a time. An object
+// that does not parse comes through as an Error, reported against its row.
+async function* parseJson(chunks: AsyncIterable<string>): AsyncGenerator<RawRecord | Error> {
+    let buffer = '';
+    let depth = 0;
+    let inString = false;
+    let escaped = false;
+
+    for await (const chunk of chunks) {
+        for (const char of chunk) {
+            if (depth > 0) buffer += char;
+            if (inString) {
+                if (escaped) escaped = false;
+                else if (char === '\\') escaped = true;
+                else if (char === '"') inString = false;
+                continue;
+            }
+            if (char === '"') {
+                inString = depth > 0;
+            } else if (char === '{') {
+                if (depth === 0) buffer = '{';
+                depth++;
+            } else if (char === '}') {
+                depth--;
+                if (depth === 0) {
+                    try {
+                        yield JSON.parse(buffer);
+                    } catch (error: any) {
+                        yield new Error(`invalid JSON: ${error.message}`);
+                    }
+                }
+            }
+        }
+    }
+    if (depth !== 0) yield new Error('JSON ended in the middle of an object');
+}
+
+export function detectFormat(fileName: string): TransferFormat {
+    return /\.(json|ndjson|jsonl)$/i.test(fileName) ? 'json' : 'csv';
+}
+
+// ==================== VALIDATION ====================
+
+const FIELD_ALIASES: Record<string, string[]> = {
+    brandName: ['brandName', 'brand_name', 'brand', 'Brand'],
+    platform: ['platform', 'Platform'],
+    contact: ['contact', 'Contact', 'email'],
+    status: ['status', 'Status', 'stage'],
+    dealValue: ['dealValue', 'deal_value', 'value', 'Value'],
+    notes: ['notes', 'Notes'],
+    lastContactedAt: ['lastContactedAt', 'last_contacted_at'],
+    nextFollowUpAt: ['nextFollowUpAt', 'next_follow_up_at'],
+    followUpIntervalDays: ['followUpIntervalDays', 'follow_up_interval_days'],
+    followUpCount: ['followUpCount', 'follow_up_count'],
+    timeline: ['timeline']
+};
+
+function pick(record: RawRecord, field: string): unknown {
+    for (const key of FIELD_ALIASES[field]) {
+        const value = record[key];
+        if (value !== undefined && value !== null && value !== '') return value;
+    }
+    return undefined;
+}
+
+function matchEnum<T extends string>(values: T[], raw: unknown): T | undefined {
+    if (raw === undefined) return undefined;
+    const wanted = String(raw).trim().toLowerCase();
+    return values.find(v => v.toLowerCase() === wanted);
+}
+
+function parseDate(raw: unknown, label: string): string | undefined {
+    if (raw === undefined) return undefined;
+    const time = Date.parse(String(raw));
+    if (Number.isNaN(time)) throw new Error(`${label} is not a date: ${raw}`);
+    return new Date(time).toISOString();
+}
+
+const TIMELINE_EVENT_TYPES: TimelineEvent['type'][] = ['status_change', 'note', 'follow_up', 'rate_check', 'brief_analysis'];
+
+function parseTimeline(raw: unknown): TimelineEvent[] {
+    if (raw === undefined) return [];
+    const events = typeof raw === 'string' ? JSON.parse(raw) : raw;
+    if (!Array.isArray(events)) throw new Error('timeline must be a list of events');
+    return events
+        .filter(e => e && typeof e.description === 'string')
+        .map(e => {
+            const type = e.type ? matchEnum(TIMELINE_EVENT_TYPES, e.type) : 'note';
+            if (!type) throw new Error(`unknown timeline event type: ${e.type}`);
+            return {
+                id: crypto.randomUUID(),
+                type,
+                date: parseDate(e.date, 'timeline date') || new Date().toISOString(),
+                description: e.description,
+                metadata: e.metadata
+            };
+        });
+}
+
+export function validateDealRecord(record: RawRecord): { deal: Omit<BrandDeal, 'id'>; timeline: TimelineEvent[] } {
+    const brandName = pick(record, 'brandName');
+    if (typeof brandName !== 'string' || !brandName.trim()) throw new Error('brandName is required');
+
+    const rawPlatform = pick(record, 'platform');
+    const platform = matchEnum(Object.values(Platform), rawPlatform);
+    if (rawPlatform !== undefined && !platform) throw new Error(`unknown platform: ${rawPlatform}`);
+
+    const rawStatus = pick(record, 'status');
+    const status = matchEnum(Object.values(DealStatus), rawStatus);
+    if (rawStatus !== undefined && !status) throw new Error(`unknown status: ${rawStatus}`);
+
+    const rawValue = pick(record, 'dealValue');
+    const dealValue = rawValue === undefined ? undefined : Number(String(rawValue).replace(/[$,\s]/g, ''));
+    if (dealValue !== undefined && (!Number.isFinite(dealValue) || dealValue < 0)) throw new Error(`invalid dealValue: ${rawValue}`);
+
+    const interval = Number(pick(record, 'followUpIntervalDays') ?? 7);
+    if (!Number.isInteger(interval) || interval < 1 || interval > 365) throw new Error('followUpIntervalDays must be a whole number of days');
+
+    const followUpCount = Number(pick(record, 'followUpCount') ?? 0);
+    if (!Number.isInteger(followUpCount) || followUpCount < 0) throw new Error('followUpCount must be a whole number');
+
+    const lastContactedAt = parseDate(pick(record, 'lastContactedAt'), 'lastContactedAt') || new Date().toISOString();
+    const nextFollowUpAt = parseDate(pick(record, 'nextFollowUpAt'), 'nextFollowUpAt') ||
+        new Date(Date.parse(lastContactedAt) + 1000 * 60 * 60 * 24 * interval).toISOString();
+
+    const contact = pick(record, 'contact');
+    const notes = pick(record, 'notes');
+
+    return {
+        deal: {
+            brandName: brandName.trim(),
+            platform: platform || Platform.OTHER,
+            contact: contact === undefined ? '' : String(contact),
+            status: status || DealStatus.DRAFT,
+            dealValue,
+            lastContactedAt,
+            nextFollowUpAt,
+            followUpIntervalDays: interval,
+            followUpCount,
+            notes: notes === undefined ? '' : String(notes)
+        },
+        timeline: parseTimeline(pick(record, 'timeline'))
+    };
+}
+
+// ==================== IMPORT ====================
+
+export async function importDeals(
+    userId: string,
+    file: File,
+    onProgress: (progress: ImportProgress) => void,
+    { format = detectFormat(file.name), batchSize = IMPORT_BATCH_SIZE }: { format?: TransferFormat; batchSize?: number } = {}
+): Promise<ImportProgress> {
+    const progress: ImportProgress = { bytesRead: 0, totalBytes: file.size, processed: 0, imported: 0, errors: [] };
+    const chunks = readText(file, n => { progress.bytesRead += n; });
+    const records = format === 'json' ? parseJson(chunks) : parseCsv(chunks);
+
+    let batch: (ReturnType<typeof validateDealRecord> & { row: number })[] = [];
+
+    const flush = async () => {
+        if (batch.length === 0) return;
+        const rows = batch;
+        batch = [];
+        try {
+            // Rows without a timeline get a single "Deal Imported" event
+            const created = await importDealBatch(userId, rows);
+            progress.imported += created.length;
+        } catch (error: any) {
+            // The batch was rolled back as a whole; earlier batches stand
+            for (const { row } of rows) progress.errors.push({ row, message: `not saved: ${error.message}` });
+        }
+        onProgress({ ...progress });
+    };
+
+    for await (const record of records) {
+        progress.processed++;
+        // Header is line 1 in a CSV; JSON rows are counted from 1
+        const rowNumber = format === 'csv' ? progress.processed + 1 : progress.processed;
+        try {
+            if (record instanceof Error) throw record;
+            batch.push({ ...validateDealRecord(record), row: rowNumber });
+        } catch (error: any) {
+            progress.errors.push({ row: rowNumber, message: error.message });
+        }
+        if (batch.length >= batchSize) await flush();
+        else if (progress.processed % 50 === 0) onProgress({ ...progress });
+    }
+    await flush();
+
+    onProgress({ ...progress });
+    return progress;
+}
+
+// ==================== EXPORT ====================
+
+const CSV_COLUMNS: (keyof BrandDeal)[] = [
+    'brandName', 'platform', 'contact', 'status', 'dealValue', 'lastContactedAt',
+    'nextFollowUpAt', 'followUpIntervalDays', 'followUpCount', 'notes'
+];
+
+function csvCell(value: unknown): string {
+    if (value === undefined || value === null) return '';
+    const text = String(value);
+    return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+}
+
+// Yields the export a page of deals at a time
+export async function* exportDeals(userId: string, format: TransferFormat): AsyncGenerator<string> {
+    let cursor: DealCursor | null = null;
+    let first = true;
+
+    yield format === 'csv' ? [...CSV_COLUMNS, 'timeline'].join(',') + '\n' : '[\n';
+
+    do {
+        const page = await getDealsPage(userId, { cursor });
+        const timelines = await getTimelineEventsForDeals(page.deals.map(d => d.id));
+        const lines = page.deals.map(deal => {
+            const timeline = timelines.get(deal.id) || [];
+            if (format === 'csv') {
+                return [...CSV_COLUMNS.map(c => csvCell(deal[c])), csvCell(JSON.stringify(timeline))].join(',') + '\n';
+            }
+            const { id, ...rest } = deal;
+            const line = (first ? '  ' : ',\n  ') + JSON.stringify({ ...rest, timeline });
+            first = false;
+            return line;
+        });
+        if (lines.length > 0) yield lines.join('');
+        cursor = page.nextCursor;
+    } while (cursor);
+
+    if (format === 'json') yield '\n]\n';
+}
+
+// Streams straight to disk where the File System Access API exists,
+// otherwise collects the chunks into a Blob download.
+export async function downloadDeals(userId: string, format: TransferFormat) {
+    const fileName = `creator-os-deals-${new Date().toISOString().slice(0, 10)}.${format}`;
+    const picker = (window as any).showSaveFilePicker;
+
+    if (picker) {
+        let handle;
+        try {
+            handle = await picker({ suggestedName: fileName });
+        } catch {
+            return; // Picker dismissed
+        }
+        const writable = await handle.createWritable();
+        try {
+            for await (const chunk of exportDeals(userId, format)) await writable.write(chunk);
+        } finally {
+            await writable.close();
+        }
+        return;
+    }
+
+    const parts: string[] = [];
+    for await (const chunk of exportDeals(userId, format)) parts.push(chunk);
+    const url = URL.createObjectURL(new Blob(parts, { type: format === 'csv' ? 'text/csv' : 'application/json' }));
+    const link = document.createElement('a');
+    link.href = url;
+    link.download = fileName;
+    link.click();
+    // Revoking in the same task can cancel the download in Firefox and Safari
+    setTimeout(() => URL.revokeObjectURL(url), 0);
+}
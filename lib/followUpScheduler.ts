@@ -0,0 +1,133 @@
+// Fires when open deals reach their next follow-up time.
+//
+// Deals that are not yet due sit in a binary min-heap keyed on follow-up time,
+// with each deal's heap position tracked so a changed date is re-sifted in
+// O(log n) rather than found by a scan. Only the heap top matters for timing,
+// so there is one timer, always set for the soonest deal. When it fires, every
+// deal at or past its time moves to the due set and is reported in one call.
+
+// setTimeout stores its delay as a 32-bit int
+const MAX_TIMER_MS = 2 ** 31 - 1;
+
+interface HeapEntry {
+    id: string;
+    at: number;
+}
+
+export interface FollowUpScheduler {
+    // Track (or re-time) a deal; past times go straight to the due set
+    schedule(id: string, at: number): void;
+    cancel(id: string): void;
+    clear(): void;
+    readonly due: ReadonlySet<string>;
+}
+
+export function createFollowUpScheduler(onDue: (ids: string[]) => void): FollowUpScheduler {
+    const heap: HeapEntry[] = [];
+    const position = new Map<string, number>();
+    const due = new Set<string>();
+    let timer: ReturnType<typeof setTimeout> | null = null;
+    let timerAt = Infinity;
+
+    const place = (entry: HeapEntry, i: number) => {
+        heap[i] = entry;
+        position.set(entry.id, i);
+    };
+
+    const siftUp = (i: number) => {
+        const entry = heap[i];
+        while (i > 0) {
+            const parent = (i - 1) >> 1;
+            if (heap[parent].at <= entry.at) break;
+            place(heap[parent], i);
+            i = parent;
+        }
+        place(entry, i);
+    };
+
+    const siftDown = (i: number) => {
+        const entry = heap[i];
+        for (; ;) {
+            const left = 2 * i + 1;
+            if (left >= heap.length) break;
+            const child = left + 1 < heap.length && heap[left + 1].at < heap[left].at ? left + 1 : left;
+            if (heap[child].at >= entry.at) break;
+            place(heap[child], i);
+            i = child;
+        }
+        place(entry, i);
+    };
+
+    const removeAt = (i: number) => {
+        const removed = heap[i];
+        const last = heap.pop()!;
+        position.delete(removed.id);
+        if (last !== removed) {
+            place(last, i);
+            siftDown(i);
+            siftUp(position.get(last.id)!);
+        }
+    };
+
+    const arm = () => {
+        const next = heap.length > 0 ? heap[0].at : Infinity;
+        if (next === timerAt) return;
+        if (timer) clearTimeout(timer);
+        timer = null;
+        timerAt = next;
+        if (next !== Infinity) timer = setTimeout(fire, Math.min(MAX_TIMER_MS, Math.max(0, next - Date.now())));
+    };
+
+    const fire = () => {
+        timer = null;
+        timerAt = Infinity;
+        const now = Date.now();
+        const ids: string[] = [];
+        while (heap.length > 0 && heap[0].at <= now) {
+            const { id } = heap[0];
+            removeAt(0);
+            due.add(id);
+            ids.push(id);
+        }
+        arm();
+        if (ids.length > 0) onDue(ids);
+    };
+
+    return {
+        schedule(id, at) {
+            const i = position.get(id);
+            if (at <= Date.now()) {
+                if (i !== undefined) removeAt(i);
+                due.add(id);
+            } else {
+                due.delete(id);
+                if (i === undefined) {
+                    heap.push({ id, at });
+                    siftUp(heap.length - 1);
+                } else {
+                    const earlier = at < heap[i].at;
+                    heap[i] = { id, at };
+                    if (earlier) siftUp(i); else siftDown(i);
+                }
+            }
+            arm();
+        },
+
+        cancel(id) {
+            due.delete(id);
+            const i = position.get(id);
+            if (i === undefined) return;
+            removeAt(i);
+            arm();
+        },
+
+        clear() {
+            heap.length = 0;
+            position.clear();
+            due.clear();
+            arm();
+        },
+
+        due
+    };
+}
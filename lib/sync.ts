@@ -0,0 +1,84 @@
+import type { RealtimeChannel } from '@supabase/supabase-js';
+import { supabase } from './supabase';
+import { getDealsUpdatedSince, getTimelineEventsSince, toBrandDeal, toTimelineEvent } from './api';
+import type { BrandDeal, TimelineEvent } from '../types';
+
+// Realtime sync of the signed-in user's deals and timeline events.
+//
+// Changes made in another tab or device arrive as postgres_changes and are
+// handed to the caller as patches. Nothing arrives before the channel joins or
+// while the socket is down, so every (re)join fetches and replays the rows
+// changed since the newest updated_at (deals) or created_at (timeline events)
+// seen so far. Deletes made while disconnected are not replayed; they show up
+// on the next full load.
+
+export interface DealSyncHandlers {
+    onDealChange: (deal: BrandDeal) => void;
+    // Called for deletes of ANY user's deal (see the DELETE subscription):
+    // ids the caller does not hold must be ignored
+    onDealDelete: (dealId: string) => void;
+    onTimelineEvent: (dealId: string, event: TimelineEvent) => void;
+    onError?: (error: Error) => void;
+}
+
+function later(a: string | null, b: string | null | undefined): string | null {
+    if (!b) return a;
+    if (!a) return b;
+    return Date.parse(b) > Date.parse(a) ? b : a;
+}
+
+export function startDealSync(userId: string, since: string | null, handlers: DealSyncHandlers): () => void {
+    let dealsMark = since;
+    let eventsMark = since;
+    let stopped = false;
+
+    const reconcile = async () => {
+        try {
+            const [changed, events] = await Promise.all([
+                getDealsUpdatedSince(userId, dealsMark),
+                getTimelineEventsSince(userId, eventsMark)
+            ]);
+            if (stopped) return;
+            changed.deals.forEach(handlers.onDealChange);
+            dealsMark = later(dealsMark, changed.syncedAt);
+            for (const { dealId, event } of events) {
+                handlers.onTimelineEvent(dealId, event);
+                eventsMark = later(eventsMark, event.date);
+            }
+        } catch (error: any) {
+            // The marks did not move, so the next rejoin retries the same range
+            handlers.onError?.(error);
+        }
+    };
+
+    const channel: RealtimeChannel = supabase
+        .channel(`deal-sync:${userId}`)
+        .on('postgres_changes', { event: 'INSERT', schema: 'public', table: 'deals', filter: `user_id=eq.${userId}` }, payload => {
+            handlers.onDealChange(toBrandDeal(payload.new as any));
+            dealsMark = later(dealsMark, (payload.new as any).updated_at);
+        })
+        .on('postgres_changes', { event: 'UPDATE', schema: 'public', table: 'deals', filter: `user_id=eq.${userId}` }, payload => {
+            handlers.onDealChange(toBrandDeal(payload.new as any));
+            dealsMark = later(dealsMark, (payload.new as any).updated_at);
+        })
+        // Delete events cannot be filtered and only carry the primary key, and
+        // Realtime does not apply RLS to them: this fires for every deleted
+        // deal in the project. Only the id is passed on, and onDealDelete
+        // ignores ids that are not in this user's store.
+        .on('postgres_changes', { event: 'DELETE', schema: 'public', table: 'deals' }, payload => {
+            if ((payload.old as any)?.id) handlers.onDealDelete((payload.old as any).id);
+        })
+        .on('postgres_changes', { event: 'INSERT', schema: 'public', table: 'timeline_events', filter: `user_id=eq.${userId}` }, payload => {
+            const row = payload.new as any;
+            handlers.onTimelineEvent(row.deal_id, toTimelineEvent(row));
+            eventsMark = later(eventsMark, row.created_at);
+        })
+        .subscribe(status => {
+            if (status === 'SUBSCRIBED' && !stopped) reconcile();
+        });
+
+    return () => {
+        stopped = true;
+        supabase.removeChannel(channel);
+    };
+}
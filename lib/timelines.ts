@@ -0,0 +1,130 @@
+import { useEffect, useSyncExternalStore } from 'react';
+import { getTimelineEvents } from './api';
+import type { TimelineEvent } from '../types';
+
+// Per-deal timeline cache. The board only needs deal rows, so events are
+// fetched when a deal is opened (or its card hovered) and kept here.
+
+const MAX_CACHED_TIMELINES = 50;
+
+interface TimelineEntry {
+    events: TimelineEvent[];
+    loading: boolean;
+    error: Error | null;
+}
+
+const EMPTY_ENTRY: TimelineEntry = { events: [], loading: false, error: null };
+
+const entries = new Map<string, TimelineEntry>();
+const inflight = new Map<string, Promise<TimelineEvent[]>>();
+// Events added locally while the deal's fetch was still in flight
+const pending = new Map<string, TimelineEvent[]>();
+const listeners = new Map<string, Set<() => void>>();
+
+function setEntry(dealId: string, entry: TimelineEntry) {
+    // Re-insert so Map order doubles as least-recently-used order
+    entries.delete(dealId);
+    entries.set(dealId, entry);
+    evict();
+    listeners.get(dealId)?.forEach(listener => listener());
+}
+
+function evict() {
+    for (const dealId of entries.keys()) {
+        if (entries.size <= MAX_CACHED_TIMELINES) return;
+        if (listeners.get(dealId)?.size || inflight.has(dealId)) continue;
+        entries.delete(dealId);
+    }
+}
+
+function mergeEvents(events: TimelineEvent[], extra: TimelineEvent[]): TimelineEvent[] {
+    const seen = new Set(events.map(e => e.id));
+    const added = extra.filter(e => !seen.has(e.id));
+    if (added.length === 0) return events;
+    return [...events, ...added].sort((a, b) => Date.parse(a.date) - Date.parse(b.date));
+}
+
+export function loadTimeline(dealId: string): Promise<TimelineEvent[]> {
+    const cached = entries.get(dealId);
+    if (cached && !cached.loading && !cached.error) return Promise.resolve(cached.events);
+
+    const running = inflight.get(dealId);
+    if (running) return running;
+
+    setEntry(dealId, { events: cached?.events || [], loading: true, error: null });
+
+    const request = getTimelineEvents(dealId)
+        .then(events => {
+            const merged = mergeEvents(events, pending.get(dealId) || []);
+            pending.delete(dealId);
+            inflight.delete(dealId);
+            setEntry(dealId, { events: merged, loading: false, error: null });
+            return merged;
+        })
+        .catch(error => {
+            inflight.delete(dealId);
+            setEntry(dealId, { events: pending.get(dealId) || [], loading: false, error });
+            throw error;
+        });
+
+    inflight.set(dealId, request);
+    return request;
+}
+
+export function prefetchTimeline(dealId: string) {
+    loadTimeline(dealId).catch(() => {
+        // Surfaced by useTimeline when the deal is actually opened
+    });
+}
+
+// Seed the cache when the events are already known, e.g. a freshly created deal
+export function setTimeline(dealId: string, events: TimelineEvent[]) {
+    setEntry(dealId, { events, loading: false, error: null });
+}
+
+export function appendTimelineEvent(dealId: string, event: TimelineEvent) {
+    const entry = entries.get(dealId);
+    // Until a fetch has landed, keep the event so the fetched list includes it
+    if (!entry || entry.loading || entry.error) {
+        pending.set(dealId, [...(pending.get(dealId) || []), event]);
+    }
+    if (entry) setEntry(dealId, { ...entry, events: mergeEvents(entry.events, [event]) });
+}
+
+// Server-side event from the realtime feed. Only timelines already cached (or
+// being fetched) need it; any other deal gets it with its first fetch.
+export function mergeRemoteTimelineEvent(dealId: string, event: TimelineEvent) {
+    const entry = entries.get(dealId);
+    if (!entry) return;
+    if (entry.loading) pending.set(dealId, [...(pending.get(dealId) || []), event]);
+    setEntry(dealId, { ...entry, events: mergeEvents(entry.events, [event]) });
+}
+
+export function clearTimelines() {
+    entries.clear();
+    inflight.clear();
+    pending.clear();
+}
+
+function subscribe(dealId: string, listener: () => void) {
+    let set = listeners.get(dealId);
+    if (!set) listeners.set(dealId, set = new Set());
+    set.add(listener);
+    return () => {
+        set!.delete(listener);
+        if (set!.size === 0) listeners.delete(dealId);
+    };
+}
+
+export function useTimeline(dealId: string | undefined): TimelineEntry {
+    const entry = useSyncExternalStore(
+        listener => dealId ? subscribe(dealId, listener) : () => { },
+        () => (dealId && entries.get(dealId)) || EMPTY_ENTRY
+    );
+
+    useEffect(() => {
+        if (dealId) prefetchTimeline(dealId);
+    }, [dealId]);
+
+    return entry;
+}
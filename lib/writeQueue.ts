@@ -0,0 +1,316 @@
+import { addTimelineEvents, updateDeal } from './api';
+import type { BrandDeal, TimelineEvent } from '../types';
+
+// Write-behind queue for changes the UI has already applied optimistically.
+//
+// Pending writes live in IndexedDB so they survive a reload or a closed tab,
+// and are flushed in the background shortly after the last enqueue. Bursts
+// coalesce: every deal has at most one pending update (later fields win) and
+// all pending timeline events go out as one multi-row insert. A failed flush
+// is retried with exponential backoff; ops that keep failing are dropped
+// after MAX_ATTEMPTS and reported through onError.
+//
+// Every op records the user who made it. Only the signed-in user's ops are
+// flushed; anything another account left behind is discarded rather than
+// replayed under the wrong session. Sign-out drains the queue: new enqueues
+// are refused, the last ones are flushed, and anything still failing is
+// cleared.
+
+const DB_NAME = 'creator-os';
+const STORE = 'write-queue';
+const FLUSH_DELAY_MS = 1000;
+const RETRY_BASE_MS = 2000;
+const RETRY_MAX_MS = 60000;
+const MAX_ATTEMPTS = 8;
+
+// userId is absent on ops queued before it was recorded
+type QueuedOp =
+    | { key: string; kind: 'deal_update'; userId?: string | null; dealId: string; updates: Partial<BrandDeal>; version: number; attempts: number }
+    | { key: string; kind: 'timeline_event'; userId?: string | null; dealId: string; event: Omit<TimelineEvent, 'date'>; version: number; attempts: number };
+
+// ==================== STORAGE ====================
+
+let dbPromise: Promise<IDBDatabase | null> | null = null;
+// Used when IndexedDB is unavailable (private mode, old browsers)
+const memoryStore = new Map<string, QueuedOp>();
+
+function openDb(): Promise<IDBDatabase | null> {
+    if (!dbPromise) {
+        dbPromise = new Promise(resolve => {
+            if (typeof indexedDB === 'undefined') return resolve(null);
+            const request = indexedDB.open(DB_NAME, 1);
+            request.onupgradeneeded = () => request.result.createObjectStore(STORE, { keyPath: 'key' });
+            request.onsuccess = () => {
+                const db = request.result;
+                // Let another tab upgrade the database; the next call reopens it
+                db.onversionchange = () => {
+                    db.close();
+                    dbPromise = null;
+                };
+                resolve(db);
+            };
+            request.onerror = () => resolve(null);
+        });
+    }
+    return dbPromise;
+}
+
+function run<T>(mode: IDBTransactionMode, body: (store: IDBObjectStore) => IDBRequest<T> | void): Promise<T | undefined> {
+    return openDb().then(db => new Promise((resolve, reject) => {
+        if (!db) return resolve(undefined);
+        let tx: IDBTransaction;
+        let request: IDBRequest<T> | void;
+        try {
+            tx = db.transaction(STORE, mode);
+            request = body(tx.objectStore(STORE));
+        } catch (error) {
+            // The connection is closing (e.g. another tab is upgrading it)
+            return reject(error);
+        }
+        tx.oncomplete = () => resolve(request ? request.result : undefined);
+        tx.onerror = () => reject(tx.error);
+        // Quota errors and versionchange aborts fire abort, not always error
+        tx.onabort = () => reject(tx.error || new DOMException('Transaction aborted', 'AbortError'));
+    }));
+}
+
+async function readAll(): Promise<QueuedOp[]> {
+    const db = await openDb();
+    if (!db) return [...memoryStore.values()];
+    return (await run<QueuedOp[]>('readonly', store => store.getAll() as IDBRequest<QueuedOp[]>)) || [];
+}
+
+// Read-modify-write in one transaction so concurrent enqueues never lose fields
+async function upsert(key: string, next: (current: QueuedOp | undefined) => QueuedOp) {
+    const db = await openDb();
+    if (!db) {
+        memoryStore.set(key, next(memoryStore.get(key)));
+        return;
+    }
+    await run('readwrite', store => {
+        const read = store.get(key);
+        read.onsuccess = () => store.put(next(read.result));
+    });
+}
+
+// Remove a flushed op unless it was re-queued (version bumped) mid-flush
+async function settle(op: QueuedOp, keep: (current: QueuedOp) => QueuedOp | null) {
+    const db = await openDb();
+    if (!db) {
+        const current = memoryStore.get(op.key);
+        if (!current) return;
+        const kept = current.version === op.version ? keep(current) : current;
+        if (kept) memoryStore.set(op.key, kept); else memoryStore.delete(op.key);
+        return;
+    }
+    await run('readwrite', store => {
+        const read = store.get(op.key);
+        read.onsuccess = () => {
+            const current = read.result as QueuedOp | undefined;
+            if (!current || current.version !== op.version) return;
+            const kept = keep(current);
+            if (kept) store.put(kept); else store.delete(op.key);
+        };
+    });
+}
+
+// ==================== QUEUE ====================
+
+let version = Date.now();
+let flushTimer: ReturnType<typeof setTimeout> | null = null;
+let flushing: Promise<void> | null = null;
+let flushAgain = false;
+let failures = 0;
+let errorListener: ((error: Error) => void) | null = null;
+// The signed-in user; nothing is flushed while it is null
+let queueUser: string | null = null;
+// Cleared by drainWriteQueue so nothing slips in behind the last flush
+let accepting = true;
+// Settles once every enqueue started so far has reached the store
+let enqueuing: Promise<unknown> = Promise.resolve();
+
+function track(write: Promise<void>): Promise<void> {
+    enqueuing = Promise.all([enqueuing, write.catch(() => { })]);
+    return write;
+}
+
+// In-memory view of the deal updates not yet acknowledged, so incoming
+// server rows can be read through them (see withPendingUpdates)
+const pendingUpdates = new Map<string, { version: number; updates: Partial<BrandDeal> }>();
+
+function forgetPending(op: QueuedOp) {
+    if (op.kind === 'deal_update' && pendingUpdates.get(op.dealId)?.version === op.version) {
+        pendingUpdates.delete(op.dealId);
+    }
+}
+
+// A server row with this tab's unsent edits laid over it. Realtime and
+// reconcile can deliver a row older than an edit still in the queue; without
+// this the board would snap back until the flush echoes.
+export function withPendingUpdates(deal: BrandDeal): BrandDeal {
+    const pending = pendingUpdates.get(deal.id);
+    return pending ? { ...deal, ...pending.updates } : deal;
+}
+
+function scheduleFlush(delay = FLUSH_DELAY_MS) {
+    if (flushTimer) clearTimeout(flushTimer);
+    flushTimer = setTimeout(() => {
+        flushTimer = null;
+        flushWriteQueue();
+    }, delay);
+}
+
+// Rejects when the change could not be queued (storage failure, or sign-out
+// in progress); callers should report it, as nothing else will
+export async function enqueueDealUpdate(dealId: string, updates: Partial<BrandDeal>) {
+    if (!accepting) throw new Error('signing out');
+    const key = `deal:${dealId}`;
+    const opVersion = ++version;
+    const previous = pendingUpdates.get(dealId);
+    pendingUpdates.set(dealId, { version: opVersion, updates: { ...previous?.updates, ...updates } });
+    try {
+        await track(upsert(key, current => ({
+            key,
+            kind: 'deal_update',
+            userId: queueUser,
+            dealId,
+            updates: { ...(current?.kind === 'deal_update' ? current.updates : {}), ...updates },
+            version: opVersion,
+            attempts: 0
+        })));
+    } catch (error) {
+        // Never stored, so never acknowledged; earlier updates are still queued
+        if (pendingUpdates.get(dealId)?.version === opVersion) {
+            if (previous) pendingUpdates.set(dealId, previous); else pendingUpdates.delete(dealId);
+        }
+        throw error;
+    }
+    scheduleFlush();
+}
+
+export async function enqueueTimelineEvent(dealId: string, event: Omit<TimelineEvent, 'date'>) {
+    if (!accepting) throw new Error('signing out');
+    const key = `event:${event.id}`;
+    await track(upsert(key, () => ({ key, kind: 'timeline_event', userId: queueUser, dealId, event, version: ++version, attempts: 0 })));
+    scheduleFlush();
+}
+
+async function flushOnce() {
+    if (!queueUser) return;
+    const user = queueUser;
+    const all = await readAll();
+    const isForeign = (op: QueuedOp) => !!op.userId && op.userId !== user;
+    await Promise.all(all.filter(isForeign).map(op => settle(op, () => null)));
+    const ops = all.filter(op => !isForeign(op));
+    if (ops.length === 0) return;
+
+    const updates = ops.filter((op): op is Extract<QueuedOp, { kind: 'deal_update' }> => op.kind === 'deal_update');
+    const events = ops.filter((op): op is Extract<QueuedOp, { kind: 'timeline_event' }> => op.kind === 'timeline_event');
+    const errors: Error[] = [];
+    // Updates left by an earlier session of this tab's user
+    for (const op of updates) {
+        if (!pendingUpdates.has(op.dealId)) pendingUpdates.set(op.dealId, { version: op.version, updates: op.updates });
+    }
+
+    const fail = (op: QueuedOp, error: Error) => {
+        errors.push(error);
+        return settle(op, current => {
+            if (current.attempts + 1 < MAX_ATTEMPTS) return { ...current, attempts: current.attempts + 1 };
+            errorListener?.(error);
+            forgetPending(current);
+            return null;
+        });
+    };
+
+    await Promise.all(updates.map(op =>
+        updateDeal(op.dealId, op.updates)
+            .then(() => settle(op, () => {
+                forgetPending(op);
+                return null;
+            }), error => fail(op, error))
+    ));
+
+    if (events.length > 0) {
+        try {
+            await addTimelineEvents(events.map(({ dealId, event }) => ({
+                id: event.id,
+                type: event.type,
+                description: event.description,
+                metadata: event.metadata,
+                dealId
+            })));
+            await Promise.all(events.map(op => settle(op, () => null)));
+        } catch (error: any) {
+            await Promise.all(events.map(op => fail(op, error)));
+        }
+    }
+
+    if (errors.length > 0) throw errors[0];
+}
+
+export function flushWriteQueue(): Promise<void> {
+    if (flushing) {
+        // Ops queued after this flush read the store go out in the next one
+        flushAgain = true;
+        return flushing;
+    }
+
+    flushing = flushOnce()
+        .then(() => {
+            failures = 0;
+        })
+        .catch(() => {
+            failures += 1;
+            const backoff = Math.min(RETRY_MAX_MS, RETRY_BASE_MS * 2 ** (failures - 1));
+            scheduleFlush(backoff / 2 + Math.random() * backoff / 2);
+        })
+        .finally(() => {
+            flushing = null;
+            if (flushAgain && failures === 0) {
+                flushAgain = false;
+                scheduleFlush(0);
+            }
+        });
+
+    return flushing;
+}
+
+// Drain whatever this user's previous session left behind and flush again
+// whenever the browser comes back online. Returns a cleanup function.
+export function startWriteQueue(userId: string, onError?: (error: Error) => void): () => void {
+    queueUser = userId;
+    accepting = true;
+    errorListener = onError || null;
+    const onOnline = () => flushWriteQueue();
+    window.addEventListener('online', onOnline);
+    flushWriteQueue();
+
+    return () => {
+        window.removeEventListener('online', onOnline);
+        if (queueUser === userId) queueUser = null;
+        errorListener = null;
+    };
+}
+
+// For sign-out: stop taking new ops, wait for enqueues already under way and
+// any flush in flight, then flush once more. Whatever is still queued failed
+// under this session and must not go out under the next one, so it is
+// cleared. Returns how many ops were discarded.
+export async function drainWriteQueue(): Promise<number> {
+    accepting = false;
+    await enqueuing;
+    if (flushing) await flushing;
+    await flushWriteQueue();
+    return clearWriteQueue();
+}
+
+async function clearWriteQueue(): Promise<number> {
+    if (flushTimer) clearTimeout(flushTimer);
+    flushTimer = null;
+    failures = 0;
+    flushAgain = false;
+    pendingUpdates.clear();
+    const ops = await readAll();
+    await Promise.all(ops.map(op => settle(op, () => null)));
+    return ops.length;
+}
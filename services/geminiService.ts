@@ -1,61 +1,296 @@
-import { supabase } from "../lib/supabase";
+import { supabase, supabaseAnonKey, supabaseUrl } from "../lib/supabase";
+import { mergeRedFlags, scanRedFlags } from "../supabase/functions/_shared/redFlags.ts";
+import { estimateRate } from "../supabase/functions/_shared/rateEngine.ts";
 import { RateCheckInput, RateCheckResult, BriefAnalysisResult } from "../types";
 
-export const checkRateWithGroq = async (input: RateCheckInput): Promise<RateCheckResult> => {
+// ==================== REQUEST LAYER ====================
+
+// Every ai-service call goes through callAiService, which:
+// - shares one request between identical calls already in flight
+// - answers from recent successful results for the same input
+// - gives each action an overall deadline, retrying transient failures
+//   (network, 429, 5xx) with jittered backoff inside it
+// - stops calling for a while after repeated failures (circuit breaker), so
+//   callers fall back at once instead of waiting out every timeout
+const AI_DEADLINE_MS: Record<string, number> = {
+  'check-rate': 15000,
+  // Long briefs are analyzed in chunks server-side
+  'analyze-brief': 45000
+};
+const MAX_ATTEMPTS = 3;
+const RETRY_BASE_MS = 500;
+const BREAKER_THRESHOLD = 3;
+const BREAKER_COOLDOWN_MS = 30000;
+const RESULT_TTL_MS = 10 * 60 * 1000;
+const MAX_RESULTS = 50;
+
+type PartialAnswer = Record<string, any>;
+
+interface AiAnswer {
+  data: any;
+  cached: boolean;
+}
+
+interface InFlight {
+  promise: Promise<AiAnswer>;
+  // Only a streaming call produces partials; callers joining a plain one get
+  // the final answer alone
+  streaming: boolean;
+  listeners: Set<(partial: PartialAnswer) => void>;
+  latest?: PartialAnswer;
+}
+
+class AiServiceError extends Error {
+  constructor(message: string, readonly retryable: boolean) {
+    super(message);
+    this.name = 'AiServiceError';
+  }
+}
+
+const inFlight = new Map<string, InFlight>();
+const results = new Map<string, { data: any; expiresAt: number }>();
+let consecutiveFailures = 0;
+let breakerOpenUntil = 0;
+let probing = false;
+
+const isRetryableStatus = (status: number) => status === 429 || status >= 500;
+
+// 53-bit string hash, enough to key a few dozen recent inputs
+const hashInput = (text: string) => {
+  let h1 = 0xdeadbeef;
+  let h2 = 0x41c6ce57;
+  for (let i = 0; i < text.length; i++) {
+    const c = text.charCodeAt(i);
+    h1 = Math.imul(h1 ^ c, 2654435761);
+    h2 = Math.imul(h2 ^ c, 1597334677);
+  }
+  h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+  h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+  return (4294967296 * (2097151 & h2) + (h1 >>> 0)).toString(36);
+};
+
+// ai-service answers X-Cache: HIT when the result came from its response cache
+const isCacheHit = (response?: Response) => response?.headers.get('x-cache') === 'HIT';
+
+// Streaming mode: ai-service answers in NDJSON, one line per completed field
+// (or array item), so the UI can fill in while the model is still writing.
+const invokeStreaming = async (
+  action: string,
+  data: unknown,
+  signal: AbortSignal,
+  onPartial: (partial: PartialAnswer) => void
+): Promise<AiAnswer> => {
+  const { data: { session } } = await supabase.auth.getSession();
+  const response = await fetch(`${supabaseUrl}/functions/v1/ai-service`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      apikey: supabaseAnonKey,
+      Authorization: `Bearer ${session?.access_token || supabaseAnonKey}`
+    },
+    body: JSON.stringify({ action, data, stream: true }),
+    signal
+  });
+  if (!response.ok || !response.body) {
+    throw new AiServiceError(`ai-service responded ${response.status}`, isRetryableStatus(response.status));
+  }
+
+  const partial: PartialAnswer = {};
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffered = '';
+  for (; ;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffered += value;
+    const lines = buffered.split('\n');
+    buffered = lines.pop()!;
+    for (const line of lines) {
+      if (!line.trim()) continue;
+      const event = JSON.parse(line);
+      // The model call failed mid-answer; worth another try
+      if (event.error) throw new AiServiceError(event.error, true);
+      if (event.done) return { data: event.result, cached: isCacheHit(response) };
+      if ('item' in event) partial[event.field] = [...(partial[event.field] || []), event.item];
+      else partial[event.field] = event.value;
+      onPartial({ ...partial });
+    }
+  }
+  throw new AiServiceError('ai-service stream ended without a result', true);
+};
+
+const invokeOnce = async (
+  action: string,
+  data: unknown,
+  signal: AbortSignal,
+  onPartial?: (partial: PartialAnswer) => void
+): Promise<AiAnswer> => {
+  if (onPartial) return invokeStreaming(action, data, signal, onPartial);
+
+  const { data: result, error, response } = await supabase.functions.invoke('ai-service', {
+    body: { action, data },
+    signal
+  });
+  if (error) {
+    // FunctionsHttpError carries the response; fetch and relay errors do not
+    const status: number | undefined = (error as any).context?.status;
+    throw new AiServiceError(error.message, status === undefined || isRetryableStatus(status));
+  }
+  return { data: result, cached: isCacheHit(response) };
+};
+
+const invokeWithRetry = async (
+  action: string,
+  data: unknown,
+  onPartial?: (partial: PartialAnswer) => void
+): Promise<AiAnswer> => {
+  const controller = new AbortController();
+  const deadline = Date.now() + (AI_DEADLINE_MS[action] ?? 15000);
+  const timer = setTimeout(() => controller.abort(), deadline - Date.now());
   try {
-    const { data, error } = await supabase.functions.invoke('ai-service', {
-      body: {
-        action: 'check-rate',
-        data: input
+    for (let attempt = 1; ; attempt++) {
+      try {
+        return await invokeOnce(action, data, controller.signal, onPartial);
+      } catch (error) {
+        if (controller.signal.aborted) throw new AiServiceError(`${action} timed out`, true);
+        const retryable = error instanceof AiServiceError ? error.retryable : true;
+        const backoff = RETRY_BASE_MS * 2 ** (attempt - 1);
+        const delay = backoff / 2 + Math.random() * backoff / 2;
+        if (!retryable || attempt >= MAX_ATTEMPTS || Date.now() + delay >= deadline) throw error;
+        await new Promise(resolve => setTimeout(resolve, delay));
       }
+    }
+  } finally {
+    clearTimeout(timer);
+  }
+};
+
+const callAiService = async (
+  action: string,
+  data: unknown,
+  onPartial?: (partial: PartialAnswer) => void
+): Promise<AiAnswer> => {
+  const key = `${action}:${hashInput(JSON.stringify(data))}`;
+
+  const recent = results.get(key);
+  if (recent && recent.expiresAt > Date.now()) {
+    // Re-insert so the map stays in least-recently-used order
+    results.delete(key);
+    results.set(key, recent);
+    return { data: recent.data, cached: true };
+  }
+
+  const shared = inFlight.get(key);
+  if (shared) {
+    if (onPartial && shared.streaming) {
+      shared.listeners.add(onPartial);
+      if (shared.latest) onPartial(shared.latest);
+    }
+    return shared.promise;
+  }
+
+  const now = Date.now();
+  if (now < breakerOpenUntil || probing) throw new AiServiceError('ai-service is unavailable', false);
+  // After the cooldown a single request probes whether the service is back
+  const probe = consecutiveFailures >= BREAKER_THRESHOLD;
+  if (probe) probing = true;
+
+  const entry: InFlight = { promise: null!, streaming: !!onPartial, listeners: new Set(onPartial ? [onPartial] : []) };
+  const broadcast = (partial: PartialAnswer) => {
+    entry.latest = partial;
+    entry.listeners.forEach(listener => listener(partial));
+  };
+  entry.promise = invokeWithRetry(action, data, onPartial && broadcast)
+    .then(answer => {
+      consecutiveFailures = 0;
+      results.delete(key);
+      results.set(key, { data: answer.data, expiresAt: Date.now() + RESULT_TTL_MS });
+      if (results.size > MAX_RESULTS) results.delete(results.keys().next().value!);
+      return answer;
+    })
+    .catch(error => {
+      // Bad input or auth says nothing about whether the service is up
+      if (error instanceof AiServiceError && !error.retryable) throw error;
+      consecutiveFailures += 1;
+      if (consecutiveFailures >= BREAKER_THRESHOLD) breakerOpenUntil = Date.now() + BREAKER_COOLDOWN_MS;
+      throw error;
+    })
+    .finally(() => {
+      if (probe) probing = false;
+      inFlight.delete(key);
     });
+  inFlight.set(key, entry);
+  return entry.promise;
+};
 
-    if (error) throw error;
+export const checkRateWithGroq = async (
+  input: RateCheckInput,
+  onPartial?: (partial: Partial<RateCheckResult>) => void
+): Promise<RateCheckResult> => {
+  // The fee range is computed locally and always shown as is; ai-service only
+  // adds the explanation and reply, quoting its own run of the same engine on
+  // the same rounded metrics
+  const estimate = estimateRate(input);
+  onPartial?.(estimate);
+
+  try {
+    const { data, cached } = await callAiService(
+      'check-rate',
+      input,
+      onPartial && (partial => onPartial({ ...partial, ...estimate }))
+    );
 
     return {
-      suggestedLow: data.suggestedLow || 500,
-      suggestedHigh: data.suggestedHigh || 1500,
-      confidenceScore: data.confidenceScore || 50,
+      ...estimate,
       explanation: data.explanation || "Analysis completed",
-      suggestedReply: data.suggestedReply || "Thanks for the offer! Based on the scope, my rate would be around $X. Let me know if that works.",
-      timestamp: new Date().toISOString()
+      suggestedReply: data.suggestedReply || `Thanks for the offer! Based on the scope, my rate would be around $${estimate.suggestedHigh.toLocaleString()}. Let me know if that works.`,
+      timestamp: new Date().toISOString(),
+      cached
     };
   } catch (error) {
     console.error("Rate check failed", error);
     return {
-      suggestedLow: 500,
-      suggestedHigh: 1500,
-      confidenceScore: 50,
-      explanation: "Unable to connect to AI. Showing fallback estimate based on general market data.",
+      ...estimate,
+      explanation: "Unable to connect to AI. This range comes from standard CPM bands for the deliverable, adjusted for engagement, usage rights and exclusivity.",
+      suggestedReply: `Thanks for the offer! Based on the scope, my rate would be around $${estimate.suggestedHigh.toLocaleString()}. Let me know if that works.`,
       timestamp: new Date().toISOString()
     };
   }
 };
 
-export const analyzeBriefWithGroq = async (briefText: string): Promise<BriefAnalysisResult> => {
-  try {
-    const { data, error } = await supabase.functions.invoke('ai-service', {
-      body: {
-        action: 'analyze-brief',
-        data: { briefText }
-      }
-    });
+export const analyzeBriefWithGroq = async (
+  briefText: string,
+  onPartial?: (partial: Partial<BriefAnalysisResult>) => void
+): Promise<BriefAnalysisResult> => {
+  // Rule-based flags show up immediately; the model's flags replace the ones
+  // they cover as they arrive
+  const ruleHits = scanRedFlags(briefText);
+  if (onPartial && ruleHits.length > 0) onPartial({ redFlags: mergeRedFlags(ruleHits) });
 
-    if (error) throw error;
+  try {
+    const { data, cached } = await callAiService(
+      'analyze-brief',
+      { briefText },
+      onPartial && (partial => onPartial({ ...partial, redFlags: mergeRedFlags(ruleHits, partial.redFlags) }))
+    );
 
     return {
       summary: data.summary || "Could not analyze brief automatically.",
-      redFlags: data.redFlags || ["Analysis service currently unavailable."],
+      redFlags: (data.redFlags || ruleHits.length > 0)
+        ? mergeRedFlags(ruleHits, data.redFlags)
+        : ["Analysis service currently unavailable."],
       checklist: data.checklist || ["Review brief manually"],
       questionsToAsk: data.questionsToAsk || ["What are the usage rights?"],
-      timestamp: new Date().toISOString()
+      timestamp: new Date().toISOString(),
+      cached
     };
 
   } catch (error) {
     console.error("Brief analysis failed", error);
     return {
       summary: "Could not analyze brief automatically.",
-      redFlags: ["Analysis service currently unavailable. Check for generic red flags like 'Perpetual Rights'."],
+      redFlags: ruleHits.length > 0
+        ? mergeRedFlags(ruleHits)
+        : ["Analysis service currently unavailable. Check for generic red flags like 'Perpetual Rights'."],
       checklist: ["Review brief manually", "Check payment terms", "Check usage rights"],
       questionsToAsk: ["What are the usage rights?", "When is the payment due?"],
       timestamp: new Date().toISOString()
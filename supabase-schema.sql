@@ -25,6 +25,8 @@ create table deals (
 create table timeline_events (
   id uuid primary key default uuid_generate_v4(),
   deal_id uuid references deals(id) on delete cascade not null,
+  -- Denormalized owner so realtime subscriptions can filter on it
+  user_id uuid references auth.users not null default auth.uid(),
   type text not null,
   description text not null,
   metadata jsonb,
@@ -63,7 +65,7 @@ create policy "Users can view timeline events for their deals"
 
 create policy "Users can insert timeline events for their deals"
   on timeline_events for insert
-  with check (exists (
+  with check (auth.uid() = user_id and exists (
     select 1 from deals
     where deals.id = timeline_events.deal_id
     and deals.user_id = auth.uid()
@@ -74,6 +76,226 @@ create index deals_user_id_idx on deals(user_id);
 create index deals_status_idx on deals(status);
 create index timeline_events_deal_id_idx on timeline_events(deal_id);
 create index timeline_events_created_at_idx on timeline_events(created_at);
+-- Board load: deals newest-first, keyset-paged on (created_at, id)
+create index deals_user_id_created_at_id_idx on deals(user_id, created_at desc, id desc);
+-- Deal detail: one deal's timeline in event order
+create index timeline_events_deal_id_created_at_idx on timeline_events(deal_id, created_at);
+-- Realtime reconnect: rows changed since the client's high-water mark
+create index deals_user_id_updated_at_idx on deals(user_id, updated_at);
+create index timeline_events_user_id_created_at_idx on timeline_events(user_id, created_at);
+
+-- updated_at is the sync high-water mark, so stamp it with the server clock
+create or replace function set_updated_at()
+returns trigger as $$
+begin
+  new.updated_at = now();
+  return new;
+end;
+$$ language plpgsql;
+
+create trigger deals_set_updated_at
+  before update on deals
+  for each row execute function set_updated_at();
+
+-- Create a deal and its first timeline event in one transaction (one round
+-- trip from lib/api.ts createDealWithEvent). Runs as the caller, so the RLS
+-- insert policies still apply.
+create or replace function create_deal_with_event(deal jsonb, event_description text default 'Deal Created')
+returns json as $$
+declare
+  new_deal deals;
+  new_event timeline_events;
+begin
+  insert into deals (
+    user_id, brand_name, platform, contact, status, deal_value,
+    last_contacted_at, next_follow_up_at, follow_up_interval_days, follow_up_count,
+    notes, rate_check, brief_analysis
+  ) values (
+    auth.uid(),
+    deal->>'brand_name',
+    deal->>'platform',
+    deal->>'contact',
+    deal->>'status',
+    (deal->>'deal_value')::numeric,
+    (deal->>'last_contacted_at')::timestamptz,
+    (deal->>'next_follow_up_at')::timestamptz,
+    coalesce((deal->>'follow_up_interval_days')::integer, 7),
+    coalesce((deal->>'follow_up_count')::integer, 0),
+    deal->>'notes',
+    nullif(deal->'rate_check', 'null'::jsonb),
+    nullif(deal->'brief_analysis', 'null'::jsonb)
+  )
+  returning * into new_deal;
+
+  insert into timeline_events (deal_id, user_id, type, description)
+  values (new_deal.id, auth.uid(), 'status_change', event_description)
+  returning * into new_event;
+
+  return json_build_object('deal', row_to_json(new_deal), 'event', row_to_json(new_event));
+end;
+$$ language plpgsql security invoker;
+
+-- Bulk import (lib/dealTransfer.ts): a batch of deals and their timelines in
+-- one transaction. Each element is a deals row plus "timeline", a list of
+-- {id, type, description, metadata, created_at}; an empty timeline gets a
+-- single event_description event.
+create or replace function import_deals(batch jsonb, event_description text default 'Deal Imported')
+returns setof deals as $$
+declare
+  item jsonb;
+  new_deal deals;
+begin
+  for item in select value from jsonb_array_elements(batch) loop
+    insert into deals (
+      user_id, brand_name, platform, contact, status, deal_value,
+      last_contacted_at, next_follow_up_at, follow_up_interval_days, follow_up_count,
+      notes, rate_check, brief_analysis
+    ) values (
+      auth.uid(),
+      item->>'brand_name',
+      item->>'platform',
+      item->>'contact',
+      item->>'status',
+      (item->>'deal_value')::numeric,
+      (item->>'last_contacted_at')::timestamptz,
+      (item->>'next_follow_up_at')::timestamptz,
+      coalesce((item->>'follow_up_interval_days')::integer, 7),
+      coalesce((item->>'follow_up_count')::integer, 0),
+      item->>'notes',
+      nullif(item->'rate_check', 'null'::jsonb),
+      nullif(item->'brief_analysis', 'null'::jsonb)
+    )
+    returning * into new_deal;
+
+    if jsonb_array_length(coalesce(item->'timeline', '[]'::jsonb)) = 0 then
+      insert into timeline_events (deal_id, user_id, type, description)
+      values (new_deal.id, auth.uid(), 'status_change', event_description);
+    else
+      insert into timeline_events (id, deal_id, user_id, type, description, metadata, created_at)
+      select
+        coalesce((event->>'id')::uuid, uuid_generate_v4()),
+        new_deal.id,
+        auth.uid(),
+        event->>'type',
+        event->>'description',
+        nullif(event->'metadata', 'null'::jsonb),
+        coalesce((event->>'created_at')::timestamptz, now())
+      from jsonb_array_elements(item->'timeline') as event
+      on conflict (id) do nothing;
+    end if;
+
+    return next new_deal;
+  end loop;
+end;
+$$ language plpgsql security invoker;
+
+-- Realtime change feed for lib/sync.ts
+alter publication supabase_realtime add table deals, timeline_events;
+
+-- Follow-up digests, one row per user, rebuilt by the follow-up-digest
+-- edge function so the app reads a single row at startup
+create table notifications (
+  id uuid primary key default uuid_generate_v4(),
+  user_id uuid references auth.users on delete cascade not null,
+  kind text not null,
+  payload jsonb not null,
+  created_at timestamptz default now(),
+  read_at timestamptz,
+  unique (user_id, kind)
+);
+
+alter table notifications enable row level security;
+
+create policy "Users can view their own notifications"
+  on notifications for select
+  using (auth.uid() = user_id);
+
+create policy "Users can mark their own notifications read"
+  on notifications for update
+  using (auth.uid() = user_id);
+
+-- Open deals by follow-up time, for the digest's due-deal scan
+create index deals_open_next_follow_up_at_idx on deals(next_follow_up_at)
+  where status not in ('Secured', 'Ghosted');
+
+-- Rebuild every user's follow-up digest in one statement: scan due deals via
+-- deals_open_next_follow_up_at_idx, group per user, upsert one row each and
+-- drop digests for users with nothing due. Returns the number of digests.
+-- Only the service role (the edge function) may call it.
+create or replace function build_follow_up_digests(max_deals integer default 20)
+returns integer as $$
+declare
+  written integer;
+begin
+  with due as (
+    select user_id, id, brand_name, status, next_follow_up_at,
+           row_number() over (partition by user_id order by next_follow_up_at) as rank
+    from deals
+    where status not in ('Secured', 'Ghosted')
+      and next_follow_up_at <= now()
+  ), digests as (
+    select user_id,
+           jsonb_build_object(
+             'count', count(*),
+             'deals', jsonb_agg(
+               jsonb_build_object('id', id, 'brandName', brand_name, 'status', status, 'nextFollowUpAt', next_follow_up_at)
+               order by next_follow_up_at
+             ) filter (where rank <= max_deals)
+           ) as payload
+    from due
+    group by user_id
+  ), upserted as (
+    insert into notifications (user_id, kind, payload, created_at, read_at)
+    select user_id, 'follow_up_digest', payload, now(), null from digests
+    on conflict (user_id, kind) do update
+      set payload = excluded.payload, created_at = excluded.created_at,
+          read_at = case when notifications.payload = excluded.payload then notifications.read_at end
+    returning user_id
+  )
+  select count(*) into written from upserted;
+
+  delete from notifications n
+  where n.kind = 'follow_up_digest'
+    and not exists (
+      select 1 from deals d
+      where d.user_id = n.user_id
+        and d.status not in ('Secured', 'Ghosted')
+        and d.next_follow_up_at <= now()
+    );
+
+  return written;
+end;
+$$ language plpgsql security definer set search_path = public;
+
+revoke execute on function build_follow_up_digests(integer) from public, anon, authenticated;
+
+-- Hourly schedule (needs the pg_cron and pg_net extensions):
+-- select cron.schedule('follow-up-digest', '0 * * * *', $$
+--   select net.http_post(
+--     url := 'https://<project-ref>.supabase.co/functions/v1/follow-up-digest',
+--     headers := jsonb_build_object('Authorization', 'Bearer <service-role-key>')
+--   )
+-- $$);
+
+-- ai-service answer cache, keyed on a SHA-256 of the action and its
+-- normalized input. Only the edge function (service role) touches it, so RLS
+-- is on with no policies.
+create table ai_response_cache (
+  key text primary key,
+  action text not null,
+  response jsonb not null,
+  created_at timestamptz default now(),
+  expires_at timestamptz not null
+);
+
+alter table ai_response_cache enable row level security;
+
+create index ai_response_cache_expires_at_idx on ai_response_cache(expires_at);
+
+-- Expired rows are never served; clear them out daily (pg_cron):
+-- select cron.schedule('ai-cache-purge', '30 3 * * *', $$
+--   delete from ai_response_cache where expires_at < now()
+-- $$);
 
 -- Feedback table
 create table user_feedback (
@@ -0,0 +1,130 @@
+// Deterministic fee estimate for a sponsored deliverable, following the
+// pricing model the check-rate prompt used to ask the model to apply:
+//
+//   fee = views / 1000 x CPM band for the deliverable
+//         x engagement adjustment
+//         x (1 + usage-rights uplift + exclusivity uplift)
+//
+// Shared by RateChecker, which recomputes it on every keystroke, and by
+// ai-service, where the model now only writes the explanation and reply
+// around these numbers. Audience metrics are rounded first, exactly as
+// ai-service rounds them for its cache key, so the range on screen is the
+// range the model quotes.
+
+export interface RateEstimateInput {
+    platform: string;
+    followers: number;
+    avgViews: number;
+    engagementRate: number;
+    contentType: string;
+    usageRights: string;
+    exclusivity: string;
+}
+
+export interface RateEstimate {
+    suggestedLow: number;
+    suggestedHigh: number;
+    confidenceScore: number;
+}
+
+// USD per thousand views, low and high end of the market band. The first
+// match wins, so short-form comes before the generic "video": "TikTok Video"
+// and "Short video" are priced as short-form.
+const CPM_BANDS: { match: RegExp; band: [number, number] }[] = [
+    { match: /reel|tiktok|short/i, band: [15, 25] },
+    { match: /dedicated|long[- ]?form|video/i, band: [25, 40] },
+    { match: /integration|mention|segment/i, band: [20, 30] },
+    { match: /stor(y|ies)/i, band: [10, 20] },
+    { match: /newsletter|email/i, band: [20, 35] },
+    { match: /post|static|carousel/i, band: [10, 20] },
+];
+const DEFAULT_BAND: [number, number] = [15, 30];
+
+// Used when only followers are known
+const VIEWS_PER_FOLLOWER = 0.1;
+const BASELINE_ENGAGEMENT = 3;
+
+const USAGE_UPLIFT_PER_30_DAYS = 0.2;
+const USAGE_UPLIFT_CAP = 1;
+const PAID_USAGE_UPLIFT = 0.3;
+const EXCLUSIVITY_UPLIFT_PER_MONTH = 0.3;
+const EXCLUSIVITY_UPLIFT_CAP = 1.5;
+
+const MIN_FEE = 100;
+const ROUND_TO = 50;
+
+const UNIT_DAYS: Record<string, number> = { day: 1, week: 7, month: 30, year: 365 };
+const WORD_NUMBERS: Record<string, number> = { a: 1, an: 1, one: 1, two: 2, three: 3, four: 4, six: 6, twelve: 12 };
+
+// "30 days", "3 months", "one year" -> days; null when no duration is given
+function parseDays(text: string): number | null {
+    const found = text.toLowerCase().match(/(\d+(?:\.\d+)?|an?|one|two|three|four|six|twelve)\s*-?\s*(day|week|month|year)s?/);
+    if (!found) return null;
+    const count = Number(found[1]) || WORD_NUMBERS[found[1]] || 0;
+    return count * UNIT_DAYS[found[2]];
+}
+
+const isNone = (text: string) => !text.trim() || /^(none|no|n\/a|not? (?:usage|exclusivity)\b.*)$/i.test(text.trim());
+const isPerpetual = (text: string) => /perpetu|forever|unlimited|irrevocab/i.test(text);
+
+// Returns the uplift and whether the terms were understood
+function usageUplift(usageRights: string): [number, boolean] {
+    if (isNone(usageRights)) return [0, true];
+    if (isPerpetual(usageRights)) return [USAGE_UPLIFT_CAP + PAID_USAGE_UPLIFT, true];
+    const days = parseDays(usageRights);
+    const paid = /paid|ads?\b|whitelist|boost|spark/i.test(usageRights) ? PAID_USAGE_UPLIFT : 0;
+    if (days === null) return [USAGE_UPLIFT_PER_30_DAYS + paid, false];
+    return [Math.min(USAGE_UPLIFT_CAP, (days / 30) * USAGE_UPLIFT_PER_30_DAYS) + paid, true];
+}
+
+function exclusivityUplift(exclusivity: string): [number, boolean] {
+    if (isNone(exclusivity)) return [0, true];
+    if (isPerpetual(exclusivity)) return [EXCLUSIVITY_UPLIFT_CAP, true];
+    const days = parseDays(exclusivity);
+    if (days === null) return [EXCLUSIVITY_UPLIFT_PER_MONTH, false];
+    return [Math.min(EXCLUSIVITY_UPLIFT_CAP, (days / 30) * EXCLUSIVITY_UPLIFT_PER_MONTH), true];
+}
+
+// Two significant figures: 51,234 and 50,890 followers get the same quote
+export function bucket(value: unknown): number {
+    const n = Number(value) || 0;
+    if (n <= 0) return 0;
+    const magnitude = 10 ** Math.max(0, Math.floor(Math.log10(n)) - 1);
+    return Math.round(n / magnitude) * magnitude;
+}
+
+export const roundEngagement = (value: unknown) => Math.round((Number(value) || 0) * 10) / 10;
+
+const roundFee = (fee: number) => Math.max(MIN_FEE, Math.round(fee / ROUND_TO) * ROUND_TO);
+
+export function estimateRate(input: RateEstimateInput): RateEstimate {
+    const followers = bucket(input.followers);
+    const avgViews = bucket(input.avgViews);
+    const engagement = Math.max(0, roundEngagement(input.engagementRate));
+    const contentType = String(input.contentType ?? '');
+
+    const known = CPM_BANDS.find(({ match }) => match.test(contentType));
+    const [cpmLow, cpmHigh] = known?.band ?? DEFAULT_BAND;
+    const views = avgViews > 0 ? avgViews : followers * VIEWS_PER_FOLLOWER;
+
+    // -20% to +30%, centred on a typical engagement rate
+    const engagementFactor = engagement > 0
+        ? Math.min(1.3, Math.max(0.8, 1 + (engagement - BASELINE_ENGAGEMENT) * 0.1))
+        : 1;
+    const [usage, usageKnown] = usageUplift(String(input.usageRights ?? ''));
+    const [exclusivity, exclusivityKnown] = exclusivityUplift(String(input.exclusivity ?? ''));
+    const multiplier = engagementFactor * (1 + usage + exclusivity);
+
+    let confidenceScore = 90;
+    if (avgViews <= 0) confidenceScore -= 25;
+    if (engagement <= 0) confidenceScore -= 10;
+    if (!known) confidenceScore -= 10;
+    if (!usageKnown) confidenceScore -= 10;
+    if (!exclusivityKnown) confidenceScore -= 10;
+
+    return {
+        suggestedLow: roundFee((views / 1000) * cpmLow * multiplier),
+        suggestedHigh: roundFee((views / 1000) * cpmHigh * multiplier),
+        confidenceScore: views > 0 ? Math.max(20, confidenceScore) : 20,
+    };
+}
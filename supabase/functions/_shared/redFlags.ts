@@ -0,0 +1,108 @@
+// Deterministic scan for the contract clauses the brief prompt asks the model
+// to flag. All rules are compiled into one alternation with a named group per
+// rule, so a brief is read in a single pass however many rules there are.
+// Shared by the app (instant flags while the model is still working, and the
+// fallback when it is unavailable) and by ai-service, which folds the hits
+// into every analysis it returns.
+
+export interface RedFlagRule {
+    id: string;
+    label: string;
+    why: string;
+    // Regex source, matched against normalizeBrief() output
+    pattern: string;
+    // Extra check on the matched text, for rules that need a number compared
+    accept?: (match: string) => boolean;
+}
+
+export interface RedFlagHit {
+    id: string;
+    label: string;
+    why: string;
+    match: string;
+}
+
+// Payment terms longer than this many days are flagged
+const MAX_PAYMENT_DAYS = 60;
+
+const DURATION = String.raw`(?:\d+|one|two|three|four|six|twelve)[- ](?:day|week|month|year)s?`;
+
+export const RED_FLAG_RULES: RedFlagRule[] = [
+    {
+        id: 'perpetual-usage',
+        label: 'Perpetual Usage',
+        why: 'The brand could keep using your content forever without paying again.',
+        pattern: String.raw`\bin perpetuity\b|\bperpetual(?:ly)?\b|\birrevocabl[ey]\b|\bfor all time\b|\bunlimited (?:duration|period|time)\b|\bnow known or hereafter (?:devised|developed)\b`,
+    },
+    {
+        id: 'work-for-hire',
+        label: 'Work for Hire',
+        why: 'You would give up ownership of what you create, not just license it.',
+        pattern: String.raw`\bworks? (?:made )?for hire\b|\bassigns? all (?:rights?|right, title)\b|\ball right, title and interest\b|\bwaives? (?:all |any )?moral rights\b|\bsole and exclusive property of\b`,
+    },
+    {
+        id: 'no-exclusivity-cap',
+        label: 'No Exclusivity Cap',
+        why: 'Exclusivity without an end date can block paid work with other brands indefinitely.',
+        pattern: String.raw`\bexclusiv\w*[^.]{0,80}?\b(?:indefinite(?:ly)?|unlimited|until further notice|no end date|at (?:the )?brand'?s? (?:sole )?discretion)\b|\bnot (?:to )?(?:work|partner|collaborate) with (?:any )?(?:competitors?|competing (?:brands?|companies|products))\b(?![^.]{0,60}\b${DURATION})`,
+    },
+    {
+        id: 'late-payment',
+        label: 'Late Payment (>Net 60)',
+        why: 'Waiting more than two months to be paid puts the cash-flow risk on you.',
+        pattern: String.raw`\bnet[- ]?\d{2,3}\b|\b(?:within|after|in) \d{2,3} (?:calendar |business )?days (?:of|from|after|following) (?:receipt|invoice|invoicing|publication|posting|campaign end|the end)`,
+        accept: match => Number(match.match(/\d+/)?.[0]) > MAX_PAYMENT_DAYS,
+    },
+    {
+        id: 'indemnity',
+        label: 'Indemnity',
+        why: 'You could be personally liable for the brand\'s legal costs and claims.',
+        pattern: String.raw`\bindemni\w*|\bhold (?:\w+ ){0,3}harmless\b|\bliable for (?:any and )?all (?:claims|damages|losses)\b`,
+    },
+];
+
+const matcher = new RegExp(RED_FLAG_RULES.map((rule, i) => `(?<r${i}>${rule.pattern})`).join('|'), 'g');
+
+// Lowercase, ASCII quotes and dashes, no accents, single spaces
+export function normalizeBrief(text: string): string {
+    return text
+        .normalize('NFKD')
+        .replace(/[\u0300-\u036f]/g, '')
+        .replace(/[\u2018\u2019]/g, "'")
+        .replace(/[\u201c\u201d]/g, '"')
+        .replace(/[\u2010-\u2015]/g, '-')
+        .toLowerCase()
+        .replace(/\s+/g, ' ');
+}
+
+// First hit per rule, in rule order
+export function scanRedFlags(text: string): RedFlagHit[] {
+    const hits = new Map<string, RedFlagHit>();
+    for (const found of normalizeBrief(text).matchAll(matcher)) {
+        const i = RED_FLAG_RULES.findIndex((_, j) => found.groups?.[`r${j}`] !== undefined);
+        const rule = RED_FLAG_RULES[i];
+        if (!rule || hits.has(rule.id)) continue;
+        if (rule.accept && !rule.accept(found[0])) continue;
+        hits.set(rule.id, { id: rule.id, label: rule.label, why: rule.why, match: found[0].trim() });
+    }
+    return RED_FLAG_RULES.flatMap(rule => hits.get(rule.id) ?? []);
+}
+
+// Same "LABEL: why it matters" shape the model is asked for
+export function formatRedFlag(hit: RedFlagHit): string {
+    return `${hit.label}: ${hit.why} (matched "${hit.match}")`;
+}
+
+// The model's flags come first and win: a rule hit is only added when none of
+// them already covers that clause, by label or by the rule's own pattern
+export function mergeRedFlags(hits: RedFlagHit[], modelFlags: string[] = []): string[] {
+    const covered = new Set<string>();
+    for (const flag of modelFlags) {
+        const text = normalizeBrief(flag);
+        for (const rule of RED_FLAG_RULES) {
+            const label = rule.label.replace(/\s*\(.*\)$/, '').toLowerCase();
+            if (text.includes(label) || new RegExp(rule.pattern).test(text)) covered.add(rule.id);
+        }
+    }
+    return [...modelFlags, ...hits.filter(hit => !covered.has(hit.id)).map(formatRedFlag)];
+}
@@ -0,0 +1,143 @@
+// Map-reduce helpers for briefs too long for one prompt.
+//
+// A long contract is split into overlapping chunks so that a clause cut at a
+// boundary still appears whole in one of them. The chunks are analyzed
+// concurrently and the per-chunk answers are folded into one analysis, with
+// red flags, checklist items and questions deduplicated across chunks. A
+// chunk that fails twice is left out and flagged rather than failing the
+// whole brief.
+
+export const BRIEF_CHUNK_CHARS = 12000;
+export const BRIEF_CHUNK_OVERLAP = 800;
+export const BRIEF_MAP_CONCURRENCY = 5;
+
+const MAX_CHECKLIST = 8;
+const MAX_QUESTIONS = 5;
+
+export interface BriefAnalysis {
+    summary: string;
+    redFlags: string[];
+    checklist: string[];
+    questionsToAsk: string[];
+}
+
+// Cut as late as possible in the window at a paragraph, then sentence, then
+// word boundary, so chunks rarely split a clause mid-sentence
+function boundary(text: string, from: number, to: number): number {
+    if (to >= text.length) return text.length;
+    const floor = from + Math.floor((to - from) / 2);
+    for (const separator of ['\n\n', '\n', '. ', ' ']) {
+        const at = text.lastIndexOf(separator, to);
+        if (at > floor) return at + separator.length;
+    }
+    return to;
+}
+
+export function splitBrief(text: string, size = BRIEF_CHUNK_CHARS, overlap = BRIEF_CHUNK_OVERLAP): string[] {
+    if (text.length <= size) return [text];
+    const chunks: string[] = [];
+    let start = 0;
+    for (; ;) {
+        const end = boundary(text, start, start + size);
+        chunks.push(text.slice(start, end).trim());
+        if (end >= text.length) break;
+        start = Math.max(start + 1, end - overlap);
+    }
+    return chunks;
+}
+
+// Like Promise.all over items.map(fn), but with at most `limit` calls running
+export async function mapWithConcurrency<T, R>(
+    items: T[],
+    limit: number,
+    fn: (item: T, index: number) => Promise<R>
+): Promise<R[]> {
+    const results = new Array<R>(items.length);
+    let next = 0;
+    const worker = async () => {
+        while (next < items.length) {
+            const index = next++;
+            results[index] = await fn(items[index], index);
+        }
+    };
+    await Promise.all(Array.from({ length: Math.min(limit, items.length) }, worker));
+    return results;
+}
+
+// One call, retried once on failure. A chunk that still fails settles with
+// its error instead of rejecting, so the rest of the brief is not thrown
+// away with it.
+export async function settleWithRetry<T>(fn: () => Promise<T>): Promise<{ value: T } | { error: unknown }> {
+    try {
+        return { value: await fn() };
+    } catch {
+        try {
+            return { value: await fn() };
+        } catch (error) {
+            return { error };
+        }
+    }
+}
+
+// Red flag standing in for the sections that could not be analyzed
+export function missingSectionsFlag(missing: number[], total: number): string {
+    const sections = missing.map(index => index + 1).join(', ');
+    return `INCOMPLETE ANALYSIS: Part${missing.length > 1 ? 's' : ''} ${sections} of ${total} of this brief could not be analyzed; read ${missing.length > 1 ? 'them' : 'it'} yourself before signing.`;
+}
+
+// Red flags come back as "LABEL: why it matters"; two chunks that quote the
+// same clause agree on the label even when the explanation is worded
+// differently. A literal "RED FLAG:" prefix is not a label.
+function dedupeKey(entry: string, byLabel: boolean): string {
+    let text = entry;
+    if (byLabel) {
+        text = text.replace(/^\W*red flags?\s*[:\-]\s*/i, '');
+        if (text.includes(':')) text = text.slice(0, text.indexOf(':'));
+    }
+    return text.toLowerCase().replace(/[^a-z0-9]+/g, ' ').trim();
+}
+
+export function createBriefMerger() {
+    const seen = {
+        redFlags: new Set<string>(),
+        checklist: new Set<string>(),
+        questionsToAsk: new Set<string>(),
+    };
+    const merged: BriefAnalysis = { summary: '', redFlags: [], checklist: [], questionsToAsk: [] };
+    const limits = { redFlags: Infinity, checklist: MAX_CHECKLIST, questionsToAsk: MAX_QUESTIONS };
+
+    return {
+        // Folds one chunk's answer in and returns the entries it added
+        add(part: Partial<BriefAnalysis>, isFirst: boolean): Partial<BriefAnalysis> {
+            const added: Partial<BriefAnalysis> = {};
+            // The opening chunk states what is being asked; later summaries
+            // only describe their own section
+            if ((isFirst || !merged.summary) && typeof part.summary === 'string' && part.summary.trim()) {
+                merged.summary = part.summary.trim();
+                added.summary = merged.summary;
+            }
+            for (const field of ['redFlags', 'checklist', 'questionsToAsk'] as const) {
+                const entries = Array.isArray(part[field]) ? part[field]! : [];
+                for (const entry of entries) {
+                    if (typeof entry !== 'string' || !entry.trim()) continue;
+                    if (merged[field].length >= limits[field]) break;
+                    const key = dedupeKey(entry, field === 'redFlags');
+                    if (!key || seen[field].has(key)) continue;
+                    seen[field].add(key);
+                    merged[field].push(entry.trim());
+                    (added[field] ??= []).push(entry.trim());
+                }
+            }
+            return added;
+        },
+
+        result(): BriefAnalysis {
+            return {
+                summary: merged.summary,
+                redFlags: [...merged.redFlags],
+                checklist: [...merged.checklist],
+                questionsToAsk: [...merged.questionsToAsk],
+            };
+        }
+    };
+}
@@ -1,11 +1,145 @@
 import { serve } from "https://deno.land/std@0.168.0/http/server.ts";
 import OpenAI from "https://esm.sh/openai@4.24.1";
+import { createClient } from "https://esm.sh/@supabase/supabase-js@2";
+import { createJsonFieldParser } from "./jsonFields.ts";
+import { mergeRedFlags, scanRedFlags } from "../_shared/redFlags.ts";
+import { bucket, estimateRate, roundEngagement } from "../_shared/rateEngine.ts";
+import { BRIEF_MAP_CONCURRENCY, createBriefMerger, mapWithConcurrency, missingSectionsFlag, settleWithRetry, splitBrief } from "./briefChunks.ts";
 
 const corsHeaders = {
     'Access-Control-Allow-Origin': '*',
     'Access-Control-Allow-Headers': 'authorization, x-client-info, apikey, content-type',
+    'Access-Control-Expose-Headers': 'x-cache',
 };
 
+function jsonResponse(body: unknown, cacheStatus: string): Response {
+    return new Response(
+        JSON.stringify(body),
+        { headers: { ...corsHeaders, 'Content-Type': 'application/json', 'X-Cache': cacheStatus } }
+    );
+}
+
+// With `stream: true` the answer goes out as NDJSON: {"field", "value"} once a
+// top-level field is complete, {"field", "item"} for each finished array
+// element, then {"done": true, "result"} or {"error"}.
+type StreamEvent =
+    | { field: string; value: unknown }
+    | { field: string; item: unknown }
+    | { done: true; result: unknown }
+    | { error: string };
+
+function ndjsonResponse(produce: (send: (event: StreamEvent) => void) => Promise<void>, cacheStatus: string): Response {
+    const encoder = new TextEncoder();
+    const body = new ReadableStream({
+        async start(controller) {
+            const send = (event: StreamEvent) => controller.enqueue(encoder.encode(JSON.stringify(event) + '\n'));
+            try {
+                await produce(send);
+            } catch (error) {
+                send({ error: error.message });
+            }
+            controller.close();
+        }
+    });
+    return new Response(body, {
+        headers: { ...corsHeaders, 'Content-Type': 'application/x-ndjson', 'Cache-Control': 'no-cache', 'X-Cache': cacheStatus }
+    });
+}
+
+function parseAnswer(text: string): any {
+    const jsonMatch = text.match(/\{[\s\S]*\}/);
+    return JSON.parse(jsonMatch ? jsonMatch[0] : text);
+}
+
+// Answers are cached in ai_response_cache under a hash of the action and its
+// normalized input, so a resubmitted deal or brief skips the model entirely.
+// X-Cache reports HIT, MISS, or BYPASS when no service key is configured.
+const CACHE_TTL_HOURS: Record<string, number> = {
+    'check-rate': 24,
+    'analyze-brief': 24 * 7,
+};
+// Bump when a prompt or the model changes so older answers stop matching
+const CACHE_VERSION = 5;
+// Long briefs are analyzed in chunks (briefChunks.ts); this only bounds cost
+const MAX_BRIEF_CHARS = 120000;
+
+function clean(value: unknown): string {
+    return String(value ?? '').replace(/\s+/g, ' ').trim();
+}
+
+// Like clean, but keeps line and paragraph breaks so long briefs can be split
+// on clause boundaries
+function cleanBrief(value: unknown): string {
+    return String(value ?? '')
+        .replace(/\r\n?/g, '\n')
+        .replace(/[^\S\n]+/g, ' ')
+        .replace(/ *\n */g, '\n')
+        .replace(/\n{3,}/g, '\n\n')
+        .trim();
+}
+
+// The prompts are built from this normalized input, so a cached answer
+// always matches what the model would have been asked
+function normalizeInput(action: string, data: any): any {
+    if (action === 'check-rate') {
+        return {
+            platform: clean(data?.platform),
+            followers: bucket(data?.followers),
+            avgViews: bucket(data?.avgViews),
+            engagementRate: roundEngagement(data?.engagementRate),
+            contentType: clean(data?.contentType),
+            usageRights: clean(data?.usageRights),
+            exclusivity: clean(data?.exclusivity),
+        };
+    }
+    if (action === 'analyze-brief') {
+        return { briefText: cleanBrief(data?.briefText).substring(0, MAX_BRIEF_CHARS) };
+    }
+    return null;
+}
+
+async function cacheKey(action: string, input: unknown): Promise<string> {
+    const bytes = new TextEncoder().encode(JSON.stringify([CACHE_VERSION, action, input]));
+    const digest = await crypto.subtle.digest('SHA-256', bytes);
+    return Array.from(new Uint8Array(digest), b => b.toString(16).padStart(2, '0')).join('');
+}
+
+function cacheClient() {
+    const url = Deno.env.get('SUPABASE_URL');
+    const serviceKey = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY');
+    if (!url || !serviceKey) return null;
+    return createClient(url, serviceKey, { auth: { persistSession: false } });
+}
+
+function briefPrompt(briefText: string, part?: { index: number; total: number }): string {
+    const scope = part
+        ? `This is part ${part.index + 1} of ${part.total} of a longer document; neighbouring parts overlap slightly and are analyzed separately.
+Report only what appears in this part.${part.index > 0 ? ' For SUMMARY, return an empty string unless this part changes the deliverables or fee.' : ''}
+
+`
+        : '';
+    return `Act as a legal-focused Talent Manager for a top creator. 
+Analyze this brand brief/email script for "Toxic Terms" and "Unfair Requests".
+
+${scope}Brief Text:
+"${briefText}"
+
+STRICT ANALYSIS CATEGORIES:
+- RED FLAGS: Look for "Perpetual Usage", "Work for Hire", "No Exclusivity Cap", "Late Payment (>Net 60)", "Indemnity issues".
+- RED FLAGS DETAIL: For each red flag, add a one-sentence "Why this matters" explanation.
+- SUMMARY: 2-3 sentences max on what is actually being asked.
+- CHECKLIST: List 3-5 tactical creator To-Dos (e.g., "Film unboxing", "Post story on Friday").
+- QUESTIONS: 3 critical questions to ask the brand to avoid scope creep.
+
+Response must be valid JSON with this exact structure:
+{
+  "summary": "string",
+  "redFlags": ["RED FLAG: Why it matters"],
+  "checklist": ["string"],
+  "questionsToAsk": ["string"]
+}`;
+}
+
 serve(async (req) => {
     // Handle CORS preflight requests
     if (req.method === 'OPTIONS') {
@@ -13,7 +147,40 @@ serve(async (req) => {
     }
 
     try {
-        const { action, data } = await req.json();
+        const { action, data, stream = false } = await req.json();
+        const input = normalizeInput(action, data);
+        const cache = input ? cacheClient() : null;
+        const key = input ? await cacheKey(action, input) : '';
+
+        if (cache) {
+            const { data: hit } = await cache
+                .from('ai_response_cache')
+                .select('response')
+                .eq('key', key)
+                .gt('expires_at', new Date().toISOString())
+                .maybeSingle();
+            if (hit) {
+                if (!stream) return jsonResponse(hit.response, 'HIT');
+                return ndjsonResponse(async send => {
+                    for (const [field, value] of Object.entries(hit.response as Record<string, unknown>)) send({ field, value });
+                    send({ done: true, result: hit.response });
+                }, 'HIT');
+            }
+        }
+
+        const store = async (result: unknown) => {
+            if (cache) {
+                const { error } = await cache.from('ai_response_cache').upsert({
+                    key,
+                    action,
+                    response: result,
+                    expires_at: new Date(Date.now() + CACHE_TTL_HOURS[action] * 3600 * 1000).toISOString(),
+                });
+                // A failed write only costs the next caller a model call
+                if (error) console.error('ai_response_cache write failed:', error.message);
+            }
+        };
+
         const apiKey = Deno.env.get('GROQ_API_KEY');
 
         if (!apiKey) {
@@ -29,11 +196,60 @@ serve(async (req) => {
         });
 
         const MODEL_NAME = "llama-3.3-70b-versatile";
+        const cacheStatus = cache ? 'MISS' : 'BYPASS';
+
+        const messagesFor = (system: string, prompt: string) => [
+            { role: "system" as const, content: system },
+            { role: "user" as const, content: prompt }
+        ];
+
+        const complete = async (system: string, prompt: string): Promise<any> => {
+            const response = await client.chat.completions.create({
+                model: MODEL_NAME,
+                messages: messagesFor(system, prompt),
+                temperature: 0.7,
+            });
+            return parseAnswer(response.choices[0]?.message?.content || "");
+        };
+
+        // `finish` adjusts the parsed answer before it is cached and sent
+        const answer = async (system: string, prompt: string, finish = (result: any) => result): Promise<Response> => {
+            const messages = messagesFor(system, prompt);
+
+            if (!stream) {
+                const result = finish(await complete(system, prompt));
+                await store(result);
+                return jsonResponse(result, cacheStatus);
+            }
+
+            const completion = await client.chat.completions.create({
+                model: MODEL_NAME,
+                messages,
+                temperature: 0.7,
+                stream: true,
+            });
+            return ndjsonResponse(async send => {
+                const parser = createJsonFieldParser({
+                    onField: (field, value) => send({ field, value }),
+                    onItem: (field, item) => send({ field, item }),
+                });
+                let text = "";
+                for await (const chunk of completion) {
+                    const delta = chunk.choices[0]?.delta?.content || "";
+                    text += delta;
+                    parser.push(delta);
+                }
+                const result = finish(parseAnswer(text));
+                await store(result);
+                send({ done: true, result });
+            }, cacheStatus);
+        };
 
         if (action === 'check-rate') {
-            const input = data;
+            // The numbers come from the shared engine; the model only explains them
+            const estimate = estimateRate(input);
             const prompt = `Act as a Creator Economy pricing expert (Talent Manager). 
-Analyze the following creator metrics and deal terms to suggest a FAIR MARKET price range.
+A pricing model has already set the FAIR MARKET fee range for this deal. Explain it and draft the reply; do not change the numbers.
 
 Platform: ${input.platform}
 Followers: ${input.followers}
@@ -43,83 +259,89 @@ Deliverable Type: ${input.contentType}
 Usage Rights: ${input.usageRights}
 Exclusivity: ${input.exclusivity}
 
+Suggested fee range: $${estimate.suggestedLow} - $${estimate.suggestedHigh} (USD)
+How it was priced: views / 1000 x an industry CPM band for the deliverable (e.g., $20-40 for Video, $10-20 for Stories), adjusted for engagement, +20% per 30 days of usage rights (+30% for paid usage) and +30% per month of exclusivity.
+
 STRICT GUIDELINES:
-1. Base rate should consider industry standard CPMs (e.g., $20-40 for Video, $10-20 for Stories).
-2. Add multipliers for Usage Rights (e.g., +20% for 30 days digital organic).
-3. Add multipliers for Exclusivity (e.g., +30% per month of exclusivity).
-4. Provide a realistic fee range (USD).
-5. Confidence score (0-100) based on standard industry alignment.
-6. Plain-english explanation citing why you chose those numbers.
-7. A "suggestedReply": A short, polite, and confident copy-paste ready message for the creator to send back to the brand.
+1. Plain-english explanation citing why the range is fair for these metrics and terms.
+2. A "suggestedReply": A short, polite, and confident copy-paste ready message for the creator to send back to the brand, quoting the range.
 
 Response must be valid JSON with this exact structure:
 {
-  "suggestedLow": number,
-  "suggestedHigh": number,
-  "confidenceScore": number,
   "explanation": "string",
   "suggestedReply": "string"
 }`;
 
-            const response = await client.chat.completions.create({
-                model: MODEL_NAME,
-                messages: [
-                    { role: "system", content: "You are a creator economy pricing expert. Always respond with valid JSON only." },
-                    { role: "user", content: prompt }
-                ],
-                temperature: 0.7,
-            });
-
-            const text = response.choices[0]?.message?.content || "";
-            const jsonMatch = text.match(/\{[\s\S]*\}/);
-            const result = JSON.parse(jsonMatch ? jsonMatch[0] : text);
-
-            return new Response(
-                JSON.stringify(result),
-                { headers: { ...corsHeaders, 'Content-Type': 'application/json' } }
+            return answer(
+                "You are a creator economy pricing expert. Always respond with valid JSON only.",
+                prompt,
+                result => ({ ...estimate, explanation: result.explanation, suggestedReply: result.suggestedReply })
             );
         }
 
         if (action === 'analyze-brief') {
-            const { briefText } = data;
-            const prompt = `Act as a legal-focused Talent Manager for a top creator. 
-Analyze this brand brief/email script for "Toxic Terms" and "Unfair Requests".
-
-Brief Text:
-"${briefText.substring(0, 5000)}"
-
-STRICT ANALYSIS CATEGORIES:
-- RED FLAGS: Look for "Perpetual Usage", "Work for Hire", "No Exclusivity Cap", "Late Payment (>Net 60)", "Indemnity issues".
-- RED FLAGS DETAIL: For each red flag, add a one-sentence "Why this matters" explanation.
-- SUMMARY: 2-3 sentences max on what is actually being asked.
-- CHECKLIST: List 3-5 tactical creator To-Dos (e.g., "Film unboxing", "Post story on Friday").
-- QUESTIONS: 3 critical questions to ask the brand to avoid scope creep.
-
-Response must be valid JSON with this exact structure:
-{
-  "summary": "string",
-  "redFlags": ["RED FLAG: Why it matters"],
-  "checklist": ["string"],
-  "questionsToAsk": ["string"]
-}`;
-
-            const response = await client.chat.completions.create({
-                model: MODEL_NAME,
-                messages: [
-                    { role: "system", content: "You are a legal-focused talent manager for creators. Always respond with valid JSON only." },
-                    { role: "user", content: prompt }
-                ],
-                temperature: 0.7,
+            const system = "You are a legal-focused talent manager for creators. Always respond with valid JSON only.";
+            // Rule hits the model missed are added to its red flags
+            const ruleHits = scanRedFlags(input.briefText);
+            const withRuleFlags = (result: any) => ({
+                ...result,
+                redFlags: mergeRedFlags(ruleHits, Array.isArray(result.redFlags) ? result.redFlags : []),
             });
+            const chunks = splitBrief(input.briefText);
+            if (chunks.length === 1) return answer(system, briefPrompt(chunks[0]), withRuleFlags);
 
-            const text = response.choices[0]?.message?.content || "";
-            const jsonMatch = text.match(/\{[\s\S]*\}/);
-            const result = JSON.parse(jsonMatch ? jsonMatch[0] : text);
+            // Map: every chunk is analyzed on its own, a few at a time, and a
+            // failed call is retried once for that chunk alone.
+            // Reduce: answers are merged in document order for the result and
+            // cache; a stream also gets each new entry as its chunk finishes.
+            const analyze = (send?: (event: StreamEvent) => void) => {
+                const live = createBriefMerger();
+                return mapWithConcurrency(chunks, BRIEF_MAP_CONCURRENCY, async (chunk, index) => {
+                    const settled = await settleWithRetry(() => complete(system, briefPrompt(chunk, { index, total: chunks.length })));
+                    if ('error' in settled) {
+                        console.error(`Brief chunk ${index + 1}/${chunks.length} failed:`, settled.error);
+                        return settled;
+                    }
+                    const part = settled.value;
+                    if (send) {
+                        const added = live.add(part, index === 0);
+                        if (added.summary) send({ field: 'summary', value: added.summary });
+                        for (const field of ['redFlags', 'checklist', 'questionsToAsk'] as const) {
+                            for (const item of added[field] ?? []) send({ field, item });
+                        }
+                    }
+                    return settled;
+                });
+            };
+            // Fails only when no chunk could be analyzed. A partial analysis
+            // carries a flag naming the missing parts and is not cached, so
+            // the next request tries them again.
+            const reduce = (settled: Awaited<ReturnType<typeof analyze>>) => {
+                const missing = settled.flatMap((part, index) => 'error' in part ? [index] : []);
+                if (missing.length === settled.length) throw (settled[0] as { error: unknown }).error;
+                const merger = createBriefMerger();
+                let first = true;
+                for (const part of settled) {
+                    if ('error' in part) continue;
+                    merger.add(part.value, first);
+                    first = false;
+                }
+                const result = withRuleFlags(merger.result());
+                if (missing.length > 0) result.redFlags.unshift(missingSectionsFlag(missing, chunks.length));
+                return { result, isComplete: missing.length === 0 };
+            };
 
-            return new Response(
-                JSON.stringify(result),
-                { headers: { ...corsHeaders, 'Content-Type': 'application/json' } }
-            );
+            if (!stream) {
+                const { result, isComplete } = reduce(await analyze());
+                if (isComplete) await store(result);
+                return jsonResponse(result, cacheStatus);
+            }
+            return ndjsonResponse(async send => {
+                const { result, isComplete } = reduce(await analyze(send));
+                if (isComplete) await store(result);
+                else send({ field: 'redFlags', item: result.redFlags[0] });
+                send({ done: true, result });
+            }, cacheStatus);
         }
 
         return new Response(
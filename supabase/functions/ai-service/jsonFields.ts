@@ -0,0 +1,111 @@
+// Incremental reader for a streamed JSON object, e.g. a model answer arriving
+// token by token. It reports each top-level field once its value is complete
+// and, for array fields, each element as soon as it closes, so callers can
+// render partial answers long before the final brace. Anything before the
+// first "{" (prose, a ```json fence) is skipped.
+
+export interface JsonFieldHandlers {
+    onField: (field: string, value: unknown) => void;
+    onItem?: (field: string, item: unknown) => void;
+}
+
+export function createJsonFieldParser({ onField, onItem }: JsonFieldHandlers) {
+    let buffer = '';
+    let pos = 0;
+    let depth = 0;
+    let started = false;
+    let finished = false;
+    let inString = false;
+    let escaped = false;
+    let stringStart = -1;
+    let field: string | null = null;
+    let valueStart = -1;
+    let arrayField: string | null = null;
+    let itemStart = -1;
+
+    const emit = (from: number, to: number, report: (value: unknown) => void) => {
+        const raw = buffer.slice(from, to).trim();
+        if (!raw) return;
+        try {
+            report(JSON.parse(raw));
+        } catch {
+            // Not valid JSON after all; the caller still gets the final parse
+        }
+    };
+
+    const step = (char: string, i: number) => {
+        if (inString) {
+            if (escaped) escaped = false;
+            else if (char === '\\') escaped = true;
+            else if (char === '"') {
+                inString = false;
+                // A string at depth 1 before any ':' is a key
+                if (depth === 1 && valueStart < 0) {
+                    try { field = JSON.parse(buffer.slice(stringStart, i + 1)); } catch { field = null; }
+                }
+            }
+            return;
+        }
+
+        switch (char) {
+            case '"':
+                inString = true;
+                stringStart = i;
+                break;
+            case ':':
+                if (depth === 1) valueStart = i + 1;
+                break;
+            case '{':
+            case '[':
+                depth++;
+                if (depth === 2 && char === '[' && valueStart >= 0 && field) {
+                    arrayField = field;
+                    itemStart = i + 1;
+                }
+                break;
+            case ',':
+                if (depth === 1 && valueStart >= 0 && field) {
+                    const name = field;
+                    emit(valueStart, i, value => onField(name, value));
+                    valueStart = -1;
+                    field = null;
+                } else if (depth === 2 && arrayField) {
+                    const name = arrayField;
+                    emit(itemStart, i, item => onItem?.(name, item));
+                    itemStart = i + 1;
+                }
+                break;
+            case ']':
+            case '}':
+                if (depth === 2 && arrayField) {
+                    const name = arrayField;
+                    emit(itemStart, i, item => onItem?.(name, item));
+                    arrayField = null;
+                }
+                depth--;
+                if (depth === 0) {
+                    if (valueStart >= 0 && field) {
+                        const name = field;
+                        emit(valueStart, i, value => onField(name, value));
+                    }
+                    finished = true;
+                }
+                break;
+        }
+    };
+
+    return {
+        push(chunk: string) {
+            if (finished) return;
+            buffer += chunk;
+            for (; pos < buffer.length && !finished; pos++) {
+                const char = buffer[pos];
+                if (!started) {
+                    if (char !== '{') continue;
+                    started = true;
+                }
+                step(char, pos);
+            }
+        }
+    };
+}
@@ -0,0 +1,48 @@
+import { serve } from "https://deno.land/std@0.168.0/http/server.ts";
+import { createClient } from "https://esm.sh/@supabase/supabase-js@2";
+
+// Scheduled job (see the pg_cron snippet in supabase-schema.sql): rebuilds
+// every user's follow-up digest row in the notifications table. The grouping
+// runs inside build_follow_up_digests, so this is one round trip however
+// many users have due deals.
+
+const jsonHeaders = { 'Content-Type': 'application/json' };
+
+serve(async (req) => {
+    const serviceKey = Deno.env.get('SUPABASE_SERVICE_ROLE_KEY');
+    const url = Deno.env.get('SUPABASE_URL');
+
+    if (!serviceKey || !url) {
+        return new Response(
+            JSON.stringify({ error: 'SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set' }),
+            { status: 500, headers: jsonHeaders }
+        );
+    }
+
+    // Only the scheduler (holding the service role key) may trigger a rebuild
+    if (req.headers.get('Authorization') !== `Bearer ${serviceKey}`) {
+        return new Response(
+            JSON.stringify({ error: 'Unauthorized' }),
+            { status: 401, headers: jsonHeaders }
+        );
+    }
+
+    try {
+        const maxDeals = Number(new URL(req.url).searchParams.get('max_deals')) || 20;
+        const admin = createClient(url, serviceKey, { auth: { persistSession: false } });
+
+        const started = Date.now();
+        const { data, error } = await admin.rpc('build_follow_up_digests', { max_deals: maxDeals });
+        if (error) throw error;
+
+        return new Response(
+            JSON.stringify({ digests: data, durationMs: Date.now() - started }),
+            { headers: jsonHeaders }
+        );
+    } catch (error) {
+        return new Response(
+            JSON.stringify({ error: error.message }),
+            { status: 500, headers: jsonHeaders }
+        );
+    }
+});
@@ -1,196 +1,154 @@
-import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
+from harness import actions
+from harness.runner import run_standalone
+
+
+async def run_test(context):
+    # Open a new page in the browser context provided by the runner
+    page = await context.new_page()
+
+    # Navigate to the app (relative to the context base_url) and wait for it to settle
+    await actions.goto(page, "/")
+
+    # Interact with the page elements to simulate user flow
+    # -> Click the Sign In button to navigate to the login page.
+    frame = context.pages[-1]
+    # Click the Sign In button to go to the login page
+    elem = frame.locator('xpath=html/body/div/div/div/nav/div[3]/button').nth(0)
+    await actions.click(page, elem)
+
+
+    # -> Input valid username/email and password into the respective fields.
+    frame = context.pages[-1]
+    # Input valid username/email
+    elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/input').nth(0)
+    await actions.fill(page, elem, 'testsprite_user@creator.os')
+
+
+    frame = context.pages[-1]
+    # Input valid password
+    elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
+    await actions.fill(page, elem, 'TestPassword123!')
+
+
+    # -> Click the Initialize Session button to attempt login.
+    frame = context.pages[-1]
+    # Click the Initialize Session button to submit login form
+    elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
+    await actions.click(page, elem)
+
+
+    # -> Try to scroll to the 'Initialize Session' button to ensure it is fully visible and then attempt to click it again.
+    frame = context.pages[-1]
+    # Click the 'Initialize Session' button to submit login form after scrolling
+    elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
+    await actions.click(page, elem)
+
+
+    # -> Try to clear and input the password field using alternative methods or focus and send keys to the password input field, then click 'Initialize Session'.
+    frame = context.pages[-1]
+    # Focus on the password input field to prepare for input
+    elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
+    await actions.click(page, elem)
+
+
+    frame = context.pages[-1]
+    # Try inputting password again after focusing
+    elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
+    await actions.fill(page, elem, 'TestPassword123!')
+
+
+    frame = context.pages[-1]
+    # Click 'Initialize Session' button to submit login form
+    elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
+    await actions.click(page, elem)
+
+
+    # -> Input the valid username/email into the email field again, then click 'Initialize Session' to test login.
+    frame = context.pages[-1]
+    # Input valid username/email into email field
+    elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/input').nth(0)
+    await actions.fill(page, elem, 'testsprite_user@creator.os')
+
+
+    frame = context.pages[-1]
+    # Click 'Initialize Session' button to submit login form
+    elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
+    await actions.click(page, elem)
+
+
+    # -> Manually clear the email and password fields, then input the valid username/email and password again, and immediately click 'Initialize Session' to attempt login.
+    frame = context.pages[-1]
+    # Focus and clear the email input field
+    elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/input').nth(0)
+    await actions.click(page, elem)
+
+
+    frame = context.pages[-1]
+    # Input valid username/email
+    elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/input').nth(0)
+    await actions.fill(page, elem, 'testsprite_user@creator.os')
+
+
+    frame = context.pages[-1]
+    # Focus and clear the password input field
+    elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
+    await actions.click(page, elem)
+
+
+    frame = context.pages[-1]
+    # Input valid password
+    elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
+    await actions.fill(page, elem, 'TestPassword123!')
+
+
+    frame = context.pages[-1]
+    # Click 'Initialize Session' button to submit login form immediately after input
+    elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
+    await actions.click(page, elem)
+
+
+    # -> Click the 'Initialize Session' button to submit the login form and attempt login.
+    frame = context.pages[-1]
+    # Click the 'Initialize Session' button to submit login form
+    elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
+    await actions.click(page, elem)
+
+
+    # -> Try to input the email and password fields again carefully, then click 'Initialize Session' immediately to attempt login.
+    frame = context.pages[-1]
+    # Input valid username/email
+    elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/input').nth(0)
+    await actions.fill(page, elem, 'testsprite_user@creator.os')
+
+
+    frame = context.pages[-1]
+    # Input valid password
+    elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
+    await actions.fill(page, elem, 'TestPassword123!')
+
+
+    frame = context.pages[-1]
+    # Click 'Initialize Session' button to submit login form
+    elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
+    await actions.click(page, elem)
+
+
+    # -> Try submitting the login form by focusing the password field and sending the Enter key to trigger form submission, bypassing the button click.
+    frame = context.pages[-1]
+    # Focus on the password input field
+    elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
+    await actions.click(page, elem)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Click the Sign In button to navigate to the login page.
-        frame = context.pages[-1]
-        # Click the Sign In button to go to the login page
-        elem = frame.locator('xpath=html/body/div/div/div/nav/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input valid username/email and password into the respective fields.
-        frame = context.pages[-1]
-        # Input valid username/email
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testsprite_user@creator.os')
-        
-
-        frame = context.pages[-1]
-        # Input valid password
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123!')
-        
-
-        # -> Click the Initialize Session button to attempt login.
-        frame = context.pages[-1]
-        # Click the Initialize Session button to submit login form
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Try to scroll to the 'Initialize Session' button to ensure it is fully visible and then attempt to click it again.
-        frame = context.pages[-1]
-        # Click the 'Initialize Session' button to submit login form after scrolling
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Try to clear and input the password field using alternative methods or focus and send keys to the password input field, then click 'Initialize Session'.
-        frame = context.pages[-1]
-        # Focus on the password input field to prepare for input
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        # Try inputting password again after focusing
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123!')
-        
-
-        frame = context.pages[-1]
-        # Click 'Initialize Session' button to submit login form
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input the valid username/email into the email field again, then click 'Initialize Session' to test login.
-        frame = context.pages[-1]
-        # Input valid username/email into email field
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testsprite_user@creator.os')
-        
-
-        frame = context.pages[-1]
-        # Click 'Initialize Session' button to submit login form
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Manually clear the email and password fields, then input the valid username/email and password again, and immediately click 'Initialize Session' to attempt login.
-        frame = context.pages[-1]
-        # Focus and clear the email input field
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        # Input valid username/email
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testsprite_user@creator.os')
-        
-
-        frame = context.pages[-1]
-        # Focus and clear the password input field
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        # Input valid password
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123!')
-        
-
-        frame = context.pages[-1]
-        # Click 'Initialize Session' button to submit login form immediately after input
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the 'Initialize Session' button to submit the login form and attempt login.
-        frame = context.pages[-1]
-        # Click the 'Initialize Session' button to submit login form
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Try to input the email and password fields again carefully, then click 'Initialize Session' immediately to attempt login.
-        frame = context.pages[-1]
-        # Input valid username/email
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testsprite_user@creator.os')
-        
-
-        frame = context.pages[-1]
-        # Input valid password
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123!')
-        
-
-        frame = context.pages[-1]
-        # Click 'Initialize Session' button to submit login form
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Try submitting the login form by focusing the password field and sending the Enter key to trigger form submission, bypassing the button click.
-        frame = context.pages[-1]
-        # Focus on the password input field
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Login Successful! Welcome to the main app shell').first).to_be_visible(timeout=1000)
-        except AssertionError:
-            raise AssertionError("Test case failed: User login was not successful. The user was not authenticated and redirected to the main app shell as expected.")
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+        await expect(frame.locator('text=Login Successful! Welcome to the main app shell').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test case failed: User login was not successful. The user was not authenticated and redirected to the main app shell as expected.")
+
+
+if __name__ == "__main__":
+    run_standalone(run_test)
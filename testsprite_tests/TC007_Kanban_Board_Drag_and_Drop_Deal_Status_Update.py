@@ -1,131 +1,65 @@
-import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
+from harness import actions
+from harness.runner import run_standalone
+from harness.session import authenticated
+
+
+@authenticated
+async def run_test(context):
+    # Open a new page in the browser context provided by the runner
+    page = await context.new_page()
+
+    # Open the deal board; the shared session is already in the context's storage state
+    await actions.goto(page, "/#/")
+
+    # Interact with the page elements to simulate user flow
+    # -> Click on 'Deal Board' link to navigate to Deal Board with multiple deals.
+    frame = context.pages[-1]
+    # Click on 'Deal Board' link to navigate to Deal Board
+    elem = frame.locator('xpath=html/body/div/div/div/aside/div/nav/a').nth(0)
+    await actions.click(page, elem)
+
+
+    # -> Click the 'New Deal' button at index 3 to open the new deal creation form.
+    frame = context.pages[-1]
+    # Click 'New Deal' button to create a new deal
+    elem = frame.locator('xpath=html/body/div/div/div/aside/div/div[2]/button[2]').nth(0)
+    await actions.click(page, elem)
+
+
+    # -> Fill in the 'Brand Identity' field and other required fields, then submit the form to create the deal.
+    frame = context.pages[-1]
+    # Input 'Test Deal 1' into Brand Identity field
+    elem = frame.locator('xpath=html/body/div/div/div/div/main/div[2]/div[2]/form/div/div/input').nth(0)
+    await actions.fill(page, elem, 'Test Deal 1')
+
+
+    frame = context.pages[-1]
+    # Input POC Information URL
+    elem = frame.locator('xpath=html/body/div/div/div/div/main/div[2]/div[2]/form/div/div[2]/div[2]/input').nth(0)
+    await actions.fill(page, elem, 'https://linkedin.com/in/testdeal1')
+
+
+    frame = context.pages[-1]
+    # Input strategic context notes
+    elem = frame.locator('xpath=html/body/div/div/div/div/main/div[2]/div[2]/form/div/div[2]/div[3]/textarea').nth(0)
+    await actions.fill(page, elem, 'Initial outreach notes for Test Deal 1')
+
+
+    frame = context.pages[-1]
+    # Click 'Confirm & Start' button to submit the new deal form
+    elem = frame.locator('xpath=html/body/div/div/div/div/main/div[2]/div[2]/form/div[2]/button[2]').nth(0)
+    await actions.click(page, elem)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Click on 'Sign In' button to log in with provided credentials.
-        frame = context.pages[-1]
-        # Click on 'Sign In' button to open login form
-        elem = frame.locator('xpath=html/body/div/div/div/nav/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input email and password, then click 'Initialize Session' to log in.
-        frame = context.pages[-1]
-        # Input email for login
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testsprite_user@creator.os')
-        
-
-        frame = context.pages[-1]
-        # Input password for login
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123!')
-        
-
-        frame = context.pages[-1]
-        # Click 'Initialize Session' button to submit login form
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on 'Deal Board' link to navigate to Deal Board with multiple deals.
-        frame = context.pages[-1]
-        # Click on 'Deal Board' link to navigate to Deal Board
-        elem = frame.locator('xpath=html/body/div/div/div/aside/div/nav/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the 'New Deal' button at index 3 to open the new deal creation form.
-        frame = context.pages[-1]
-        # Click 'New Deal' button to create a new deal
-        elem = frame.locator('xpath=html/body/div/div/div/aside/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Fill in the 'Brand Identity' field and other required fields, then submit the form to create the deal.
-        frame = context.pages[-1]
-        # Input 'Test Deal 1' into Brand Identity field
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Deal 1')
-        
-
-        frame = context.pages[-1]
-        # Input POC Information URL
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div[2]/div[2]/form/div/div[2]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('https://linkedin.com/in/testdeal1')
-        
-
-        frame = context.pages[-1]
-        # Input strategic context notes
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div[2]/div[2]/form/div/div[2]/div[3]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Initial outreach notes for Test Deal 1')
-        
-
-        frame = context.pages[-1]
-        # Click 'Confirm & Start' button to submit the new deal form
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div[2]/div[2]/form/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Deal Status Updated Successfully').first).to_be_visible(timeout=1000)
-        except AssertionError:
-            raise AssertionError("Test plan failed: Dragging and dropping deal cards between columns did not update deal status or persist changes as expected.")
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+        await expect(frame.locator('text=Deal Status Updated Successfully').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test plan failed: Dragging and dropping deal cards between columns did not update deal status or persist changes as expected.")
+
+
+if __name__ == "__main__":
+    run_standalone(run_test)
@@ -1,112 +1,26 @@
-import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Locate and open the New Deal Modal to select panic mode for quick-save.
-        await page.mouse.wheel(0, 300)
-        
-
-        # -> Try to find any navigation or menu elements to open New Deal Modal or panic mode.
-        await page.mouse.wheel(0, 500)
-        
+from harness import actions
+from harness.runner import run_standalone
+from harness.session import authenticated
 
-        # -> Try to navigate to a login or dashboard page to access deal features, or try to find any hidden menus or buttons.
-        await page.goto('http://localhost:3000/login', timeout=10000)
-        await asyncio.sleep(3)
-        
 
-        # -> Click the 'Sign In' button to proceed to the login form.
-        frame = context.pages[-1]
-        # Click the 'Sign In' button to open login form
-        elem = frame.locator('xpath=html/body/div/div/div/nav/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+@authenticated
+async def run_test(context):
+    # Open a new page in the browser context provided by the runner
+    page = await context.new_page()
 
-        # -> Click the Initialize Session button to login after filling credentials.
-        frame = context.pages[-1]
-        # Click Initialize Session button to login
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # Open the deal board; the shared session is already in the context's storage state
+    await actions.goto(page, "/#/")
 
-        # -> Input email and password, then click Initialize Session to login.
-        frame = context.pages[-1]
-        # Input email for login
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testsprite_user@creator.os')
-        
-
-        frame = context.pages[-1]
-        # Input password for login
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123!')
-        
+    # Interact with the page elements to simulate user flow
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=Deal Successfully Created').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError('Test case failed: Panic mode quick-save feature did not create and persist the deal as expected.')
 
-        frame = context.pages[-1]
-        # Click Initialize Session button to login
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
 
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Deal Successfully Created').first).to_be_visible(timeout=1000)
-        except AssertionError:
-            raise AssertionError('Test case failed: Panic mode quick-save feature did not create and persist the deal as expected.')
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    run_standalone(run_test)
@@ -1,182 +1,84 @@
-import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
+from harness import actions
+from harness.runner import run_standalone
+from harness.session import authenticated
+
+
+@authenticated
+async def run_test(context):
+    # Open a new page in the browser context provided by the runner
+    page = await context.new_page()
+
+    # Open the deal board; the shared session is already in the context's storage state
+    await actions.goto(page, "/#/")
+
+    # Interact with the page elements to simulate user flow
+    # -> Click on 'New Deal' button to start creating a new deal and input a sample brand brief.
+    frame = context.pages[-1]
+    # Click on 'New Deal' button to start creating a new deal
+    elem = frame.locator('xpath=html/body/div/div/div/aside/div/div[2]/button[2]').nth(0)
+    await actions.click(page, elem)
+
+
+    # -> Input a sample brand brief text into the 'Strategic Context' textarea.
+    frame = context.pages[-1]
+    # Input sample brand brief text into 'Strategic Context' textarea.
+    elem = frame.locator('xpath=html/body/div/div/div/div/main/div[2]/div[2]/form/div/div[2]/div[3]/textarea').nth(0)
+    await actions.fill(page, elem, 'Our brand is launching a new eco-friendly athletic wear line targeting environmentally conscious millennials. We aim to leverage TikTok for influencer partnerships and community engagement. Key goals include building brand awareness, driving online sales, and establishing long-term brand loyalty. Potential risks include market saturation and influencer authenticity concerns. Opportunities lie in growing demand for sustainable products and viral marketing potential.')
+
+
+    # -> Click 'Confirm & Start' button to submit the deal and trigger the Brief Translator tool's risk and opportunity analysis.
+    frame = context.pages[-1]
+    # Click 'Confirm & Start' button to submit the deal and trigger analysis
+    elem = frame.locator('xpath=html/body/div/div/div/div/main/div[2]/div[2]/form/div[2]/button[2]').nth(0)
+    await actions.click(page, elem)
+
+
+    # -> Click 'New Deal' button to reopen the deal creation modal and fill all required fields including 'Brand Identity' before submitting.
+    frame = context.pages[-1]
+    # Click 'New Deal' button to reopen deal creation modal
+    elem = frame.locator('xpath=html/body/div/div/div/aside/div/div[2]/button[2]').nth(0)
+    await actions.click(page, elem)
+
+
+    # -> Input 'EcoFit Athletics' into Brand Identity field and re-enter the sample brand brief text into Strategic Context, then submit.
+    frame = context.pages[-1]
+    # Input 'EcoFit Athletics' into Brand Identity field
+    elem = frame.locator('xpath=html/body/div/div/div/div/main/div[2]/div[2]/form/div/div/input').nth(0)
+    await actions.fill(page, elem, 'EcoFit Athletics')
+
+
+    frame = context.pages[-1]
+    # Re-input sample brand brief text into Strategic Context textarea
+    elem = frame.locator('xpath=html/body/div/div/div/div/main/div[2]/div[2]/form/div/div[2]/div[3]/textarea').nth(0)
+    await actions.fill(page, elem, 'Our brand is launching a new eco-friendly athletic wear line targeting environmentally conscious millennials. We aim to leverage TikTok for influencer partnerships and community engagement. Key goals include building brand awareness, driving online sales, and establishing long-term brand loyalty. Potential risks include market saturation and influencer authenticity concerns. Opportunities lie in growing demand for sustainable products and viral marketing potential.')
+
+
+    frame = context.pages[-1]
+    # Click 'Confirm & Start' button to submit the deal and trigger analysis
+    elem = frame.locator('xpath=html/body/div/div/div/div/main/div[2]/div[2]/form/div[2]/button[2]').nth(0)
+    await actions.click(page, elem)
+
+
+    # -> Try to reload the main page or navigate back to the Pipeline dashboard to recover the previous state or report the issue.
+    await actions.goto(page, '/#/')
+
+
+    # -> Click on 'New Deal' button to reopen the deal creation modal and input required fields for analysis.
+    frame = context.pages[-1]
+    # Click on 'New Deal' button to start creating a new deal
+    elem = frame.locator('xpath=html/body/div/div/div/aside/div/div[2]/button[2]').nth(0)
+    await actions.click(page, elem)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Navigate to Brief Translator tool
-        frame = context.pages[-1]
-        # Click on 'Use Cases' to find Brief Translator tool
-        elem = frame.locator('xpath=html/body/div/div/div/nav/div[2]/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Try alternative navigation by clicking 'How It Works' or 'Get Started' to find the Brief Translator tool or report issue if no progress.
-        frame = context.pages[-1]
-        # Click on 'How It Works' to try alternative navigation to Brief Translator tool
-        elem = frame.locator('xpath=html/body/div/div/div/nav/div[2]/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on 'Use Cases' or scroll to find the Brief Translator tool link or button.
-        await page.mouse.wheel(0, 500)
-        
-
-        frame = context.pages[-1]
-        # Click on 'Use Cases' to try to find the Brief Translator tool
-        elem = frame.locator('xpath=html/body/div/div/div/nav/div[2]/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on 'Use Cases' to try to access the Brief Translator tool.
-        frame = context.pages[-1]
-        # Click on 'Use Cases' to navigate to Brief Translator tool or related section
-        elem = frame.locator('xpath=html/body/div/div/div/nav/div[2]/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on 'Get Started' button to try to access the Brief Translator tool or onboarding process.
-        frame = context.pages[-1]
-        # Click on 'Get Started' button
-        elem = frame.locator('xpath=html/body/div/div/div/nav/div[3]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input email and security key, then submit to login.
-        frame = context.pages[-1]
-        # Input email for login
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testsprite_user@creator.os')
-        
-
-        frame = context.pages[-1]
-        # Input security key for login
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123!')
-        
-
-        frame = context.pages[-1]
-        # Click 'Initialize Session' to login
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on 'New Deal' button to start creating a new deal and input a sample brand brief.
-        frame = context.pages[-1]
-        # Click on 'New Deal' button to start creating a new deal
-        elem = frame.locator('xpath=html/body/div/div/div/aside/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input a sample brand brief text into the 'Strategic Context' textarea.
-        frame = context.pages[-1]
-        # Input sample brand brief text into 'Strategic Context' textarea.
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div[2]/div[2]/form/div/div[2]/div[3]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Our brand is launching a new eco-friendly athletic wear line targeting environmentally conscious millennials. We aim to leverage TikTok for influencer partnerships and community engagement. Key goals include building brand awareness, driving online sales, and establishing long-term brand loyalty. Potential risks include market saturation and influencer authenticity concerns. Opportunities lie in growing demand for sustainable products and viral marketing potential.')
-        
-
-        # -> Click 'Confirm & Start' button to submit the deal and trigger the Brief Translator tool's risk and opportunity analysis.
-        frame = context.pages[-1]
-        # Click 'Confirm & Start' button to submit the deal and trigger analysis
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div[2]/div[2]/form/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click 'New Deal' button to reopen the deal creation modal and fill all required fields including 'Brand Identity' before submitting.
-        frame = context.pages[-1]
-        # Click 'New Deal' button to reopen deal creation modal
-        elem = frame.locator('xpath=html/body/div/div/div/aside/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input 'EcoFit Athletics' into Brand Identity field and re-enter the sample brand brief text into Strategic Context, then submit.
-        frame = context.pages[-1]
-        # Input 'EcoFit Athletics' into Brand Identity field
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div[2]/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('EcoFit Athletics')
-        
-
-        frame = context.pages[-1]
-        # Re-input sample brand brief text into Strategic Context textarea
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div[2]/div[2]/form/div/div[2]/div[3]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Our brand is launching a new eco-friendly athletic wear line targeting environmentally conscious millennials. We aim to leverage TikTok for influencer partnerships and community engagement. Key goals include building brand awareness, driving online sales, and establishing long-term brand loyalty. Potential risks include market saturation and influencer authenticity concerns. Opportunities lie in growing demand for sustainable products and viral marketing potential.')
-        
-
-        frame = context.pages[-1]
-        # Click 'Confirm & Start' button to submit the deal and trigger analysis
-        elem = frame.locator('xpath=html/body/div/div/div/div/main/div[2]/div[2]/form/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Try to reload the main page or navigate back to the Pipeline dashboard to recover the previous state or report the issue.
-        await page.goto('http://localhost:3000/#/', timeout=10000)
-        await asyncio.sleep(3)
-        
-
-        # -> Click on 'New Deal' button to reopen the deal creation modal and input required fields for analysis.
-        frame = context.pages[-1]
-        # Click on 'New Deal' button to start creating a new deal
-        elem = frame.locator('xpath=html/body/div/div/div/aside/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Analysis Complete: Risks and Opportunities Identified').first).to_be_visible(timeout=1000)
-        except AssertionError:
-            raise AssertionError("Test case failed: The Brief Translator tool did not produce coherent and actionable risk and opportunity analysis as expected based on the provided brand brief input.")
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+        await expect(frame.locator('text=Analysis Complete: Risks and Opportunities Identified').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test case failed: The Brief Translator tool did not produce coherent and actionable risk and opportunity analysis as expected based on the provided brand brief input.")
+
+
+if __name__ == "__main__":
+    run_standalone(run_test)
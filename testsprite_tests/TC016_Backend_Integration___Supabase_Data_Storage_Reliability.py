@@ -1,139 +1,72 @@
-import asyncio
-from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
+from harness import actions
+from harness.runner import run_standalone
+from harness.session import authenticated
+
+
+@authenticated
+async def run_test(context):
+    # Open a new page in the browser context provided by the runner
+    page = await context.new_page()
+
+    # Open the deal board; the shared session is already in the context's storage state
+    await actions.goto(page, "/#/")
+
+    # Interact with the page elements to simulate user flow
+    # -> Click on 'New Deal' button to start creating a new deal.
+    frame = context.pages[-1]
+    # Click on 'New Deal' button to open deal creation form
+    elem = frame.locator('xpath=html/body/div/div/div/aside/div/div[2]/button[2]').nth(0)
+    await actions.click(page, elem)
+
+
+    # -> Try to reload the page to recover the dashboard and UI elements for CRUD testing.
+    await actions.goto(page, '/#/')
+
+
+    # -> Click on the 'New Deal' button (index 3) to open the deal creation form.
+    frame = context.pages[-1]
+    # Click on 'New Deal' button to open deal creation form
+    elem = frame.locator('xpath=html/body/div/div/div/aside/div/div[2]/button[2]').nth(0)
+    await actions.click(page, elem)
+
+
+    # -> Click on the 'New Deal' button (index 3) to open the deal creation modal.
+    frame = context.pages[-1]
+    # Click on 'New Deal' button to open deal creation modal
+    elem = frame.locator('xpath=html/body/div/div/div/aside/div/div[2]/button[2]').nth(0)
+    await actions.click(page, elem)
+
+
+    # -> Click on the 'New Deal' button (index 3) to open deal creation modal.
+    frame = context.pages[-1]
+    # Click on 'New Deal' button to open deal creation modal
+    elem = frame.locator('xpath=html/body/div/div/div/aside/div/div[2]/button[2]').nth(0)
+    await actions.click(page, elem)
+
+
+    # -> Click on the 'New Deal' button (index 3) to open deal creation modal.
+    frame = context.pages[-1]
+    # Click on 'New Deal' button to open deal creation modal
+    elem = frame.locator('xpath=html/body/div/div/div/aside/div/div[2]/button[2]').nth(0)
+    await actions.click(page, elem)
+
+
+    # -> Click on the 'New Deal' button (index 3) to open deal creation modal.
+    frame = context.pages[-1]
+    # Click on 'New Deal' button to open deal creation modal
+    elem = frame.locator('xpath=html/body/div/div/div/aside/div/div[2]/button[2]').nth(0)
+    await actions.click(page, elem)
+
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Click on 'Sign In' button to proceed to login.
-        frame = context.pages[-1]
-        # Click on 'Sign In' button to go to login page
-        elem = frame.locator('xpath=html/body/div/div/div/nav/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input email and password, then click 'Initialize Session' to log in.
-        frame = context.pages[-1]
-        # Input email for login
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('testsprite_user@creator.os')
-        
-
-        frame = context.pages[-1]
-        # Input password for login
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('TestPassword123!')
-        
-
-        frame = context.pages[-1]
-        # Click 'Initialize Session' to log in
-        elem = frame.locator('xpath=html/body/div/div/div/div[2]/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on 'New Deal' button to start creating a new deal.
-        frame = context.pages[-1]
-        # Click on 'New Deal' button to open deal creation form
-        elem = frame.locator('xpath=html/body/div/div/div/aside/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Try to reload the page to recover the dashboard and UI elements for CRUD testing.
-        await page.goto('http://localhost:3000/#/', timeout=10000)
-        await asyncio.sleep(3)
-        
-
-        # -> Click on the 'New Deal' button (index 3) to open the deal creation form.
-        frame = context.pages[-1]
-        # Click on 'New Deal' button to open deal creation form
-        elem = frame.locator('xpath=html/body/div/div/div/aside/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on the 'New Deal' button (index 3) to open the deal creation modal.
-        frame = context.pages[-1]
-        # Click on 'New Deal' button to open deal creation modal
-        elem = frame.locator('xpath=html/body/div/div/div/aside/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on the 'New Deal' button (index 3) to open deal creation modal.
-        frame = context.pages[-1]
-        # Click on 'New Deal' button to open deal creation modal
-        elem = frame.locator('xpath=html/body/div/div/div/aside/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on the 'New Deal' button (index 3) to open deal creation modal.
-        frame = context.pages[-1]
-        # Click on 'New Deal' button to open deal creation modal
-        elem = frame.locator('xpath=html/body/div/div/div/aside/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click on the 'New Deal' button (index 3) to open deal creation modal.
-        frame = context.pages[-1]
-        # Click on 'New Deal' button to open deal creation modal
-        elem = frame.locator('xpath=html/body/div/div/div/aside/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Unexpected Backend Success Message').first).to_be_visible(timeout=1000)
-        except AssertionError:
-            raise AssertionError("Test plan failed: CRUD operations for deals and user data did not complete successfully with proper success and failure handling as expected.")
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+        await expect(frame.locator('text=Unexpected Backend Success Message').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test plan failed: CRUD operations for deals and user data did not complete successfully with proper success and failure handling as expected.")
+
+
+if __name__ == "__main__":
+    run_standalone(run_test)
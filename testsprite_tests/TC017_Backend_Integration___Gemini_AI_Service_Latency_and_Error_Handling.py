@@ -1,66 +1,75 @@
-import asyncio
-from playwright import async_api
+import os
+
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
-    
-    try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
-        except async_api.Error:
-            pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # --> Assertions to verify final state
+from harness import actions
+from harness.ai_latency import AiLatencyProbe, load_budgets
+from harness.runner import load_config, run_standalone
+from harness.session import authenticated
+
+# Calls per action; raise it for a steadier p95.
+SAMPLES = int(os.environ.get("TESTSPRITE_AI_SAMPLES", "3"))
+
+SAMPLE_BRIEF = (
+    "We'd love a dedicated 60s TikTok for our spring hydration launch. Deliverables: one video "
+    "plus 3 story frames. Usage: paid social in perpetuity, exclusivity in the beverage "
+    "category for 6 months. Payment net-60 after posting."
+)
+
+
+@authenticated
+async def run_test(context):
+    # Record every ai-service call made from this context
+    probe = AiLatencyProbe(context)
+    budgets = load_budgets(load_config())
+
+    # The post-result feedback prompt is throttled for 30 minutes after the last one; keep it out of the way
+    await context.add_init_script("localStorage.setItem('last-feedback-time', String(Date.now()))")
+
+    # Open a new page in the browser context provided by the runner
+    page = await context.new_page()
+
+    # Open the deal board; the shared session is already in the context's storage state
+    await actions.goto(page, "/#/")
+
+    # -> Open the first deal on the board to reach the Rate Auditor and Brief Scanner.
+    frame = context.pages[-1]
+    elem = frame.locator('.glass-card.cursor-pointer').nth(0)
+    await actions.click(page, elem)
+    await expect(frame.locator('text=Rate Auditor').first).to_be_visible(timeout=10000)
+
+    # -> Run the rate check SAMPLES times.
+    for attempt in range(SAMPLES):
+        frame = context.pages[-1]
+        adjust = frame.locator('button:has-text("Adjust Metrics")')
+        if await adjust.count():
+            await actions.click(page, adjust.first)
+        await actions.fill(page, frame.locator('input[placeholder="50k"]'), str(50000 + attempt * 1000))
+        await actions.fill(page, frame.locator('input[placeholder="20k"]'), '20000')
+        await actions.fill(page, frame.locator('input[placeholder="3.5"]'), '3.5')
+        await actions.click(page, frame.locator('button[type=submit]:has-text("Calculate Rate")'))
+        await probe.wait_for('check-rate', attempt + 1)
+        # The app falls back to a local estimate when the call fails, so the result must always render
+        await expect(frame.locator('text=Recommended fee range').first).to_be_visible(timeout=10000)
+
+    # -> Scan the sample brief SAMPLES times, varied so each scan reaches
+    # ai-service instead of the app's cache of recent answers.
+    for attempt in range(SAMPLES):
         frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Gemini AI service responded successfully').first).to_be_visible(timeout=30000)
-        except AssertionError:
-            raise AssertionError("Test case failed: The app did not handle latency and errors from Gemini AI services for Brief Translator and Rate Checker correctly. Expected to see a success message from Gemini AI service, but it was not found, indicating potential crash or freeze under slow or failed AI responses.")
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+        rescan = frame.locator('button:has-text("Re-scan Brief")')
+        if await rescan.count():
+            await actions.click(page, rescan.first)
+        await actions.fill(page, frame.locator('textarea[placeholder^="Paste the brand email"]'), f"{SAMPLE_BRIEF} Ref #{attempt + 1}.")
+        await actions.click(page, frame.locator('button[type=submit]:has-text("Scan Brief")'))
+        await probe.wait_for('analyze-brief', attempt + 1)
+        await expect(frame.locator('text=Execution Checklist').first).to_be_visible(timeout=10000)
+
+    # --> Assertions to verify final state
+    probe.write(budgets)
+    problems = probe.violations(budgets)
+    if problems:
+        raise AssertionError("Test case failed: ai-service latency or errors out of budget: " + "; ".join(problems))
+
+
+if __name__ == "__main__":
+    run_standalone(run_test)
@@ -0,0 +1 @@
+"""Local execution harness for the TestSprite TC scripts."""
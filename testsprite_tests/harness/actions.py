@@ -0,0 +1,126 @@
+"""Readiness-driven actions for the TC scripts.
+
+The generated scripts slept a fixed 3 seconds before every click and fill.
+These helpers wait on real signals instead: no Supabase REST/auth/edge-function
+request in flight, and the DOM quiet for a short window. Playwright's own
+actionability checks (attached, visible, stable, enabled) then run as part of
+the click or fill itself.
+
+Settling is best effort: if the page never goes quiet (a polling request, an
+endless animation) the wait gives up after ``SETTLE_TIMEOUT_MS`` and the action
+proceeds under its normal timeout, so a busy page is never worse than before.
+
+Set ``TESTSPRITE_SLOW_MODE=1`` to bring back the fixed 3 second sleep before
+each step, e.g. while watching a ``--headed`` run.
+"""
+
+import asyncio
+import os
+import time
+import weakref
+
+SLOW_MODE = os.environ.get("TESTSPRITE_SLOW_MODE", "") not in ("", "0")
+SLOW_MODE_DELAY_MS = 3000
+
+# Requests that gate what the app renders next.
+BACKEND_PATHS = ("/rest/v1/", "/auth/v1/", "/functions/v1/")
+
+NETWORK_QUIET_MS = 250
+DOM_QUIET_MS = 120
+SETTLE_TIMEOUT_MS = 10000
+ACTION_TIMEOUT_MS = 5000
+
+# Resolves once no node/text/class change has happened for `quiet` ms, or after
+# `timeout` ms regardless. Inline style writes are ignored on purpose: framer-motion
+# animates through them continuously and they never change what is clickable.
+_DOM_STABLE_JS = """
+([quiet, timeout]) => new Promise(resolve => {
+  let timer;
+  const finish = () => { observer.disconnect(); clearTimeout(timer); clearTimeout(cap); resolve(); };
+  const observer = new MutationObserver(() => { clearTimeout(timer); timer = setTimeout(finish, quiet); });
+  observer.observe(document.documentElement, {
+    childList: true, subtree: true, characterData: true,
+    attributes: true, attributeFilter: ['class', 'disabled', 'hidden', 'aria-hidden', 'value'],
+  });
+  timer = setTimeout(finish, quiet);
+  const cap = setTimeout(finish, timeout);
+})
+"""
+
+
+def _is_backend(url):
+    return any(part in url for part in BACKEND_PATHS)
+
+
+class NetworkTracker:
+    """Counts in-flight backend requests for one browser context."""
+
+    def __init__(self, context):
+        self._inflight = set()
+        self._last_activity = time.monotonic()
+        context.on("request", self._on_request)
+        context.on("requestfinished", self._on_done)
+        context.on("requestfailed", self._on_done)
+
+    def _on_request(self, request):
+        if _is_backend(request.url):
+            self._inflight.add(request)
+            self._last_activity = time.monotonic()
+
+    def _on_done(self, request):
+        if request in self._inflight:
+            self._inflight.discard(request)
+            self._last_activity = time.monotonic()
+
+    async def wait_idle(self, quiet_ms=NETWORK_QUIET_MS, timeout_ms=SETTLE_TIMEOUT_MS):
+        deadline = time.monotonic() + timeout_ms / 1000
+        while time.monotonic() < deadline:
+            quiet_for = (time.monotonic() - self._last_activity) * 1000
+            if not self._inflight and quiet_for >= quiet_ms:
+                return True
+            await asyncio.sleep(0.05)
+        return False
+
+
+_trackers = weakref.WeakKeyDictionary()
+
+
+def install(context):
+    """Start tracking backend requests for ``context``.
+
+    The runner calls this as soon as it creates a context so requests fired
+    during the first navigation are counted too.
+    """
+    tracker = _trackers.get(context)
+    if tracker is None:
+        tracker = _trackers[context] = NetworkTracker(context)
+    return tracker
+
+
+async def settle(page, timeout_ms=SETTLE_TIMEOUT_MS):
+    """Wait until backend traffic and the DOM have both gone quiet."""
+    if SLOW_MODE:
+        await page.wait_for_timeout(SLOW_MODE_DELAY_MS)
+        return
+    await install(page.context).wait_idle(timeout_ms=timeout_ms)
+    try:
+        await page.evaluate(_DOM_STABLE_JS, [DOM_QUIET_MS, timeout_ms])
+    except Exception:
+        # Navigation tore down the execution context mid-wait; the next
+        # action's own auto-waiting covers the new document.
+        pass
+
+
+async def goto(page, url, timeout=10000):
+    await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+    await settle(page)
+
+
+async def click(page, locator, timeout=ACTION_TIMEOUT_MS):
+    await settle(page)
+    await locator.click(timeout=timeout)
+
+
+async def fill(page, locator, value, timeout=ACTION_TIMEOUT_MS):
+    await settle(page)
+    await locator.fill(value, timeout=timeout)
@@ -0,0 +1,181 @@
+"""Measure the ``ai-service`` edge function from the browser's side.
+
+``AiLatencyProbe`` listens to a context's network events and records one
+sample per ``functions/v1/ai-service`` call: the ``action`` from the request
+body, request-to-response time, request/response body sizes, the HTTP
+status and the function's ``X-Cache`` verdict. TC017 drives the Rate Auditor and Brief Scanner through it, checks the
+samples against p50/p95 budgets and writes them to ``tmp/ai_latency.json``
+next to ``test_results.json``.
+
+Budgets are milliseconds per action. Override them in ``tmp/config.json``::
+
+    "aiLatencyBudgets": {"check-rate": {"p50": 3000, "p95": 6000}}
+
+or for every action at once with ``TESTSPRITE_AI_P50_MS`` /
+``TESTSPRITE_AI_P95_MS``.
+"""
+
+import asyncio
+import json
+import math
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+SUITE_DIR = Path(__file__).resolve().parent.parent
+ARTIFACT_PATH = SUITE_DIR / "tmp" / "ai_latency.json"
+
+AI_SERVICE_PATH = "/functions/v1/ai-service"
+
+# Generous enough for a cold edge function plus a Groq completion.
+DEFAULT_BUDGETS = {
+    "check-rate": {"p50": 4000, "p95": 8000},
+    "analyze-brief": {"p50": 6000, "p95": 12000},
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values`` (``None`` when empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def load_budgets(config=None):
+    """Default budgets, overlaid with ``aiLatencyBudgets`` and the env vars."""
+    budgets = {action: dict(limits) for action, limits in DEFAULT_BUDGETS.items()}
+    for action, limits in ((config or {}).get("aiLatencyBudgets") or {}).items():
+        budgets.setdefault(action, {}).update(limits)
+    for key, env in (("p50", "TESTSPRITE_AI_P50_MS"), ("p95", "TESTSPRITE_AI_P95_MS")):
+        if os.environ.get(env):
+            for limits in budgets.values():
+                limits[key] = float(os.environ[env])
+    return budgets
+
+
+def _action_of(request):
+    try:
+        payload = request.post_data_json
+    except Exception:
+        return "unknown"
+    return (payload or {}).get("action") or "unknown"
+
+
+class AiLatencyProbe:
+    """Records every ``ai-service`` call made from one browser context."""
+
+    def __init__(self, context):
+        self.samples = []
+        self._started = {}
+        context.on("request", self._on_request)
+        context.on("requestfinished", self._on_finished)
+        context.on("requestfailed", self._on_failed)
+
+    def _matches(self, request):
+        # Skip the CORS preflight: it never reaches the model.
+        return AI_SERVICE_PATH in request.url and request.method == "POST"
+
+    def _on_request(self, request):
+        if self._matches(request):
+            self._started[request] = time.monotonic()
+
+    def _elapsed_ms(self, request):
+        started = self._started.pop(request, None)
+        # Prefer the browser's own timing; the event round trip adds noise.
+        timing = request.timing or {}
+        if timing.get("responseEnd", -1) > 0:
+            return round(timing["responseEnd"], 1)
+        if started is None:
+            return None
+        return round((time.monotonic() - started) * 1000, 1)
+
+    async def _on_finished(self, request):
+        if not self._matches(request):
+            return
+        elapsed = self._elapsed_ms(request)
+        response = await request.response()
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            sizes = {}
+        self.samples.append({
+            "action": _action_of(request),
+            "status": response.status if response else None,
+            "durationMs": elapsed,
+            "requestBytes": sizes.get("requestBodySize"),
+            "responseBytes": sizes.get("responseBodySize"),
+            "cache": response.headers.get("x-cache") if response else None,
+            "error": None,
+        })
+
+    def _on_failed(self, request):
+        if not self._matches(request):
+            return
+        self.samples.append({
+            "action": _action_of(request),
+            "status": None,
+            "durationMs": self._elapsed_ms(request),
+            "requestBytes": None,
+            "responseBytes": None,
+            "cache": None,
+            "error": request.failure or "request failed",
+        })
+
+    def count(self, action):
+        return sum(1 for s in self.samples if s["action"] == action)
+
+    async def wait_for(self, action, count, timeout_ms=30000):
+        """Block until ``count`` calls for ``action`` have been recorded."""
+        deadline = time.monotonic() + timeout_ms / 1000
+        while self.count(action) < count:
+            if time.monotonic() > deadline:
+                raise AssertionError(
+                    f"Expected {count} {action} call(s) to ai-service, saw {self.count(action)}")
+            await asyncio.sleep(0.05)
+
+    def summary(self):
+        """Per-action count, error and cache-hit counts and p50/p95/max duration."""
+        actions = {}
+        for sample in self.samples:
+            actions.setdefault(sample["action"], []).append(sample)
+        result = {}
+        for action, samples in sorted(actions.items()):
+            durations = [s["durationMs"] for s in samples if s["durationMs"] is not None]
+            result[action] = {
+                "count": len(samples),
+                "errors": sum(1 for s in samples if s["error"] or not 200 <= (s["status"] or 0) < 300),
+                "p50Ms": percentile(durations, 50),
+                "p95Ms": percentile(durations, 95),
+                "maxMs": max(durations) if durations else None,
+                "responseBytes": sum(s["responseBytes"] or 0 for s in samples),
+                "cacheHits": sum(1 for s in samples if s["cache"] == "HIT"),
+            }
+        return result
+
+    def violations(self, budgets):
+        """Human-readable budget and error breaches; empty when all is well."""
+        problems = []
+        for action, stats in self.summary().items():
+            if stats["errors"]:
+                problems.append(f"{action}: {stats['errors']}/{stats['count']} calls failed")
+            for key in ("p50", "p95"):
+                limit = budgets.get(action, {}).get(key)
+                observed = stats[f"{key}Ms"]
+                if limit is not None and observed is not None and observed > limit:
+                    problems.append(f"{action}: {key} {observed:.0f}ms exceeds the {limit:.0f}ms budget")
+        return problems
+
+    def write(self, budgets, path=ARTIFACT_PATH):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({
+                "generated": datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+                "budgets": budgets,
+                "summary": self.summary(),
+                "samples": self.samples,
+            }, fh, indent=2)
+        return path
@@ -0,0 +1,297 @@
+"""Run the TC scripts against one shared Chromium.
+
+Every ``TCxxx_*.py`` script exposes ``async def run_test(context)``. The
+runner launches a single browser for the whole process, gives each test case
+its own isolated ``BrowserContext`` and runs up to ``--concurrency`` cases at
+once. Results are written in the same shape as ``tmp/test_results.json``.
+
+Cases decorated with ``@authenticated`` share one Supabase session: the runner
+logs in once up front (see ``harness.session``) and every such context starts
+from the saved storage state.
+
+With ``--offline`` every context talks to ``harness.stub_backend`` instead of
+the hosted Supabase project and the Groq-backed ``ai-service`` function.
+
+Usage (from ``testsprite_tests/``)::
+
+    python -m harness.runner                  # whole suite
+    python -m harness.runner TC003 TC011 -c 2 # selected cases
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import sys
+import time
+import traceback
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+
+from harness import actions, session, stub_backend
+
+SUITE_DIR = Path(__file__).resolve().parent.parent
+CONFIG_PATH = SUITE_DIR / "tmp" / "config.json"
+PLAN_PATH = SUITE_DIR / "testsprite_frontend_test_plan.json"
+DEFAULT_OUTPUT = SUITE_DIR / "tmp" / "local_test_results.json"
+DURATIONS_PATH = SUITE_DIR / "tmp" / "durations.json"
+
+DEFAULT_ENDPOINT = "http://localhost:3000"
+DEFAULT_TIMEOUT_MS = 5000
+
+# Same flags the generated scripts used, minus --single-process: a browser that
+# hosts several contexts at once must keep its renderers in separate processes.
+BROWSER_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+    "--ipc=host",
+]
+
+
+@dataclass
+class TestCase:
+    id: str
+    title: str
+    description: str
+    path: Path
+    run_test: object = field(default=None, repr=False)
+
+    def load(self):
+        """Import the script and return its ``run_test`` coroutine function."""
+        if self.run_test is None:
+            spec = importlib.util.spec_from_file_location(self.path.stem, self.path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            self.run_test = module.run_test
+        return self.run_test
+
+
+def load_config():
+    if not CONFIG_PATH.exists():
+        return {}
+    with open(CONFIG_PATH, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def discover(ids=None):
+    """Return the TC scripts in suite order, optionally filtered by id."""
+    with open(PLAN_PATH, encoding="utf-8") as fh:
+        plan = {entry["id"]: entry for entry in json.load(fh)}
+
+    wanted = {i.upper() for i in ids} if ids else None
+    cases = []
+    for path in sorted(SUITE_DIR.glob("TC[0-9][0-9][0-9]_*.py")):
+        case_id = path.name.split("_", 1)[0]
+        if wanted is not None and case_id not in wanted:
+            continue
+        entry = plan.get(case_id, {})
+        title = entry.get("title") or path.stem.split("_", 1)[1].replace("_", " ")
+        cases.append(TestCase(
+            id=case_id,
+            title=f"{case_id}-{title}",
+            description=entry.get("description", ""),
+            path=path,
+        ))
+    return cases
+
+
+def _timestamp():
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _result(case, status, error, started, finished):
+    """Build one entry in the ``tmp/test_results.json`` shape."""
+    return {
+        "projectId": None,
+        "testId": case.id,
+        "userId": None,
+        "title": case.title,
+        "description": case.description,
+        "code": case.path.read_text(encoding="utf-8"),
+        "testStatus": status,
+        "testError": error,
+        "testType": "FRONTEND",
+        "createFrom": "local",
+        "testVisualization": None,
+        "created": started,
+        "modified": finished,
+    }
+
+
+async def new_context(browser, base_url, storage_state=None, backend=None):
+    context = await browser.new_context(base_url=base_url, storage_state=storage_state)
+    context.set_default_timeout(DEFAULT_TIMEOUT_MS)
+    actions.install(context)
+    if backend is not None:
+        await backend.install(context)
+    return context
+
+
+async def run_case(browser, case, base_url, semaphore, storage_state=None, backend=None):
+    async with semaphore:
+        started = _timestamp()
+        clock = time.monotonic()
+        context = None
+        try:
+            run_test = case.load()
+            state = None
+            if session.uses_session(run_test):
+                if isinstance(storage_state, Exception):
+                    raise storage_state
+                state = str(storage_state)
+            context = await new_context(browser, base_url, storage_state=state, backend=backend)
+            await run_test(context)
+            status, error = "PASSED", ""
+        except Exception as exc:
+            status = "FAILED"
+            error = str(exc) or traceback.format_exc()
+        finally:
+            if context:
+                await context.close()
+        elapsed = time.monotonic() - clock
+        print(f"[{status}] {case.title} ({elapsed:.1f}s)", flush=True)
+        return _result(case, status, error, started, _timestamp())
+
+
+async def run_suite(cases, concurrency=4, base_url=None, headless=True,
+                    storage_state_path=session.STORAGE_STATE_PATH, offline=False):
+    """Run ``cases`` in one browser, ``concurrency`` contexts at a time."""
+    config = load_config()
+    backend = stub_backend.from_config(config) if offline else None
+    base_url = base_url or config.get("localEndpoint", DEFAULT_ENDPOINT)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=headless, args=BROWSER_ARGS)
+        try:
+            storage_state = None
+            if any(_needs_session(case) for case in cases):
+                try:
+                    storage_state = await session.bootstrap(
+                        browser, base_url, config, path=storage_state_path, backend=backend)
+                except Exception as exc:
+                    # Fail the dependent cases with the login error rather than
+                    # letting each one time out on its own.
+                    storage_state = exc
+            return await asyncio.gather(*(
+                run_case(browser, case, base_url, semaphore, storage_state, backend) for case in cases
+            ))
+        finally:
+            await browser.close()
+
+
+def _needs_session(case):
+    try:
+        return session.uses_session(case.load())
+    except Exception:
+        # Import errors are reported by run_case.
+        return False
+
+
+def _parse_timestamp(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def load_durations():
+    if not DURATIONS_PATH.exists():
+        return {}
+    with open(DURATIONS_PATH, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def record_durations(results, smoothing=0.5):
+    """Fold this run's per-case wall time into ``tmp/durations.json``.
+
+    Stored values are an exponential moving average in seconds, so one slow
+    outlier run nudges the history instead of replacing it. The sharded
+    runner balances shards with these numbers.
+    """
+    durations = load_durations()
+    for result in results:
+        elapsed = (_parse_timestamp(result["modified"]) - _parse_timestamp(result["created"])).total_seconds()
+        previous = durations.get(result["testId"])
+        if previous is None:
+            durations[result["testId"]] = round(elapsed, 2)
+        else:
+            durations[result["testId"]] = round(smoothing * elapsed + (1 - smoothing) * previous, 2)
+    DURATIONS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(DURATIONS_PATH, "w", encoding="utf-8") as fh:
+        json.dump(dict(sorted(durations.items())), fh, indent=2)
+    return durations
+
+
+def write_results(results, output):
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as fh:
+        json.dump(results, fh, indent=2)
+
+
+def run_standalone(run_test):
+    """Entry point for running a single TC script directly.
+
+    Pass ``--offline`` on the script's command line to use the stub backend.
+    """
+    offline = "--offline" in sys.argv[1:]
+
+    async def main():
+        config = load_config()
+        base_url = config.get("localEndpoint", DEFAULT_ENDPOINT)
+        backend = stub_backend.from_config(config) if offline else None
+        async with async_playwright() as pw:
+            browser = await pw.chromium.launch(headless=True, args=BROWSER_ARGS)
+            state = None
+            if session.uses_session(run_test):
+                state = str(await session.bootstrap(browser, base_url, config, backend=backend))
+            context = await new_context(browser, base_url, storage_state=state, backend=backend)
+            try:
+                await run_test(context)
+            finally:
+                await context.close()
+                await browser.close()
+
+    asyncio.run(main())
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the TestSprite TC suite locally.")
+    parser.add_argument("ids", nargs="*", help="test case ids to run, e.g. TC003 (default: all)")
+    parser.add_argument("-c", "--concurrency", type=int, default=4,
+                        help="number of test cases to run at once (default: 4)")
+    parser.add_argument("--base-url", help="app URL (default: localEndpoint from tmp/config.json)")
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    parser.add_argument("--offline", action="store_true",
+                        help="serve Supabase and ai-service from harness.stub_backend")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_OUTPUT),
+                        help="where to write the results JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cases = discover(args.ids)
+    if not cases:
+        print("No matching test cases.", file=sys.stderr)
+        return 2
+
+    clock = time.monotonic()
+    results = asyncio.run(run_suite(
+        cases,
+        concurrency=args.concurrency,
+        base_url=args.base_url,
+        headless=not args.headed,
+        offline=args.offline,
+    ))
+    write_results(results, args.output)
+    record_durations(results)
+
+    failed = sum(1 for r in results if r["testStatus"] != "PASSED")
+    print(f"{len(results) - failed}/{len(results)} passed in "
+          f"{time.monotonic() - clock:.1f}s -> {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Log in once per run and share the Supabase session across contexts.
+
+supabase-js keeps its session in ``localStorage`` under ``sb-<ref>-auth-token``,
+so a Playwright ``storage_state`` captured right after one real login is enough
+for every later context to open ``#/`` already authenticated.
+
+Scripts opt in with the ``@authenticated`` decorator. TC001/TC002 exercise the
+login form itself and TC005 checks the public landing page, so they keep
+starting from a fresh, signed-out context.
+
+The access token lives for an hour and each run bootstraps a new one, so the
+contexts never race each other to rotate the shared refresh token.
+"""
+
+from pathlib import Path
+
+from harness import actions
+
+SUITE_DIR = Path(__file__).resolve().parent.parent
+STORAGE_STATE_PATH = SUITE_DIR / "tmp" / "storage_state.json"
+
+DEFAULT_LOGIN_USER = "testsprite_user@creator.os"
+DEFAULT_LOGIN_PASSWORD = "TestPassword123!"
+LOGIN_TIMEOUT_MS = 20000
+
+_HAS_SESSION_JS = """
+() => Object.keys(localStorage).some(k => k.startsWith('sb-') && k.endsWith('-auth-token'))
+"""
+
+
+class SessionBootstrapError(RuntimeError):
+    """Raised when the one-off login cannot produce a session."""
+
+
+def authenticated(run_test):
+    """Mark a TC ``run_test`` as needing the shared signed-in session."""
+    run_test.uses_session = True
+    return run_test
+
+
+def uses_session(run_test):
+    return getattr(run_test, "uses_session", False)
+
+
+async def bootstrap(browser, base_url, config=None, path=STORAGE_STATE_PATH, backend=None):
+    """Sign in through the real login form and save the storage state.
+
+    Returns the path of the saved state, ready to pass as ``storage_state``
+    to ``browser.new_context``. With a ``backend`` (``harness.stub_backend``)
+    the login is answered by the stand-in instead of the hosted project.
+    """
+    config = config or {}
+    email = config.get("loginUser", DEFAULT_LOGIN_USER)
+    password = config.get("loginPassword", DEFAULT_LOGIN_PASSWORD)
+
+    context = await browser.new_context(base_url=base_url)
+    actions.install(context)
+    if backend is not None:
+        await backend.install(context)
+    try:
+        page = await context.new_page()
+        await actions.goto(page, "/#/login")
+        await page.locator("#email").fill(email)
+        await page.locator("#password").fill(password)
+        await page.locator("form button[type=submit]").click()
+        try:
+            await page.wait_for_function(_HAS_SESSION_JS, timeout=LOGIN_TIMEOUT_MS)
+        except Exception as exc:
+            raise SessionBootstrapError(
+                f"Login as {email} did not produce a Supabase session: {exc}"
+            ) from exc
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        await context.storage_state(path=str(path))
+        return path
+    finally:
+        await context.close()
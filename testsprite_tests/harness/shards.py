@@ -0,0 +1,179 @@
+"""Shard the TC suite across a process pool and merge the results.
+
+Each shard is a separate process with its own Chromium (and its own
+session bootstrap), running its cases through ``harness.runner``. Shards are
+balanced by the per-case durations the runner records in
+``tmp/durations.json`` (longest-processing-time first), so no single shard
+ends up as the long tail.
+
+By default every shard targets ``localEndpoint`` from ``tmp/config.json``.
+With ``--server-per-shard`` each shard starts its own Vite dev server on
+``--base-port + shard index`` instead, which keeps one slow HMR/transform
+pipeline from stalling the others.
+
+Usage (from ``testsprite_tests/``)::
+
+    python -m harness.shards --shards 4 -c 2
+    python -m harness.shards --shards 3 --server-per-shard --base-port 3100
+"""
+
+import argparse
+import asyncio
+import heapq
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from statistics import median
+
+from harness import runner
+
+REPO_DIR = runner.SUITE_DIR.parent
+
+# Used for cases that have never run when there is no history at all.
+DEFAULT_DURATION = 30.0
+SERVER_START_TIMEOUT = 90
+
+
+def plan_shards(cases, shard_count, durations):
+    """Split ``cases`` into ``shard_count`` lists with similar total duration.
+
+    Greedy longest-processing-time: hand the longest remaining case to the
+    shard with the least work so far. Cases without history are assumed to
+    take the median of the known ones.
+    """
+    shard_count = max(1, min(shard_count, len(cases)))
+    known = [durations[c.id] for c in cases if c.id in durations]
+    fallback = median(known) if known else DEFAULT_DURATION
+
+    ordered = sorted(cases, key=lambda c: durations.get(c.id, fallback), reverse=True)
+    heap = [(0.0, index) for index in range(shard_count)]
+    shards = [[] for _ in range(shard_count)]
+    for case in ordered:
+        load, index = heapq.heappop(heap)
+        shards[index].append(case)
+        heapq.heappush(heap, (load + durations.get(case.id, fallback), index))
+    for shard in shards:
+        shard.sort(key=lambda c: c.id)
+    return shards
+
+
+def _wait_for_port(port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.25)
+    raise TimeoutError(f"dev server on port {port} did not start within {timeout}s")
+
+
+def start_dev_server(port):
+    """Start ``vite`` on ``port`` and block until it accepts connections."""
+    process = subprocess.Popen(
+        ["npm", "run", "dev", "--", "--port", str(port), "--strictPort"],
+        cwd=REPO_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for_port(port, SERVER_START_TIMEOUT)
+    except Exception:
+        process.terminate()
+        raise
+    return process
+
+
+def run_shard(index, case_ids, base_url, port, concurrency, headless, offline=False):
+    """Process-pool entry point: run one shard and return its results."""
+    server = start_dev_server(port) if port else None
+    try:
+        if port:
+            base_url = f"http://localhost:{port}"
+        cases = runner.discover(case_ids)
+        return asyncio.run(runner.run_suite(
+            cases,
+            concurrency=concurrency,
+            base_url=base_url,
+            headless=headless,
+            storage_state_path=runner.SUITE_DIR / "tmp" / f"storage_state.shard{index}.json",
+            offline=offline,
+        ))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+
+def merge_results(shard_results):
+    """Flatten per-shard results back into suite order."""
+    merged = [result for results in shard_results for result in results]
+    return sorted(merged, key=lambda r: r["testId"])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the TestSprite TC suite sharded across processes.")
+    parser.add_argument("ids", nargs="*", help="test case ids to run, e.g. TC003 (default: all)")
+    parser.add_argument("-n", "--shards", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="number of shard processes (default: half the CPU count)")
+    parser.add_argument("-c", "--concurrency", type=int, default=2,
+                        help="test cases to run at once inside each shard (default: 2)")
+    parser.add_argument("--base-url", help="app URL shared by all shards (default: localEndpoint)")
+    parser.add_argument("--server-per-shard", action="store_true",
+                        help="start a dedicated Vite dev server for every shard")
+    parser.add_argument("--base-port", type=int, default=3100,
+                        help="first dev-server port with --server-per-shard (default: 3100)")
+    parser.add_argument("--headed", action="store_true", help="show the browser windows")
+    parser.add_argument("--offline", action="store_true",
+                        help="give every shard its own harness.stub_backend")
+    parser.add_argument("-o", "--output", default=str(runner.DEFAULT_OUTPUT),
+                        help="where to write the merged results JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cases = runner.discover(args.ids)
+    if not cases:
+        print("No matching test cases.", file=sys.stderr)
+        return 2
+
+    base_url = args.base_url or runner.load_config().get("localEndpoint", runner.DEFAULT_ENDPOINT)
+    shards = plan_shards(cases, args.shards, runner.load_durations())
+    for index, shard in enumerate(shards):
+        print(f"shard {index}: {' '.join(c.id for c in shard)}")
+
+    clock = time.monotonic()
+    # spawn, not fork: each shard owns an asyncio loop and a Playwright driver.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(shards), mp_context=context) as pool:
+        futures = [
+            pool.submit(
+                run_shard,
+                index,
+                [c.id for c in shard],
+                base_url,
+                args.base_port + index if args.server_per_shard else None,
+                args.concurrency,
+                not args.headed,
+                args.offline,
+            )
+            for index, shard in enumerate(shards)
+        ]
+        results = merge_results(f.result() for f in futures)
+
+    runner.write_results(results, args.output)
+    runner.record_durations(results)
+
+    failed = sum(1 for r in results if r["testStatus"] != "PASSED")
+    print(f"{len(results) - failed}/{len(results)} passed across {len(shards)} shards in "
+          f"{time.monotonic() - clock:.1f}s -> {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,683 @@
+"""In-memory stand-in for the Supabase project and the ``ai-service`` function.
+
+Implements the subset of GoTrue, PostgREST and Edge Functions that
+``lib/api.ts`` and ``services/geminiService.ts`` actually use:
+
+* ``/auth/v1/token`` (password + refresh_token grants), ``/auth/v1/user``,
+  ``/auth/v1/logout`` and ``/auth/v1/signup``
+* ``/rest/v1/deals``, ``/rest/v1/timeline_events``, ``/rest/v1/user_feedback``
+  and ``/rest/v1/notifications`` (empty unless a test calls
+  ``add_follow_up_digest``; the owner may PATCH ``read_at``)
+  with ``select``/``order``/``limit``, the ``eq``/``neq``/``lt``/``lte``/
+  ``gt``/``gte``/``in``/``is`` filters and ``or``/``and`` groups,
+  ``timeline_events(*)`` embedded in ``deals`` (with ``timeline_events.order``),
+  and row ownership enforced like the RLS policies in ``supabase-schema.sql``
+* ``/rest/v1/rpc/create_deal_with_event`` and ``/rest/v1/rpc/import_deals``
+* ``/functions/v1/ai-service`` with canned ``check-rate`` and
+  ``analyze-brief`` answers, reporting ``X-Cache: MISS`` the first time an
+  input is seen and ``HIT`` after that, like the real response cache; with
+  ``"stream": true`` the answer comes back as NDJSON field events
+* ``/realtime/v1`` sockets accepted but never answered, so the app's change
+  feed stays idle (in-process routing only)
+
+The backend can be wired in two ways. ``await backend.install(context)`` routes
+a Playwright context's Supabase traffic to it in-process, whatever project URL
+the app was built with; ``python -m harness.stub_backend`` serves it over HTTP
+for a dev server started with ``VITE_SUPABASE_URL=http://localhost:54321``.
+Either way the suite runs offline with deterministic data and millisecond
+backend latency. ``python -m harness.stub_backend --self-check`` exercises the
+requests no TC script reaches (such as marking the digest read) and exits.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+DEFAULT_PORT = 54321
+
+# Embeddable child tables and their foreign key to the parent row's id.
+EMBEDS = {("deals", "timeline_events"): "deal_id"}
+ROUTE_PATTERN = re.compile(r"^https?://[^/]+/(auth|rest|functions)/v1/")
+REALTIME_PATTERN = re.compile(r"^wss?://[^/]+/realtime/v1/")
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, PATCH, DELETE, OPTIONS",
+    "Access-Control-Allow-Headers": (
+        "authorization, x-client-info, apikey, content-type, prefer, "
+        "accept-profile, content-profile, x-supabase-api-version, range"
+    ),
+    "Access-Control-Expose-Headers": "content-range, x-cache",
+}
+
+CANNED_RATE_CHECK = {
+    "suggestedLow": 1200,
+    "suggestedHigh": 1800,
+    "confidenceScore": 82,
+    "explanation": "Stub estimate: mid-tier CPM for the deliverable with a 20% usage-rights uplift.",
+    "suggestedReply": "Thanks for reaching out! For this scope my rate is $1,500. Happy to chat details.",
+}
+
+CANNED_BRIEF_ANALYSIS = {
+    "summary": "Stub analysis: one sponsored video plus two stories, paid on delivery.",
+    "redFlags": ["Perpetual Usage: The brand could reuse your content forever without paying again."],
+    "checklist": ["Film product unboxing", "Post story on launch day", "Send draft for approval"],
+    "questionsToAsk": [
+        "Can usage rights be limited to 30 days?",
+        "What are the payment terms?",
+        "How many revision rounds are included?",
+    ],
+}
+
+
+class StubError(Exception):
+    def __init__(self, status, message, code=None):
+        super().__init__(message)
+        self.status = status
+        self.code = code or str(status)
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _iso(moment):
+    return moment.isoformat()
+
+
+def _b64url(data):
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+
+def _fake_jwt(claims):
+    """An unsigned JWT: nothing verifies it, but supabase-js can decode it."""
+    return f"{_b64url({'alg': 'HS256', 'typ': 'JWT'})}.{_b64url(claims)}.stub"
+
+
+def _coerce(raw, sample):
+    if raw == "null":
+        return None
+    if isinstance(sample, bool):
+        return raw == "true"
+    if isinstance(sample, (int, float)):
+        return float(raw)
+    return raw
+
+
+def _matches(row, column, expression):
+    op, _, raw = expression.partition(".")
+    value = row.get(column)
+    if op == "is":
+        return value is None if raw == "null" else value is (raw == "true")
+    if op == "in":
+        options = [o.strip().strip('"') for o in raw.strip("()").split(",") if o.strip()]
+        return str(value) in options
+    if value is None:
+        return False
+    target = _coerce(raw, value)
+    if op == "eq":
+        return value == target
+    if op == "neq":
+        return value != target
+    if op == "lt":
+        return value < target
+    if op == "lte":
+        return value <= target
+    if op == "gt":
+        return value > target
+    if op == "gte":
+        return value >= target
+    raise StubError(400, f"unsupported filter operator: {op}", "PGRST100")
+
+
+def _split_top(expr):
+    """Split ``a,and(b,c),d`` on the commas outside parentheses and quotes."""
+    parts, depth, quoted, current = [], 0, False, ""
+    for char in expr:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and char == "," and depth == 0:
+            parts.append(current)
+            current = ""
+            continue
+        current += char
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _matches_logic(row, operator, expr):
+    """Evaluate an ``or=(...)``/``and(...)`` group from a PostgREST query."""
+    results = []
+    for term in _split_top(expr.strip()[1:-1]):
+        nested = re.match(r"^(and|or)(\(.*\))$", term)
+        if nested:
+            results.append(_matches_logic(row, nested.group(1), nested.group(2)))
+        else:
+            column, _, condition = term.partition(".")
+            op, _, raw = condition.partition(".")
+            value = raw.strip('"')
+            results.append(_matches(row, column, f"{op}.{value}"))
+    return any(results) if operator == "or" else all(results)
+
+
+def _filter(row, column, expression):
+    if column in ("or", "and"):
+        return _matches_logic(row, column, expression)
+    return _matches(row, column, expression)
+
+
+class StubBackend:
+    """Thread-safe in-memory Supabase project for one test run."""
+
+    TABLES = ("deals", "timeline_events", "user_feedback", "notifications")
+
+    def __init__(self, email, password, seed=True, ai_latency_ms=0):
+        self.ai_latency_ms = ai_latency_ms
+        self._lock = threading.RLock()
+        self._users = {}
+        self._sessions = {}
+        self._tables = {name: [] for name in self.TABLES}
+        self._ai_cache = set()
+        user = self.add_user(email, password)
+        if seed:
+            self._seed(user["id"])
+
+    # ---------------------------------------------------------------- data
+
+    def add_user(self, email, password):
+        user = {
+            "id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"creator-os-stub:{email}")),
+            "aud": "authenticated",
+            "role": "authenticated",
+            "email": email,
+            "email_confirmed_at": _iso(_now()),
+            "app_metadata": {"provider": "email", "providers": ["email"]},
+            "user_metadata": {},
+            "identities": [{"provider": "email", "identity_data": {"email": email}}],
+            "created_at": _iso(_now()),
+            "updated_at": _iso(_now()),
+        }
+        with self._lock:
+            self._users[email] = (password, user)
+        return user
+
+    def add_follow_up_digest(self, email, deals):
+        """Give ``email`` an unread follow-up digest listing ``deals`` (``BrandDeal``-shaped dicts)."""
+        user_id = self._users[email][1]["id"]
+        row = self._defaults("notifications", user_id)
+        row.update(kind="follow_up_digest", payload={"count": len(deals), "deals": list(deals)})
+        with self._lock:
+            self._tables["notifications"] = [
+                r for r in self._tables["notifications"]
+                if (r["user_id"], r.get("kind")) != (user_id, "follow_up_digest")
+            ]
+            self._tables["notifications"].append(row)
+        return row
+
+    def _seed(self, user_id):
+        now = _now()
+        seeds = [
+            ("Bloom Nutrition", "TikTok", "sarah@bloom.com", "Replied", None, -2, 1, 3, 1,
+             "They liked the initial concept. Waiting on budget approval."),
+            ("NordVPN", "YouTube", "marketing@nordvpn.com", "Negotiating", 2500, 0, 3, 7, 2,
+             "Trying to get them to drop the 6 month exclusivity clause."),
+            ("GymShark", "Instagram", "partnerships@gymshark.com", "Discovery", None, 0, -1, 7, 0, ""),
+        ]
+        for offset, (brand, platform, contact, status, value, contacted, follow_up, interval, count, notes) in enumerate(seeds):
+            created = now - timedelta(days=10 - offset)
+            deal = {
+                "id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"creator-os-stub:deal:{brand}")),
+                "user_id": user_id,
+                "brand_name": brand,
+                "platform": platform,
+                "contact": contact,
+                "status": status,
+                "deal_value": value,
+                "last_contacted_at": _iso(now + timedelta(days=contacted)),
+                "next_follow_up_at": _iso(now + timedelta(days=follow_up)),
+                "follow_up_interval_days": interval,
+                "follow_up_count": count,
+                "notes": notes or None,
+                "rate_check": None,
+                "brief_analysis": None,
+                "created_at": _iso(created),
+                "updated_at": _iso(created),
+            }
+            self._tables["deals"].append(deal)
+            self._tables["timeline_events"].append({
+                "id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"creator-os-stub:event:{brand}")),
+                "deal_id": deal["id"],
+                "user_id": user_id,
+                "type": "status_change",
+                "description": "Deal Created",
+                "metadata": None,
+                "created_at": _iso(created),
+            })
+
+    def _defaults(self, table, user_id):
+        now = _iso(_now())
+        row = {"id": str(uuid.uuid4()), "created_at": now}
+        if table == "deals":
+            row.update(user_id=user_id, updated_at=now, follow_up_interval_days=7, follow_up_count=0,
+                       contact=None, deal_value=None, notes=None, rate_check=None, brief_analysis=None)
+        elif table == "timeline_events":
+            row.update(user_id=user_id, metadata=None)
+        elif table == "user_feedback":
+            row.update(user_id=user_id, comment=None)
+        elif table == "notifications":
+            row.update(user_id=user_id, read_at=None)
+        return row
+
+    def _owned_deal_ids(self, user_id):
+        return {d["id"] for d in self._tables["deals"] if d["user_id"] == user_id}
+
+    def _visible(self, table, user_id):
+        """Rows the user may see, mirroring the RLS policies."""
+        rows = self._tables[table]
+        if table == "deals":
+            return [r for r in rows if r["user_id"] == user_id]
+        if table == "timeline_events":
+            owned = self._owned_deal_ids(user_id)
+            return [r for r in rows if r["deal_id"] in owned]
+        return [r for r in rows if r["user_id"] == user_id]
+
+    def _check_insert(self, table, row, user_id):
+        if table == "timeline_events":
+            allowed = row.get("deal_id") in self._owned_deal_ids(user_id)
+        else:
+            allowed = row.get("user_id") == user_id
+        if not allowed:
+            raise StubError(403, f'new row violates row-level security policy for table "{table}"', "42501")
+
+    # ---------------------------------------------------------------- http
+
+    def handle(self, method, url, headers, body):
+        """Answer one request; returns ``(status, headers, body_bytes)``."""
+        headers = {k.lower(): v for k, v in headers.items()}
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        if method == "OPTIONS":
+            return 204, dict(CORS_HEADERS), b""
+        try:
+            payload = json.loads(body) if body else None
+            with self._lock:
+                status, extra, data = self._dispatch(method, parts.path, query, headers, payload)
+        except StubError as exc:
+            status, extra, data = exc.status, {}, {"code": exc.code, "message": str(exc), "msg": str(exc)}
+        except json.JSONDecodeError as exc:
+            status, extra, data = 400, {}, {"code": "PGRST102", "message": f"invalid JSON body: {exc}"}
+
+        out = dict(CORS_HEADERS)
+        out.update(extra)
+        if data is None:
+            return status, out, b""
+        if isinstance(data, bytes):
+            return status, out, data
+        out.setdefault("Content-Type", "application/json")
+        return status, out, json.dumps(data).encode()
+
+    def _dispatch(self, method, path, query, headers, payload):
+        if path.startswith("/auth/v1/"):
+            return self._auth(method, path[len("/auth/v1/"):], dict(query), headers, payload)
+        if path.startswith("/functions/v1/"):
+            return self._function(path[len("/functions/v1/"):], headers, payload)
+        if path.startswith("/rest/v1/"):
+            return self._rest(method, path[len("/rest/v1/"):], query, headers, payload)
+        raise StubError(404, f"no stub for {path}")
+
+    def _user_for(self, headers):
+        token = headers.get("authorization", "").removeprefix("Bearer ").strip()
+        user_id = self._sessions.get(token)
+        if user_id is None:
+            raise StubError(401, "JWT expired or invalid", "PGRST301")
+        return user_id
+
+    def _session(self, user):
+        expires_at = int(time.time()) + 3600
+        access_token = _fake_jwt({
+            "sub": user["id"], "email": user["email"], "role": "authenticated",
+            "aud": "authenticated", "exp": expires_at, "session_id": str(uuid.uuid4()),
+        })
+        self._sessions[access_token] = user["id"]
+        refresh_token = uuid.uuid4().hex
+        self._sessions[refresh_token] = user["id"]
+        return {
+            "access_token": access_token,
+            "token_type": "bearer",
+            "expires_in": 3600,
+            "expires_at": expires_at,
+            "refresh_token": refresh_token,
+            "user": user,
+        }
+
+    def _user_by_id(self, user_id):
+        return next(user for _, user in self._users.values() if user["id"] == user_id)
+
+    def _auth(self, method, route, query, headers, payload):
+        payload = payload or {}
+        if route == "token" and query.get("grant_type") == "password":
+            password, user = self._users.get(payload.get("email", ""), (None, None))
+            if user is None or password != payload.get("password"):
+                raise StubError(400, "Invalid login credentials", "invalid_credentials")
+            return 200, {}, self._session(user)
+        if route == "token" and query.get("grant_type") == "refresh_token":
+            user_id = self._sessions.pop(payload.get("refresh_token", ""), None)
+            if user_id is None:
+                raise StubError(400, "Invalid Refresh Token", "refresh_token_not_found")
+            return 200, {}, self._session(self._user_by_id(user_id))
+        if route == "signup":
+            email = payload.get("email", "")
+            if email in self._users:
+                _, user = self._users[email]
+                return 200, {}, dict(user, identities=[])
+            return 200, {}, self._session(self.add_user(email, payload.get("password", "")))
+        if route == "user":
+            return 200, {}, self._user_by_id(self._user_for(headers))
+        if route == "logout":
+            token = headers.get("authorization", "").removeprefix("Bearer ").strip()
+            self._sessions.pop(token, None)
+            return 204, {}, None
+        raise StubError(404, f"no auth stub for {method} /auth/v1/{route}")
+
+    def _function(self, name, headers, payload):
+        self._user_for(headers)
+        if name != "ai-service":
+            raise StubError(404, f"Function not found: {name}")
+        action = (payload or {}).get("action")
+        if action == "check-rate":
+            result = CANNED_RATE_CHECK
+        elif action == "analyze-brief":
+            result = CANNED_BRIEF_ANALYSIS
+        else:
+            raise StubError(400, "Invalid action")
+        key = json.dumps([action, (payload or {}).get("data")], sort_keys=True)
+        cache = "HIT" if key in self._ai_cache else "MISS"
+        self._ai_cache.add(key)
+        if (payload or {}).get("stream"):
+            events = [{"field": field, "value": value} for field, value in result.items()]
+            events.append({"done": True, "result": dict(result)})
+            body = "".join(json.dumps(event) + "\n" for event in events).encode()
+            return 200, {"X-Cache": cache, "Content-Type": "application/x-ndjson"}, body
+        return 200, {"X-Cache": cache}, dict(result)
+
+    def _rpc(self, name, headers, payload):
+        user_id = self._user_for(headers)
+        if name == "import_deals":
+            return self._import_deals(user_id, payload)
+        if name != "create_deal_with_event":
+            raise StubError(404, f"Could not find the function public.{name}", "PGRST202")
+        deal = self._defaults("deals", user_id)
+        deal.update(payload.get("deal") or {})
+        # Like auth.uid() in the SQL function, whatever the client sent
+        deal["user_id"] = user_id
+        event = self._defaults("timeline_events", user_id)
+        event.update(deal_id=deal["id"], type="status_change",
+                     description=payload.get("event_description") or "Deal Created")
+        self._tables["deals"].append(deal)
+        self._tables["timeline_events"].append(event)
+        return 200, {}, {"deal": dict(deal), "event": dict(event)}
+
+    def _import_deals(self, user_id, payload):
+        # All or nothing, like the SQL function's transaction
+        deals, events = [], []
+        for item in payload.get("batch") or []:
+            item = dict(item)
+            timeline = item.pop("timeline", None) or []
+            deal = self._defaults("deals", user_id)
+            deal.update(item)
+            deal["user_id"] = user_id
+            deals.append(deal)
+            if not timeline:
+                timeline = [{"type": "status_change",
+                             "description": payload.get("event_description") or "Deal Imported"}]
+            for values in timeline:
+                event = self._defaults("timeline_events", user_id)
+                event.update({k: v for k, v in values.items() if v is not None})
+                event.update(deal_id=deal["id"], user_id=user_id)
+                events.append(event)
+        existing = {r["id"] for r in self._tables["timeline_events"]}
+        self._tables["deals"].extend(deals)
+        self._tables["timeline_events"].extend(e for e in events if e["id"] not in existing)
+        return 200, {}, [dict(d) for d in deals]
+
+    def _rest(self, method, table, query, headers, payload):
+        if table.startswith("rpc/") and method == "POST":
+            return self._rpc(table[len("rpc/"):], headers, payload or {})
+        if table not in self._tables:
+            raise StubError(404, f'relation "public.{table}" does not exist', "42P01")
+        user_id = self._user_for(headers)
+        prefer = headers.get("prefer", "")
+        single = "vnd.pgrst.object" in headers.get("accept", "")
+
+        control = {"select", "order", "limit", "offset", "columns", "on_conflict"}
+        embedded = {k for k, _ in query if k.rpartition(".")[2] in control and "." in k}
+        filters = [(k, v) for k, v in query if k not in control and k not in embedded]
+        options = dict((k, v) for k, v in query if k in control or k in embedded)
+
+        if method == "POST":
+            rows = payload if isinstance(payload, list) else [payload]
+            existing = {r["id"] for r in self._tables[table]}
+            inserted = []
+            for values in rows:
+                if values.get("id") in existing:
+                    if "resolution=ignore-duplicates" in prefer:
+                        continue
+                    raise StubError(409, "duplicate key value violates unique constraint", "23505")
+                row = self._defaults(table, user_id)
+                row.update(values)
+                self._check_insert(table, row, user_id)
+                inserted.append(row)
+            self._tables[table].extend(inserted)
+            return self._respond(201, inserted, options, prefer, single)
+
+        matched = [r for r in self._visible(table, user_id)
+                   if all(_filter(r, column, expr) for column, expr in filters)]
+
+        if method == "GET":
+            rows = self._embed(table, self._shape(matched, options), options, user_id)
+            return self._respond(200, rows, options, "return=representation", single)
+        if method == "PATCH":
+            # notifications: the owner may mark a digest read
+            if table not in ("deals", "notifications"):
+                raise StubError(403, f'permission denied for table "{table}"', "42501")
+            for row in matched:
+                row.update(payload or {})
+                if table == "deals":
+                    # deals_set_updated_at: the server clock wins over the client's
+                    row["updated_at"] = _iso(_now())
+            return self._respond(200, matched, options, prefer, single)
+        if method == "DELETE":
+            if table != "deals":
+                raise StubError(403, f'permission denied for table "{table}"', "42501")
+            ids = {r["id"] for r in matched}
+            self._tables["deals"] = [r for r in self._tables["deals"] if r["id"] not in ids]
+            self._tables["timeline_events"] = [
+                r for r in self._tables["timeline_events"] if r["deal_id"] not in ids
+            ]
+            return self._respond(200, matched, options, prefer, single)
+        raise StubError(405, f"method {method} not allowed")
+
+    def _shape(self, rows, options):
+        rows = list(rows)
+        for term in reversed([t for t in options.get("order", "").split(",") if t]):
+            column, _, modifiers = term.partition(".")
+            descending = "desc" in modifiers.split(".")
+            present = [r for r in rows if r.get(column) is not None]
+            missing = [r for r in rows if r.get(column) is None]
+            present.sort(key=lambda r: r[column], reverse=descending)
+            rows = present + missing if not descending else missing + present
+        offset = int(options.get("offset", 0))
+        if "limit" in options:
+            rows = rows[offset:offset + int(options["limit"])]
+        elif offset:
+            rows = rows[offset:]
+        return rows
+
+    def _embed(self, table, rows, options, user_id):
+        """Nest ``child(*)`` resources named in ``select`` under each row."""
+        children = re.findall(r"(\w+)\(\*\)", options.get("select", ""))
+        if not children:
+            return rows
+        rows = [dict(r) for r in rows]
+        for child in children:
+            key = EMBEDS.get((table, child))
+            if key is None:
+                raise StubError(400, f"Could not find a relationship between '{table}' and '{child}'", "PGRST200")
+            child_options = {k.split(".", 1)[1]: v for k, v in options.items() if k.startswith(child + ".")}
+            grouped = {}
+            for row in self._shape(self._visible(child, user_id), child_options):
+                grouped.setdefault(row[key], []).append(dict(row))
+            for row in rows:
+                row[child] = grouped.get(row["id"], [])
+        return rows
+
+    def _respond(self, status, rows, options, prefer, single):
+        if "return=representation" not in prefer:
+            return (201 if status == 201 else 204), {}, None
+        rows = [dict(r) for r in rows]
+        if single:
+            if len(rows) != 1:
+                raise StubError(406, "JSON object requested, multiple (or no) rows returned", "PGRST116")
+            return status, {}, rows[0]
+        return status, {"Content-Range": f"0-{max(len(rows) - 1, 0)}/*"}, rows
+
+    # ------------------------------------------------------------ adapters
+
+    def _delay(self, url):
+        """Simulated model latency, applied by the adapters outside the lock."""
+        if self.ai_latency_ms and "/functions/v1/" in url:
+            return self.ai_latency_ms / 1000
+        return 0
+
+    async def install(self, context):
+        """Route ``context``'s Supabase traffic to this backend in-process."""
+
+        async def fulfill(route):
+            request = route.request
+            if self._delay(request.url):
+                await asyncio.sleep(self._delay(request.url))
+            status, headers, body = self.handle(
+                request.method, request.url, await request.all_headers(), request.post_data_buffer,
+            )
+            await route.fulfill(status=status, headers=headers, body=body)
+
+        await context.route(ROUTE_PATTERN, fulfill)
+
+        if hasattr(context, "route_web_socket"):
+            # No change feed offline: accept the realtime socket and never
+            # answer it, so the app's channel simply never joins.
+            async def swallow(ws):
+                pass
+
+            await context.route_web_socket(REALTIME_PATTERN, swallow)
+
+    def serve(self, host="127.0.0.1", port=DEFAULT_PORT):
+        """Serve over HTTP from a daemon thread; returns the server."""
+        backend = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _answer(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                if backend._delay(self.path):
+                    time.sleep(backend._delay(self.path))
+                status, headers, data = backend.handle(self.command, self.path, dict(self.headers), body)
+                self.send_response(status)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = do_OPTIONS = _answer
+
+            def log_message(self, fmt, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def from_config(config, **kwargs):
+    """Build a backend whose only user is the suite's login from ``tmp/config.json``."""
+    from harness import session
+    return StubBackend(
+        config.get("loginUser", session.DEFAULT_LOGIN_USER),
+        config.get("loginPassword", session.DEFAULT_LOGIN_PASSWORD),
+        **kwargs,
+    )
+
+
+def self_check():
+    """Round-trip the requests the app makes that no TC script covers; raises on a mismatch."""
+    owner, other = "owner@stub.test", "other@stub.test"
+    backend = StubBackend(owner, "pw", seed=False)
+    backend.add_user(other, "pw")
+
+    def call(method, path, token, payload=None):
+        headers = {"Authorization": f"Bearer {token}", "Prefer": "return=representation"}
+        body = json.dumps(payload).encode() if payload is not None else b""
+        status, _, data = backend.handle(method, f"http://stub{path}", headers, body)
+        return status, json.loads(data) if data else None
+
+    def sign_in(email):
+        _, session = call("POST", "/auth/v1/token?grant_type=password", "", {"email": email, "password": "pw"})
+        return session["access_token"]
+
+    digest = backend.add_follow_up_digest(owner, [])
+    read_at = _iso(_now())
+
+    # markNotificationRead from someone else matches nothing, like the RLS policy
+    status, rows = call("PATCH", f"/rest/v1/notifications?id=eq.{digest['id']}", sign_in(other), {"read_at": read_at})
+    assert status == 200 and rows == [], f"foreign PATCH on notifications: {status} {rows}"
+    assert digest["read_at"] is None, "foreign PATCH marked the digest read"
+
+    token = sign_in(owner)
+    status, rows = call("PATCH", f"/rest/v1/notifications?id=eq.{digest['id']}", token, {"read_at": read_at})
+    assert status == 200 and [r["id"] for r in rows] == [digest["id"]], f"PATCH on notifications: {status} {rows}"
+    status, rows = call("GET", "/rest/v1/notifications?select=*&kind=eq.follow_up_digest", token)
+    assert [(r["id"], r["read_at"]) for r in rows] == [(digest["id"], read_at)], f"digest after mark-read: {rows}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the Supabase/ai-service stand-in over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--ai-latency-ms", type=int, default=0,
+                        help="artificial delay for ai-service answers (default: 0)")
+    parser.add_argument("--self-check", action="store_true",
+                        help="run the stub's own request checks and exit")
+    args = parser.parse_args(argv)
+
+    if args.self_check:
+        self_check()
+        print("stub backend self-check passed")
+        return
+
+    from harness import runner
+
+    server = from_config(runner.load_config(), ai_latency_ms=args.ai_latency_ms).serve(args.host, args.port)
+    print(f"Stub Supabase listening on http://{args.host}:{args.port} "
+          f"(start the app with VITE_SUPABASE_URL=http://localhost:{args.port})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
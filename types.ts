@@ -30,6 +30,7 @@ export interface RateCheckResult {
   explanation: string;
   suggestedReply?: string; // New: copy-paste ready reply
   timestamp: string;
+  cached?: boolean; // Served from the ai-service response cache
 }
 
 export interface BriefAnalysisResult {
@@ -38,6 +39,7 @@ export interface BriefAnalysisResult {
   checklist: string[];
   questionsToAsk: string[];
   timestamp: string;
+  cached?: boolean;
 }
 
 export interface BrandDeal {
@@ -56,7 +58,6 @@ export interface BrandDeal {
   // Attached Features
   rateCheck?: RateCheckResult;
   briefAnalysis?: BriefAnalysisResult;
-  timeline: TimelineEvent[];
 }
 
 export interface RateCheckInput {
@@ -83,9 +84,8 @@ export interface DealAction {
   description: string;
 }
 
-export function getDealAction(deal: BrandDeal): DealAction {
-  const today = new Date();
-  const nextFollowUp = new Date(deal.nextFollowUpAt);
+// `now` is epoch ms; pass it in when evaluating many deals at one instant
+export function getDealAction(deal: BrandDeal, now: number = Date.now()): DealAction {
 
   // Rule 1: Ghosted state (Emotional relief)
   // If explicitly ghosted
@@ -99,7 +99,7 @@ export function getDealAction(deal: BrandDeal): DealAction {
   }
 
   // Rule 3: Overdue follow-up
-  if (nextFollowUp <= today && deal.status !== DealStatus.SECURED) {
+  if (Date.parse(deal.nextFollowUpAt) <= now && deal.status !== DealStatus.SECURED) {
     return { label: 'Follow up today', type: 'FOLLOW_UP', description: 'Time to nudge the brand.' };
   }
 